@@ -0,0 +1,198 @@
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Type, cast
+
+from fennec_dl.config.argparse_integration import add_overwrite_args, process_overwrite_args
+from fennec_dl.config.config import Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.static_config import StaticConfig
+from fennec_dl.config.yaml_loader import YAMLLoader
+
+
+# name: (width, depth), every node has width leaves and, above the given depth, width subconfigs
+SIZES = {"small": (4, 3), "medium": (8, 4), "large": (10, 4)}
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+SECRET = cast(Any, Config)._Config__secret
+
+
+def generate_dict(width: int, depth: int, seed: int = 0) -> Dict[str, Any]:
+    dict_: Dict[str, Any] = {}
+    for i in range(width):
+        kind = i % 4
+        if kind == 0:
+            dict_[f"l{i}"] = seed + i
+        elif kind == 1:
+            dict_[f"l{i}"] = (seed + i) * 0.5
+        elif kind == 2:
+            dict_[f"l{i}"] = f"value_{seed}_{i}"
+        else:
+            dict_[f"l{i}"] = [seed, i, seed + i]
+    if depth > 1:
+        for i in range(width):
+            dict_[f"c{i}"] = generate_dict(width, depth - 1, seed * width + i + 1)
+    return dict_
+
+
+def generate_type(width: int, depth: int) -> Type[StaticConfig]:
+    # One type per level, all subconfigs of a level have the same fields
+    annotations: Dict[str, Any] = {}
+    for i in range(width):
+        annotations[f"l{i}"] = [int, float, str, List[int]][i % 4]
+    if depth > 1:
+        child_type = generate_type(width, depth - 1)
+        for i in range(width):
+            annotations[f"c{i}"] = child_type
+    return cast(Type[StaticConfig], type(f"Level{depth}", (StaticConfig,), {"__annotations__": annotations, "__module__": __name__, "__qualname__": f"Level{depth}"}))
+
+
+def generate_files(directory: Path, width: int, depth: int) -> Path:
+    # Every top-level subconfig in its own file, included by the root file, plus a reference
+    dict_ = generate_dict(width, depth)
+    lines = []
+    for name, value in dict_.items():
+        if isinstance(value, dict):
+            include = directory / f"{name}.yaml"
+            YAMLLoader.save(cast(Dict[str, Any], value), include)
+            lines.append(f"{name}: !include {include.name}")
+        else:
+            lines.append(f"{name}: {json.dumps(value)}")
+    lines.append("ref: !ref l0")
+    path = directory / "config.yaml"
+    path.write_text("\n".join(lines) + "\n", encoding="UTF-8")
+    return path
+
+
+def leaf_fqns(dict_: Dict[str, Any], count: int) -> List[str]:
+    fqns = []
+    stack: List[Tuple[str, Dict[str, Any]]] = [("", dict_)]
+    while len(stack) > 0:
+        prefix, node = stack.pop()
+        for name, value in node.items():
+            if isinstance(value, dict):
+                stack.append((prefix + name + ".", cast(Dict[str, Any], value)))
+            elif isinstance(value, int):
+                fqns.append(prefix + name)
+    # Spread over the whole config, deterministic
+    step = max(len(fqns) // count, 1)
+    return fqns[::step][:count]
+
+
+def cases(directory: Path, width: int, depth: int) -> Dict[str, Tuple[Callable[[], Any], Callable[[Any], Any]]]:
+    # name: (setup, run), setup is not timed and called before every run
+    dict_ = generate_dict(width, depth)
+    static_type = generate_type(width, depth)
+    path = generate_files(directory, width, depth)
+    fqns = leaf_fqns(dict_, 1000)
+
+    def indexed() -> Any:
+        config = DynamicConfig(dict_, SECRET)
+        config[fqns[0]]
+        return config
+
+    def overwrite_expansion(config: Any) -> Any:
+        parser = argparse.ArgumentParser()
+        add_overwrite_args(config, parser)
+        args = parser.parse_args([x for fqn in fqns[:3] for x in ("--" + fqn, "1", "2", "3", "4")])
+        return [x for x in process_overwrite_args(config, args)]
+
+    def yaml_load(_: Any) -> Any:
+        YAMLLoader.include_cache.invalidate()
+        return YAMLLoader.load_dynamic(path)
+
+    return {
+        "yaml_load": (lambda: None, yaml_load),
+        "dynamic_construct": (lambda: None, lambda _: DynamicConfig(dict_, SECRET)),
+        "dynamic_construct_lazy": (lambda: None, lambda _: DynamicConfig(dict_, SECRET, True)),
+        "static_construct": (lambda: None, lambda _: static_type(dict_, SECRET)),
+        "get": (indexed, lambda config: [config[fqn] for fqn in fqns]),
+        "set": (indexed, lambda config: [config.__setitem__(fqn, 0) for fqn in fqns]),
+        "keys": (lambda: DynamicConfig(dict_, SECRET), lambda config: config.keys()),
+        "items": (lambda: DynamicConfig(dict_, SECRET), lambda config: config.items()),
+        "clone": (lambda: DynamicConfig(dict_, SECRET), lambda config: config.clone()),
+        "clone_write": (lambda: DynamicConfig(dict_, SECRET), lambda config: config.clone().__setitem__(fqns[-1], 0)),
+        "eq": (lambda: (DynamicConfig(dict_, SECRET), DynamicConfig(dict_, SECRET)), lambda configs: configs[0] == configs[1]),
+        "overwrite_expansion": (lambda: DynamicConfig(dict_, SECRET), overwrite_expansion),
+    }
+
+
+def measure(setup: Callable[[], Any], run: Callable[[Any], Any], repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    # Separate run, tracemalloc slows down allocations considerably
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"min": min(times), "median": statistics.median(times), "peak_memory": peak}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    # Regressions of the best time or the peak memory by more than the given fraction, times below 10 us are too noisy to compare
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result["min"] > base["min"] * (1 + tolerance) and result["min"] - base["min"] > 1e-5:
+            regressions.append(f"{name}: time {base['min'] * 1e3:.3f} ms -> {result['min'] * 1e3:.3f} ms")
+        if result["peak_memory"] > base["peak_memory"] * (1 + tolerance) and result["peak_memory"] - base["peak_memory"] > 4096:
+            regressions.append(f"{name}: peak memory {base['peak_memory'] / 1e3:.1f} kB -> {result['peak_memory'] / 1e3:.1f} kB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Times the hot paths of fennec_dl.config on synthetic configs of increasing size")
+    parser.add_argument("--sizes", nargs="*", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--cases", nargs="*", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Results to compare against (if the file exists)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="fennec_dl_benchmark_") as directory:
+        for size in args.sizes:
+            width, depth = SIZES[size]
+            size_directory = Path(directory) / size
+            size_directory.mkdir()
+            for name, (setup, run) in cases(size_directory, width, depth).items():
+                if args.cases is not None and name not in args.cases:
+                    continue
+                result = results[f"{name}/{size}"] = measure(setup, run, args.repeat)
+                print(f"{name}/{size}: {result['min'] * 1e3:.3f} ms (median {result['median'] * 1e3:.3f} ms), peak memory {result['peak_memory'] / 1e3:.1f} kB")
+
+    document = {"python": sys.version.split()[0], "platform": platform.platform(), "results": results}
+    if args.output is not None:
+        args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="UTF-8")
+    regressions = []
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="UTF-8"))
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if len(regressions) == 0:
+            print(f"No regressions compared to {args.baseline}")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="UTF-8")
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
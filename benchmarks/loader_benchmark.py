@@ -0,0 +1,20 @@
+import tempfile
+import timeit
+from pathlib import Path
+
+from fennec_dl.config.binary_loader import BinaryLoader
+from fennec_dl.config.json_loader import JSONLoader
+from fennec_dl.config.yaml_loader import YAMLLoader
+from yaml_loader_benchmark import generate
+
+
+if __name__ == "__main__":
+    directory = Path(tempfile.mkdtemp(prefix="fennec_dl_loader_benchmark_"))
+    source = directory / "config.yaml"
+    with open(source, "w", encoding="UTF-8") as file:
+        file.write(generate(200, 100))
+    for loader, suffix in [(YAMLLoader, "yaml"), (JSONLoader, "json"), (BinaryLoader, "bin")]:
+        path = directory / f"converted.{suffix}"
+        write = min(timeit.repeat(lambda: loader.convert(source, path, YAMLLoader), number=1, repeat=3))
+        read = min(timeit.repeat(lambda: loader.load_dynamic(path, lazy=True), number=1, repeat=3))
+        print(f"{loader.__name__}: {path.stat().st_size / 1e6:.1f} MB, read {read * 1e3:.0f} ms, convert from YAML {write * 1e3:.0f} ms")
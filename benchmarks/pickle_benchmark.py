@@ -0,0 +1,36 @@
+import pickle
+import timeit
+import warnings
+from typing import Any, List, Tuple, cast
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.yaml_loader import YAMLLoader
+from static_config_benchmark import DICT, BenchmarkConfig
+from yaml_loader_benchmark import generate
+
+
+def measure(name: str, value: Any, number: int) -> None:
+    data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    dumps = min(timeit.repeat(lambda: pickle.dumps(value, pickle.HIGHEST_PROTOCOL), number=number, repeat=5)) / number
+    loads = min(timeit.repeat(lambda: pickle.loads(data), number=number, repeat=5)) / number
+    print(f"{name}: {len(data)} bytes, dumps {dumps * 1e6:.1f} us, loads {loads * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    static = cast(Any, BenchmarkConfig(cast(Any, DICT), cast(Any, Config)._Config__secret))
+    static.keys()
+    cases: List[Tuple[str, Any, int]] = [("StaticConfig", static, 10000), ("StaticConfig (plain dict)", static.to_dict(), 10000)]
+    frozen = static.clone()
+    frozen.freeze()
+    cases.append(("StaticConfig (frozen)", frozen, 10000))
+    cases.append(("CompiledConfig", static.compile(), 10000))
+    dynamic = YAMLLoader.parse_dynamic(generate(50, 20))
+    dynamic.keys()
+    cases.append(("DynamicConfig", dynamic, 100))
+    cases.append(("DynamicConfig (plain dict)", dynamic.to_dict(), 100))
+    for name, value, number in cases:
+        try:
+            measure(name, value, number)
+        except Exception as e:
+            print(f"{name}: failed ({type(e).__name__}: {e})")
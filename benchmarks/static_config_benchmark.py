@@ -0,0 +1,63 @@
+import timeit
+import warnings
+from typing import Any, List, Literal, Optional, Union, cast
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.static_config import StaticConfig
+
+
+class BenchmarkConfig(StaticConfig):
+    class OptimizerConfig(StaticConfig):
+        name: Literal["sgd", "adam"]
+        lr: float
+        momentum: Optional[float]
+        weight_decay: Union[float, int]
+
+    class ModelConfig(StaticConfig):
+        class BlockConfig(StaticConfig):
+            channels: int
+            kernel_size: int
+            activation: str
+            dropout: Optional[float]
+
+        depth: int
+        widths: List[int]
+        block: BlockConfig
+        head: Optional[BlockConfig]
+
+    seed: int
+    epochs: int
+    batch_size: int
+    amp: bool
+    tags: List[str]
+    optimizer: OptimizerConfig
+    model: ModelConfig
+    schedule: List[List[float]]
+
+
+DICT = {
+    "seed": 42,
+    "epochs": 100,
+    "batch_size": 256,
+    "amp": True,
+    "tags": ["baseline", "resnet", "imagenet"],
+    "optimizer": {"name": "sgd", "lr": 0.1, "momentum": 0.9, "weight_decay": 5e-4},
+    "model": {
+        "depth": 50,
+        "widths": [64, 128, 256, 512],
+        "block": {"channels": 64, "kernel_size": 3, "activation": "relu", "dropout": None},
+        "head": {"channels": 1000, "kernel_size": 1, "activation": "softmax", "dropout": 0.1},
+    },
+    "schedule": [[0.0, 0.1], [30.0, 0.01], [60.0, 0.001]],
+}
+
+
+def construct() -> None:
+    BenchmarkConfig(cast(Any, DICT), cast(Any, Config)._Config__secret)
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    number = 10000
+    best = min(timeit.repeat(construct, number=number, repeat=5))
+    print(f"StaticConfig construction: {best / number * 1e6:.2f} us/config ({number} configs in {best:.3f} s)")
@@ -0,0 +1,37 @@
+import timeit
+from typing import Any, Type
+
+from fennec_dl.config.yaml_loader import _BACKENDS, YAMLLoader
+
+
+def generate(sections: int, entries: int) -> str:
+    lines = []
+    for i in range(sections):
+        lines.append(f"section_{i}:")
+        lines.append(f"  enabled: {'true' if i % 2 == 0 else 'false'}")
+        lines.append(f"  scale: {i * 0.5}")
+        lines.append(f"  sizes: [{', '.join(str(j) for j in range(16))}]")
+        lines.append("  entries:")
+        for j in range(entries):
+            lines.append(f"    entry_{j}:")
+            lines.append(f"      id: {i * entries + j}")
+            lines.append(f"      weight: {j / entries}")
+            lines.append(f"      bounds: [{j}, {j + 1}]")
+    lines.append("first: !ref section_0.entries.entry_0.id")
+    return "\n".join(lines) + "\n"
+
+
+def backend_loader(backend: Type[Any]) -> Type[YAMLLoader]:
+    class BackendYAMLLoader(YAMLLoader):
+        _backend = backend
+
+    return BackendYAMLLoader
+
+
+if __name__ == "__main__":
+    string = generate(200, 100)
+    print(f"Parsing {len(string) / 1e6:.1f} MB of YAML")
+    for backend in _BACKENDS:
+        loader = backend_loader(backend)
+        best = min(timeit.repeat(lambda: loader.parse_dynamic(string, lazy=True), number=1, repeat=3))
+        print(f"{backend.__name__}: {best * 1e3:.0f} ms")
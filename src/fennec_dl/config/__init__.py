@@ -1,4 +1,18 @@
+from fennec_dl.config.access_tracker import AccessTracker
+from fennec_dl.config.binary_loader import BinaryLoader
+from fennec_dl.config.compiled_config import CompiledConfig
 from fennec_dl.config.config import Config
+from fennec_dl.config.config_frame import ConfigFrame
+from fennec_dl.config.config_index import ConfigIndex, IndexUpdate
+from fennec_dl.config.diff import ConfigDiff, diff
+from fennec_dl.config.disk_cache import DiskCache
 from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.include_cache import IncludeCache
+from fennec_dl.config.json_loader import JSONLoader
+from fennec_dl.config.load_profile import LoadProfile, add_load_hook, remove_load_hook
+from fennec_dl.config.loader import LoadResult
+from fennec_dl.config.sampled_sweep import Range, SampledSweep
 from fennec_dl.config.static_config import StaticConfig
+from fennec_dl.config.sweep import ConfigSweep
+from fennec_dl.config.sweep_executor import SweepExecutor, SweepResult
 from fennec_dl.config.yaml_loader import YAMLLoader
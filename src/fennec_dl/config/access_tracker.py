@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Protocol, Tuple, Union
+
+
+# Tracker receiving the reads of all configs, None while tracking is off
+_active: Optional[AccessTracker] = None
+# Set by fennec_dl.config.static_config (which imports this module), _static_getattribute is installed on it while tracking
+_static_config_type: Optional[type] = None
+
+
+class _Items(Protocol):
+    # Configs, this module is imported by fennec_dl.config.config
+    def iter_items(self) -> Iterator[Tuple[str, Any]]:
+        ...
+
+
+def _static_getattribute(self: Any, name: str) -> Any:
+    # Installed on StaticConfig while tracking, its fields are plain instance attributes that never reach __getattr__
+    if name[0] != "_" and _active is not None and name in type(self)._schema().names:
+        _active._read(self._fqn(name))
+    return object.__getattribute__(self, name)
+
+
+class AccessTracker:
+    # Counts reads of config entries per FQN (relative to the root config), reads of a clone count for the FQN of the entry in the clone
+    # Reads through attributes and [] are counted per entry, to_dict/items/iter_items count as bulk reads of the whole subtree
+    # Counts are plain mappings, e.g. trackers of DataLoader worker processes can be sent back and merged
+    def __init__(self) -> None:
+        super().__init__()
+        self.__reads: Counter[str] = Counter()
+        self.__bulk_reads: Counter[str] = Counter()
+
+    @property
+    def reads(self) -> Dict[str, int]:
+        return dict(self.__reads)
+
+    @property
+    def bulk_reads(self) -> Dict[str, int]:
+        # Reads of whole subtrees by FQN of their root ("" for the root config)
+        return dict(self.__bulk_reads)
+
+    def start(self) -> None:
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another access tracker is active already")
+        _active = self
+        if _static_config_type is not None:
+            setattr(_static_config_type, "__getattribute__", _static_getattribute)
+
+    def stop(self) -> None:
+        global _active
+        if _active is not self:
+            return
+        if _static_config_type is not None and "__getattribute__" in _static_config_type.__dict__:
+            delattr(_static_config_type, "__getattribute__")
+        _active = None
+
+    def __enter__(self) -> AccessTracker:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def _read(self, fqn: str) -> None:
+        self.__reads[fqn] += 1
+
+    def _bulk_read(self, fqn: str) -> None:
+        self.__bulk_reads[fqn] += 1
+
+    def merge(self, other: Union[AccessTracker, Mapping[str, Mapping[str, int]]]) -> None:
+        # Accepts another tracker or its to_dict()
+        if isinstance(other, AccessTracker):
+            other = other.to_dict()
+        self.__reads.update(other["reads"])
+        self.__bulk_reads.update(other["bulk_reads"])
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        return {"reads": dict(self.__reads), "bulk_reads": dict(self.__bulk_reads)}
+
+    def unread(self, config: _Items, bulk: bool = True) -> List[str]:
+        # Sorted FQNs of the entries of config that were never read, with bulk=False reads through to_dict/items/iter_items are ignored (e.g. if configs are only logged that way)
+        # Entries of subconfigs that were read themselves (e.g. passed along as a whole) but none of whose entries were read are reported as well
+        global _active
+        # Listing the entries is no read, tracking is suspended meanwhile
+        active = _active
+        _active = None
+        try:
+            keys = [key for key, _ in config.iter_items()]
+        finally:
+            _active = active
+        result = []
+        for key in keys:
+            if key in self.__reads:
+                continue
+            if bulk:
+                prefix = key
+                covered = "" in self.__bulk_reads
+                while not covered and "." in prefix:
+                    prefix = prefix.rpartition(".")[0]
+                    covered = prefix in self.__bulk_reads
+                if covered:
+                    continue
+            result.append(key)
+        return sorted(result)
@@ -1,8 +1,18 @@
 import argparse
-import itertools
-from typing import List, Optional, Set, TypeVar
+import re
+import typing
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
 
-from fennec_dl.config.config import Config
+import yaml
+
+from fennec_dl.config.config import MISSING, Config
+from fennec_dl.config.sampled_sweep import Range, SampledSweep
+from fennec_dl.config.static_config import StaticConfig
+from fennec_dl.config.sweep import ConfigSweep
+
+
+_RANGE = re.compile(r"(range|logrange)\((.*),(.*)\)")
 
 
 def add_overwrite_args(config: Config, parser: argparse.ArgumentParser, exclude: Optional[Set[str]] = None, include: Optional[Set[str]] = None) -> None:
@@ -11,28 +21,147 @@ def add_overwrite_args(config: Config, parser: argparse.ArgumentParser, exclude:
             continue
         if exclude is not None and key in exclude:
             continue
-        if type(value) in [type(None), bool]:
+        if value is None:
+            parser.add_argument("--" + key, action="extend", nargs="*", default=[], dest=key.replace(".", "_"), type=_declared_type(config, key))
+        elif type(value) == bool:
             parser.add_argument("--" + key, action="extend", nargs="*", default=[], dest=key.replace(".", "_"), type=bool)
+        elif isinstance(value, array):
+            parser.add_argument("--" + key, action="extend", nargs="*", default=[], dest=key.replace(".", "_"), type=_array_type(value.typecode))
         else:
             parser.add_argument("--" + key, action="extend", nargs="*", default=[], dest=key.replace(".", "_"), type=type(value))
 
 
+def _declared_type(config: Config, key: str) -> Callable[[str], Any]:
+    # None entries of static configs are parsed by the basic types of their annotation (e.g. int for Optional[int]), others as bools
+    parent_fqn, _, name = key.rpartition(".")
+    parent = config if parent_fqn == "" else config[parent_fqn]
+    if not isinstance(parent, StaticConfig):
+        return bool
+    hint = type(parent)._schema().type_hints[name]
+    arms = typing.get_args(hint) if typing.get_origin(hint) == Union else (hint,)
+    # bool accepts any string, it is tried last
+    types = [type_ for type_ in (int, float, str, bool) if type_ in arms]
+    if len(types) == 0:
+        return bool
+    if len(types) == 1:
+        return types[0]
+
+    def parse(x: str) -> Any:
+        for type_ in types:
+            try:
+                return type_(x)
+            except ValueError:
+                pass
+        raise argparse.ArgumentTypeError(f'"{x}" does not match "{hint}"')
+
+    return parse
+
+
+def _array_type(typecode: str) -> Callable[[str], "array[Any]"]:
+    # Numeric arrays are given as comma separated values, e.g. --weights 0.5,1,2
+    entry_type = int if typecode == "q" else float
+    return lambda x: array(typecode, [entry_type(y) for y in x.split(",") if len(y) > 0])
+
+
 T = TypeVar("T", bound=Config)
 
 
-def process_overwrite_args(config: T, args: argparse.Namespace) -> List[T]:
+def process_overwrite_args(config: T, args: argparse.Namespace, rank: int = 0, world_size: int = 1) -> ConfigSweep[T]:
+    fqns = {key.replace(".", "_"): key for key, _ in config.items()}
     overwrites = []
     for attr_name, attr in args.__dict__.items():
-        if attr_name.startswith("_"):
+        if attr_name.startswith("_") or attr_name not in fqns:
             continue
         if attr == []:
             continue
-        overwrites.append([(attr_name, x) for x in attr])
-    configs = []
-    for overwrite_combi in map(dict, itertools.product(*overwrites)):
-        clone = config.clone()
-        for key in clone.keys():
-            if key.replace(".", "_") in overwrite_combi.keys():
-                clone[key] = overwrite_combi[key.replace(".", "_")]
-        configs.append(clone)
-    return configs
+        overwrites.append((fqns[attr_name], attr))
+    return ConfigSweep(config, overwrites).shard(rank, world_size)
+
+
+def add_set_args(parser: argparse.ArgumentParser, flag: str = "--set") -> None:
+    # Single option for all overwrites, e.g. --set optimizer.lr=0.1,0.01 --set model.widths=[64,128],[32,64], independent of the size of the config
+    parser.add_argument(flag, action="append", default=[], dest=flag.lstrip("-").replace("-", "_"), type=_parse_set_arg, metavar="FQN=VALUE[,VALUE...]")
+
+
+def _parse_set_arg(arg: str) -> Tuple[str, List[str]]:
+    fqn, sep, values = arg.partition("=")
+    if len(sep) == 0 or len(fqn) == 0:
+        raise argparse.ArgumentTypeError(f'Expected FQN=VALUE[,VALUE...], got "{arg}"')
+    # Commas within brackets, parentheses and quotes belong to the value
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, char in enumerate(values):
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "[{(":
+            depth += 1
+        elif char in "]})":
+            if depth == 0:
+                raise argparse.ArgumentTypeError(f'Unbalanced "{char}" in "{arg}"')
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(values[start:i])
+            start = i + 1
+    parts.append(values[start:])
+    return fqn.strip(), parts
+
+
+def _convert_set_value(current: Any, value: str) -> Any:
+    # Values are parsed as YAML and converted to the type of the current entry where unambiguous
+    if isinstance(current, str):
+        # Quotes are only needed for values containing commas
+        return str(yaml.safe_load(value)) if value[:1] in ('"', "'") else value
+    match = _RANGE.fullmatch(value.strip())
+    if match is not None and isinstance(current, (int, float)) and not isinstance(current, bool):
+        # range(low,high) and logrange(low,high) for sampled sweeps, integer entries get integer ranges
+        low, high = (_parse_number(x) for x in (match.group(2), match.group(3)))
+        if not isinstance(low, (int, float)) or not isinstance(high, (int, float)) or low > high or (match.group(1) == "logrange" and low <= 0):
+            raise ValueError(f'Invalid range "{value}"')
+        if isinstance(current, int):
+            # Samples of integer ranges lie between the bounds, so the bounds must be integers themselves
+            if not all(float(x).is_integer() for x in (low, high)):
+                raise ValueError(f'Invalid range "{value}" for an integer entry')
+            low, high = int(low), int(high)
+        return Range(low, high, match.group(1) == "logrange", isinstance(current, int))
+    parsed = _parse_number(value) if isinstance(current, (int, float)) else yaml.safe_load(value)
+    if isinstance(current, array):
+        return array(current.typecode, parsed if isinstance(parsed, list) else [parsed])
+    elif isinstance(current, float) and type(parsed) is int:
+        return float(parsed)
+    return parsed
+
+
+def _parse_number(value: str) -> Any:
+    parsed = yaml.safe_load(value)
+    if isinstance(parsed, str):
+        # YAML 1.1 requires a dot in floats in exponent notation (1.0e-4 instead of 1e-4)
+        try:
+            return float(parsed)
+        except ValueError:
+            pass
+    return parsed
+
+
+def process_set_args(config: T, args: argparse.Namespace, flag: str = "--set", rank: int = 0, world_size: int = 1, samples: Optional[int] = None, method: str = "random", seed: int = 0) -> ConfigSweep[T]:
+    # Only looks at the given FQNs, the rest of the config is neither flattened nor materialized
+    # With samples, the given number of configs is drawn from the values instead of building their full product (see SampledSweep)
+    overwrites: Dict[str, List[Any]] = {}
+    for fqn, values in getattr(args, flag.lstrip("-").replace("-", "_")):
+        current = config._lookup(fqn)
+        if current is MISSING or isinstance(current, (Config, dict)):
+            raise AttributeError(f'Config has no attribute "{fqn}"')
+        overwrites.setdefault(fqn, []).extend(_convert_set_value(current, x) for x in values)
+    dimensions: List[Tuple[str, Any]] = []
+    for fqn, values in overwrites.items():
+        ranges = [x for x in values if isinstance(x, Range)]
+        if len(ranges) > 0 and (len(values) > 1 or samples is None):
+            raise ValueError(f'Ranges can neither be combined with other values nor be used without sampling (at "{fqn}")')
+        dimensions.append((fqn, ranges[0] if len(ranges) > 0 else values))
+    if samples is not None:
+        return SampledSweep(config, dimensions, samples, method, seed).shard(rank, world_size)
+    return ConfigSweep(config, dimensions).shard(rank, world_size)
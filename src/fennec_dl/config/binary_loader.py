@@ -0,0 +1,81 @@
+import marshal
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple, Union, cast
+
+from fennec_dl.config.include_cache import Signature
+from fennec_dl.config.loader import Loader
+from fennec_dl.config.references import Reference, resolve_references
+
+
+# Files consist of the magic bytes, a flags byte and the marshal serialization (version 4) of the data
+# marshal is not secure against malicious data, binary configs must come from trusted sources
+_MAGIC = b"FNCFG\x01"
+# Set if the data contains includes or references, the serialized object is a tuple (data, paths of the tags) then
+_TAGGED = 1
+# Includes and references are stored as (tag, argument) tuples (tuples do not occur in config data otherwise)
+_INCLUDE = "!include"
+_REF = "!ref"
+
+
+def _encode(value: Any, path: List[Union[str, int]], paths: List[Tuple[Union[str, int], ...]]) -> Any:
+    if isinstance(value, Reference):
+        paths.append(tuple(path))
+        return (_REF, value.fqn)
+    elif isinstance(value, dict):
+        result = {}
+        for k, v in cast(Dict[str, Any], value).items():
+            path.append(k)
+            result[k] = _encode(v, path, paths)
+            path.pop()
+        return result
+    elif isinstance(value, list):
+        result_list = []
+        for i, v in enumerate(cast(List[Any], value)):
+            path.append(i)
+            result_list.append(_encode(v, path, paths))
+            path.pop()
+        return result_list
+    return value
+
+
+class BinaryLoader(Loader):
+    _binary = True
+
+    @classmethod
+    def _load(cls, stream: IO[Any], _root: bool = True, _dependencies: Optional[List[Tuple[Path, Signature]]] = None) -> Dict[str, Any]:  # type: ignore
+        content = stream.read()
+        if content[: len(_MAGIC)] != _MAGIC:
+            raise RuntimeError("Not a binary configuration file")
+        data = marshal.loads(memoryview(content)[len(_MAGIC) + 1 :])
+        if content[len(_MAGIC)] & _TAGGED:
+            # The unmarshalled data is not shared with anything, the tags can be replaced in place
+            data, paths = data
+            dependencies: List[Tuple[Path, Signature]] = []
+            for path in paths:
+                parent = data
+                for part in path[:-1]:
+                    parent = parent[part]
+                tag, argument = parent[path[-1]]
+                if tag == _REF:
+                    parent[path[-1]] = Reference(argument)
+                elif tag == _INCLUDE:
+                    parent[path[-1]] = cls._include_from(stream, argument, dependencies)
+                else:
+                    raise RuntimeError(f'Invalid tag "{tag}"')
+            if _dependencies is not None:
+                _dependencies.extend(dependencies)
+        if not isinstance(data, dict):
+            raise RuntimeError("Configuration root element must be a mapping")
+        if _root:
+            data = resolve_references(data)
+
+        return data
+
+    @staticmethod
+    def _dump(data: Dict[str, Any], stream: IO[Any]) -> None:
+        paths: List[Tuple[Union[str, int], ...]] = []
+        encoded = _encode(data, [], paths)
+        if len(paths) > 0:
+            stream.write(_MAGIC + bytes([_TAGGED]) + marshal.dumps((encoded, paths), 4))
+        else:
+            stream.write(_MAGIC + bytes([0]) + marshal.dumps(encoded, 4))
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Type, cast
+
+from fennec_dl.config.config import MISSING, BasicConfigEntryType, Config, ConfigEntryType
+from fennec_dl.errors.invalid_operation_error import InvalidOperationError
+from fennec_dl.errors.readonly_error import ReadOnlyError
+
+
+_DIGEST = "_CompiledConfig__digest"
+
+
+class CompiledConfig:
+    # Read-only record of a StaticConfig (see StaticConfig.compile), fields are stored in __slots__ of a class generated per schema
+    # Fields typed as DynamicConfig are left uncompiled, records hold a frozen clone of them
+    # The cached digest is a slot of the generated class as well, next to the fields
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _names: FrozenSet[str] = frozenset()
+    _setters: Tuple[Callable[[Any, Any], None], ...] = ()
+    _set_digest: ClassVar[Callable[[Any, Optional[bytes]], None]]
+    _source: ClassVar[Type[Config]]
+
+    @classmethod
+    def _generate(cls, source: Type[Config], fields: Tuple[str, ...]) -> Type[CompiledConfig]:
+        record_type = cast(Type[CompiledConfig], type(source.__name__, (cls,), {"__slots__": fields + (_DIGEST,), "__qualname__": source.__qualname__ + ".Compiled", "__module__": source.__module__}))
+        record_type._fields = fields
+        record_type._names = frozenset(fields)
+        record_type._setters = tuple(record_type.__dict__[name].__set__ for name in fields)
+        record_type._set_digest = record_type.__dict__[_DIGEST].__set__
+        record_type._source = source
+        return record_type
+
+    @classmethod
+    def _make(cls, values: List[Any]) -> CompiledConfig:
+        record = object.__new__(cls)
+        cls._set_digest(record, None)
+        for setter, value in zip(cls._setters, values):
+            setter(record, value)
+        return record
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise ReadOnlyError("Config is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise InvalidOperationError()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Config) and Config._equal(self, other)
+
+    def __hash__(self) -> int:
+        return int.from_bytes(self._digest()[:8], "little", signed=True)
+
+    def fingerprint(self) -> str:
+        return self._digest().hex()
+
+    def _entries(self) -> List[Tuple[str, Any]]:
+        return [(name, getattr(self, name)) for name in self._fields]
+
+    def _digest(self) -> bytes:
+        digest: Optional[bytes] = getattr(self, _DIGEST)
+        if digest is None:
+            digest = Config._digest_entries(self._entries())
+            type(self)._set_digest(self, digest)
+        return digest
+
+    def _entry(self, name: str) -> Any:
+        return getattr(self, name) if name in self._names else MISSING
+
+    def __len__(self) -> int:
+        return Config._count(self._entries())
+
+    def __contains__(self, fqn: str) -> bool:
+        return self._lookup(fqn) is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_keys()
+
+    def keys(self) -> Set[str]:
+        return set(self.iter_keys())
+
+    def items(self) -> List[Tuple[str, BasicConfigEntryType]]:
+        return list(self.iter_items())
+
+    def iter_keys(self) -> Iterator[str]:
+        return (key for key, _ in Config._flatten(self._entries()))
+
+    def iter_items(self) -> Iterator[Tuple[str, BasicConfigEntryType]]:
+        return ((key, value) for key, value in Config._flatten(self._entries()) if not isinstance(value, (Config, dict)))
+
+    def __getitem__(self, fqn: str) -> Any:
+        value = self._lookup(fqn)
+        if value is MISSING:
+            raise AttributeError(f'Config has no attribute "{fqn}"')
+        return value
+
+    def _lookup(self, fqn: str) -> Any:
+        # Subconfigs of records are records, lookups work as for Config
+        return Config._lookup(cast(Config, self), fqn)
+
+    def __setitem__(self, fqn: str, value: ConfigEntryType) -> None:
+        raise ReadOnlyError("Config is read-only")
+
+    def __delitem__(self, fqn: str) -> None:
+        raise InvalidOperationError()
+
+    def clone(self) -> Config:
+        # Clones are regular (mutable) configs of the compiled type
+        return cast(Any, self._source)(self.to_dict(), cast(Any, Config)._Config__secret)
+
+    def compile(self) -> CompiledConfig:
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Record types are generated, records are pickled along with the StaticConfig type they were compiled from instead
+        return (_make, (self._source, tuple(getattr(self, name) for name in self._fields)))
+
+    def to_dict(self) -> Dict[str, ConfigEntryType]:
+        return {name: CompiledConfig.__to_dict(getattr(self, name)) for name in self._fields}
+
+    @staticmethod
+    def __to_dict(value: Any) -> Any:
+        if isinstance(value, CompiledConfig):
+            return value.to_dict()
+        elif isinstance(value, array):
+            return value.tolist()
+        elif isinstance(value, list):
+            return [CompiledConfig.__to_dict(x) for x in cast(List[Any], value)]
+        return value
+
+    @property
+    def readonly(self) -> bool:
+        return True
+
+    def freeze(self) -> None:
+        pass
+
+
+def _make(source: Any, values: Tuple[Any, ...]) -> CompiledConfig:
+    return source._compiled_type()._make(list(values))
+
+
+Config.register(CompiledConfig)
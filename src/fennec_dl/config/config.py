@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import copyreg
+import hashlib
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterator, List, Set, Tuple, Union
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, cast
+
+import fennec_dl.config.access_tracker as access_tracker
 
 
 BasicConfigEntryType = Union[type(None), bool, int, float, str]
 ConfigEntryType = Union[BasicConfigEntryType, List["ConfigEntryType"], Dict[str, "ConfigEntryType"]]
 
+MISSING = object()
+
 
 class Config(ABC):
     __secret = object()
@@ -15,41 +23,498 @@ def __init__(self, dict_: Dict[str, ConfigEntryType], secret: object = None) ->
         super().__init__()
         assert secret == Config.__secret
         self.__dict__["_Config__readonly"] = False
+        self.__dict__["_Config__parent"] = None
+        self.__dict__["_Config__name"] = None
+        self.__dict__["_Config__index"] = None
+        self.__dict__["_Config__size"] = None
+        self.__dict__["_Config__view"] = None
+        self.__dict__["_Config__digest"] = None
+        self.__dict__["_Config__sharers"] = []
 
-    @abstractmethod
     def __eq__(self, other: object) -> bool:
-        ...
+        return isinstance(other, Config) and Config._equal(self, other)
+
+    def __hash__(self) -> int:
+        if not self.readonly:
+            raise TypeError("Only read-only configs are hashable")
+        return int.from_bytes(self._digest()[:8], "little", signed=True)
+
+    def fingerprint(self) -> str:
+        # Canonical content hash, independent of the order of entries and of the config type, entries that are equal have equal fingerprints (e.g. 1 and 1.0)
+        # In-place changes of list entries are not tracked
+        return self._digest().hex()
+
+    def _digest(self) -> bytes:
+        # Cached per node and dropped along the ancestors of changed entries (see _changed), so only changed subtrees are hashed again
+        digest = self.__dict__["_Config__digest"]
+        if digest is None:
+            digest = self.__dict__["_Config__digest"] = Config._digest_entries(self._entries())
+        return digest
+
+    @staticmethod
+    def _digest_entries(entries: Iterable[Tuple[str, Any]]) -> bytes:
+        parts: List[bytes] = []
+        for name, value in sorted(entries, key=lambda x: x[0]):
+            encoded = name.encode("UTF-8")
+            parts.append(b"%d:" % len(encoded))
+            parts.append(encoded)
+            Config.__encode(parts, value)
+        return hashlib.blake2b(b"".join(parts), digest_size=16).digest()
+
+    @staticmethod
+    def __encode(parts: List[bytes], value: Any) -> None:
+        if isinstance(value, str):
+            encoded = value.encode("UTF-8")
+            parts.append(b"s%d:" % len(encoded))
+            parts.append(encoded)
+        elif isinstance(value, int):
+            # Includes bools, True == 1
+            parts.append(b"i%d;" % value)
+        elif isinstance(value, float):
+            if value.is_integer():
+                parts.append(b"i%d;" % int(value))
+            elif value != value:
+                parts.append(b"f;")
+            else:
+                parts.append(b"f%s;" % value.hex().encode("ascii"))
+        elif value is None:
+            parts.append(b"n")
+        elif isinstance(value, Config):
+            parts.append(b"{")
+            parts.append(cast(Any, value)._digest())
+        elif isinstance(value, dict):
+            parts.append(b"{")
+            parts.append(Config._digest_entries(cast(Dict[str, Any], value).items()))
+        elif isinstance(value, (list, array)):
+            parts.append(b"[")
+            for x in cast(List[Any], value):
+                Config.__encode(parts, x)
+            parts.append(b"]")
+        else:
+            encoded = f"{type(value).__qualname__}:{value!r}".encode("UTF-8")
+            parts.append(b"r%d:" % len(encoded))
+            parts.append(encoded)
 
     def __len__(self) -> int:
-        return len(list(self.keys()))
+        size = self.__dict__["_Config__size"]
+        if size is None:
+            size = self.__dict__["_Config__size"] = Config._count(self._entries())
+        return size
+
+    @staticmethod
+    def _count(entries: Iterable[Tuple[str, Any]]) -> int:
+        # Number of entries of a subtree given its direct entries (shared with CompiledConfig)
+        size = 0
+        for _, value in entries:
+            size += 1 + Config.__count(value)
+        return size
+
+    @staticmethod
+    def __count(value: Any) -> int:
+        if isinstance(value, Config):
+            return len(value)
+        elif isinstance(value, dict):
+            return sum(1 + Config.__count(x) for x in cast(Dict[str, Any], value).values())
+        return 0
 
     def __contains__(self, fqn: str) -> bool:
-        for key in self.keys():
-            if key.startswith(fqn) and (len(fqn) == len(fqn) or key[len(fqn)] == "."):
-                return True
-        return False
+        root, prefix = self.__locate()
+        if prefix + fqn in root.__fqn_index():
+            return True
+        # Not indexed, might still be part of a subtree that has not been materialized yet
+        return self._lookup(fqn) is not MISSING
+
+    def _lookup(self, fqn: str) -> Any:
+        # Entry as stored, found without building the index or materializing anything on the way, MISSING if there is none
+        value: Any = self
+        for part in fqn.split("."):
+            if isinstance(value, Config):
+                value = value._entry(part)
+            elif isinstance(value, dict):
+                value = cast(Dict[str, Any], value).get(part, MISSING)
+            else:
+                return MISSING
+            if value is MISSING:
+                return MISSING
+        return value
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self.keys())
+        return self.iter_keys()
+
+    def keys(self) -> Set[str]:
+        return set(self.__flat_view()[0])
+
+    def items(self) -> List[Tuple[str, BasicConfigEntryType]]:
+        if access_tracker._active is not None:
+            access_tracker._active._bulk_read(self._fqn(""))
+        return list(self.__flat_view()[1])
+
+    def iter_keys(self) -> Iterator[str]:
+        view = self.__dict__["_Config__view"]
+        if view is not None:
+            return iter(view[0])
+        return (key for key, value in Config._flatten(self._entries()))
+
+    def iter_items(self) -> Iterator[Tuple[str, BasicConfigEntryType]]:
+        if access_tracker._active is not None:
+            access_tracker._active._bulk_read(self._fqn(""))
+        view = self.__dict__["_Config__view"]
+        if view is not None:
+            return iter(view[1])
+        return ((key, value) for key, value in Config._flatten(self._entries()) if not isinstance(value, (Config, dict)))
+
+    def __flat_view(self) -> Tuple[List[str], List[Tuple[str, BasicConfigEntryType]]]:
+        # Flattened keys and items, kept until the subtree changes (see _changed)
+        view = self.__dict__["_Config__view"]
+        if view is None:
+            keys = []
+            items = []
+            for key, value in Config._flatten(self._entries()):
+                keys.append(key)
+                if not isinstance(value, (Config, dict)):
+                    items.append((key, value))
+            view = self.__dict__["_Config__view"] = (keys, items)
+        return view
+
+    @staticmethod
+    def _flatten(entries: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Any]]:
+        # Yields all entries of the subtree with the given direct entries depth-first without materializing anything, subtrees are yielded as they are stored (shared with CompiledConfig)
+        # Lists of nested mappings are yielded as copies, the mappings of lazy configs may be shared with Loader.include_cache
+        stack = [("", iter(entries), False)]
+        while len(stack) > 0:
+            prefix, entries, mapping = stack[-1]
+            for name, value in entries:
+                if mapping and isinstance(value, list):
+                    value = Config._copy_list(cast(List[Any], value))
+                yield prefix + name, value
+                if isinstance(value, Config):
+                    stack.append((prefix + name + ".", iter(value._entries()), False))
+                    break
+                elif isinstance(value, dict):
+                    stack.append((prefix + name + ".", iter(cast(Dict[str, Any], value).items()), True))
+                    break
+            else:
+                stack.pop()
+
+    @staticmethod
+    def _copy_list(values: List[Any]) -> List[Any]:
+        # Copies a list and the lists nested in it
+        return [Config._copy_list(cast(List[Any], x)) if isinstance(x, list) else x for x in values]
 
     @abstractmethod
-    def keys(self, _prefix: str = "") -> Set[str]:
+    def _entries(self) -> Iterable[Tuple[str, Any]]:
+        # Direct entries as stored, nested mappings and configs owned by another config are subtrees that have not been materialized yet
         ...
 
     @abstractmethod
-    def items(self, _prefix: str = "") -> List[Tuple[str, BasicConfigEntryType]]:
+    def _entry(self, name: str) -> Any:
         ...
 
     @abstractmethod
-    def __getitem__(self, fqn: str) -> Any:
+    def _set_entry(self, name: str, value: Any) -> None:
         ...
 
     @abstractmethod
-    def __setitem__(self, fqn: str, value: ConfigEntryType) -> Any:
+    def _copy_from(self, other: Config) -> None:
+        # Initializes the entries of a blank config from another config of the same type (see _copy)
         ...
 
+    def _owns(self, value: Any) -> bool:
+        return isinstance(value, Config) and value.__dict__["_Config__parent"] is self
+
+    def _child(self, name: str) -> Any:
+        value = self._entry(name)
+        if value is MISSING:
+            raise AttributeError(f'Config has no attribute "{name}"')
+        if isinstance(value, dict) or (isinstance(value, Config) and value.__dict__["_Config__parent"] is not self):
+            return self._materialize(name, value)
+        return value
+
+    def _materialize(self, name: str, value: Any) -> Any:
+        child = self._adopt(name, value._copy())
+        if self.readonly:
+            child.freeze()
+        self._set_entry(name, child)
+        self._materialized(name, child)
+        return child
+
+    def _copy(self) -> Config:
+        copy = self.__class__.__new__(self.__class__)
+        Config.__init__(copy, {}, Config.__secret)
+        copy._copy_from(self)
+        return copy
+
+    def _share(self, name: str, value: Any) -> Any:
+        # Returns the value to store in a copy for an entry of the copied config, subconfigs are shared until first accessed
+        if isinstance(value, Config):
+            if not value.readonly:
+                sharers = value.__dict__["_Config__sharers"]
+                sharers.append((weakref.ref(self), name))
+                if len(sharers) % 1024 == 0:
+                    sharers[:] = [(ref, name) for ref, name in sharers if ref() is not None]
+            return value
+        elif isinstance(value, list):
+            return [self._share(name, x) for x in cast(List[Any], value)]
+        elif isinstance(value, array):
+            return value[:]
+        return value
+
+    @staticmethod
+    def _numeric_array(values: List[Any]) -> Any:
+        # Stores non-empty lists of only ints or only floats as int64/double arrays, other lists are returned as they are
+        if len(values) == 0:
+            return values
+        types = set(map(type, values))
+        if types == {float}:
+            return array("d", values)
+        elif types == {int}:
+            try:
+                return array("q", values)
+            except OverflowError:
+                return values
+        return values
+
+    @staticmethod
+    def _node_entries(value: Any) -> Optional[Dict[str, Any]]:
+        # Direct entries of configs (including compiled and unmaterialized ones), None for other values
+        if isinstance(value, dict):
+            return cast(Dict[str, Any], value)
+        elif isinstance(value, Config):
+            return dict(cast(Any, value)._entries())
+        return None
+
+    @staticmethod
+    def __cached_digest(value: Config) -> Optional[bytes]:
+        # Compiled configs have no __dict__
+        state = getattr(value, "__dict__", None)
+        return None if state is None else state["_Config__digest"]
+
+    @staticmethod
+    def _equal(a: Any, b: Any) -> bool:
+        # Structural equality of configs or entry values, numeric arrays are equal to the corresponding lists
+        stack = [(a, b)]
+        while len(stack) > 0:
+            a, b = stack.pop()
+            if a is b:
+                # Shared subtrees (copy-on-write clones, references)
+                continue
+            a_entries = Config._node_entries(a)
+            b_entries = Config._node_entries(b)
+            if a_entries is not None or b_entries is not None:
+                if a_entries is None or b_entries is None or a_entries.keys() != b_entries.keys():
+                    return False
+                if isinstance(a, Config) and isinstance(b, Config) and a.readonly and b.readonly:
+                    # Equal configs have equal fingerprints, compare them if both are known already (only for read-only configs, in-place changes of list entries of others do not drop the cached digest)
+                    a_digest = Config.__cached_digest(a)
+                    b_digest = Config.__cached_digest(b)
+                    if a_digest is not None and b_digest is not None and a_digest != b_digest:
+                        return False
+                stack.extend((value, b_entries[name]) for name, value in a_entries.items())
+                continue
+            if isinstance(a, array):
+                a = a.tolist()
+            if isinstance(b, array):
+                b = b.tolist()
+            if a != b:
+                return False
+        return True
+
+    def __getitem__(self, fqn: str) -> Any:
+        if access_tracker._active is not None:
+            access_tracker._active._read(self._fqn(fqn))
+        return self.__get(fqn)
+
+    def __get(self, fqn: str) -> Any:
+        root, prefix = self.__locate()
+        value = root.__fqn_index().get(prefix + fqn, MISSING)
+        if value is MISSING:
+            value = self
+            for part in fqn.split("."):
+                if not isinstance(value, Config):
+                    raise AttributeError(f'Config has no attribute "{fqn}"')
+                try:
+                    value = value._child(part)
+                except AttributeError:
+                    raise AttributeError(f'Config has no attribute "{fqn}"') from None
+        if isinstance(value, (list, array)):
+            return self.__get_parent_by_fqn(fqn.rpartition(".")[0])._leaf(value)
+        return value
+
+    def __setitem__(self, fqn: str, value: ConfigEntryType) -> Any:
+        parent_fqn, _, name = fqn.rpartition(".")
+        setattr(self.__get_parent_by_fqn(parent_fqn), name, value)
+
+    def __delitem__(self, fqn: str) -> None:
+        parent_fqn, _, name = fqn.rpartition(".")
+        delattr(self.__get_parent_by_fqn(parent_fqn), name)
+
+    def __get_parent_by_fqn(self, parent_fqn: str) -> Config:
+        if len(parent_fqn) == 0:
+            return self
+        parent = self.__get(parent_fqn)
+        if not isinstance(parent, Config):
+            raise AttributeError(f'Config has no attribute "{parent_fqn}"')
+        return parent
+
+    def _fqn(self, name: str) -> str:
+        # FQN of an entry of this node relative to the root, FQN of the node itself for ""
+        prefix = self.__locate()[1]
+        return prefix + name if len(name) > 0 else prefix[:-1]
+
+    def __locate(self) -> Tuple[Config, str]:
+        node = self
+        parts = []
+        while node.__dict__["_Config__parent"] is not None:
+            parts.append(node.__dict__["_Config__name"])
+            node = node.__dict__["_Config__parent"]
+        return node, "".join(part + "." for part in reversed(parts))
+
+    def __fqn_index(self) -> Dict[str, Any]:
+        index = self.__dict__["_Config__index"]
+        if index is None:
+            index = dict(self._walk())
+            self.__dict__["_Config__index"] = index
+        return index
+
+    def _walk(self, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+        # Yields all materialized entries of the subtree
+        stack: List[Tuple[str, Config, Iterator[Tuple[str, Any]]]] = [(prefix, self, iter(self._entries()))]
+        while len(stack) > 0:
+            prefix, node, entries = stack[-1]
+            for name, value in entries:
+                if isinstance(value, dict):
+                    continue
+                if isinstance(value, Config):
+                    if value.__dict__["_Config__parent"] is not node:
+                        continue
+                    yield prefix + name, value
+                    stack.append((prefix + name + ".", value, iter(value._entries())))
+                    break
+                yield prefix + name, value
+            else:
+                stack.pop()
+
+    def _adopt(self, name: str, value: Any) -> Any:
+        if isinstance(value, Config):
+            if value.__dict__["_Config__parent"] is not None:
+                value = value.clone()
+            value.__dict__["_Config__parent"] = self
+            value.__dict__["_Config__name"] = name
+            value.__dict__["_Config__index"] = None
+        return value
+
+    def _writing(self) -> None:
+        # Must be called by subclasses before every change of a direct entry, configs sharing this node or one of its ancestors get a private copy of the path first
+        path: List[Config] = []
+        node = self
+        while node is not None:
+            path.append(node)
+            sharers = node.__dict__["_Config__sharers"]
+            if len(sharers) > 0:
+                node.__dict__["_Config__sharers"] = []
+                for ref, name in sharers:
+                    sharer = ref()
+                    if sharer is not None and sharer._entry(name) is node:
+                        sharer._set_entry(name, Config.__copy_path(path))
+                        Config.__drop_views(sharer)
+            node = node.__dict__["_Config__parent"]
+
+    def _leaf(self, value: Any) -> Any:
+        # Must be called by subclasses before handing out a list or array entry, it might be changed in place and configs sharing this node or one of its ancestors must not see that
+        node = self
+        while node is not None:
+            if len(node.__dict__["_Config__sharers"]) > 0:
+                self._writing()
+                break
+            node = node.__dict__["_Config__parent"]
+        return value
+
+    @staticmethod
+    def __copy_path(path: List[Config]) -> Config:
+        # Copies path[-1] and, within the copy, the nodes leading down to path[0]
+        copy = path[-1]._copy()
+        node = copy
+        for i in range(len(path) - 2, -1, -1):
+            child = path[i]._copy()
+            name = child.__dict__["_Config__name"] = path[i].__dict__["_Config__name"]
+            child.__dict__["_Config__parent"] = node
+            node._set_entry(name, child)
+            node = child
+        return copy
+
+    @staticmethod
+    def __drop_views(node: Optional[Config]) -> None:
+        # Flat views reference the list entries of a subtree, they are stale once the subtree is replaced by a copy
+        while node is not None:
+            node.__dict__["_Config__view"] = None
+            node = node.__dict__["_Config__parent"]
+
+    def _changed(self, name: str, old: Any, new: Any) -> None:
+        # Must be called by subclasses after every change of a direct entry (old/new are MISSING for added/removed entries)
+        structural = old is MISSING or new is MISSING or isinstance(old, (Config, dict)) or isinstance(new, Config)
+        owned = self._owns(old)
+        if owned and old is not new:
+            old.__dict__["_Config__parent"] = None
+            old.__dict__["_Config__name"] = None
+        node = self
+        parts = [name]
+        while True:
+            node.__dict__["_Config__view"] = None
+            node.__dict__["_Config__digest"] = None
+            if structural:
+                node.__dict__["_Config__size"] = None
+            if node.__dict__["_Config__parent"] is None:
+                break
+            parts.append(node.__dict__["_Config__name"])
+            node = node.__dict__["_Config__parent"]
+        index = node.__dict__["_Config__index"]
+        if index is None:
+            return
+        fqn = ".".join(reversed(parts))
+        if owned:
+            for key, _ in cast(Config, old)._walk(fqn + "."):
+                del index[key]
+        if new is MISSING:
+            index.pop(fqn, None)
+            return
+        index[fqn] = new
+        if isinstance(new, Config):
+            index.update(new._walk(fqn + "."))
+
+    def _materialized(self, name: str, value: Config) -> None:
+        # Must be called by subclasses after replacing a nested mapping by the corresponding config
+        Config.__drop_views(self)
+        root, prefix = self.__locate()
+        index = root.__dict__["_Config__index"]
+        if index is not None:
+            index[prefix + name] = value
+            index.update(value._walk(prefix + name + "."))
+
     def clone(self) -> Config:
-        return self.__class__(self.to_dict(), Config.__secret)
+        return self._copy()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Only the subtree itself is pickled, without parent, index and copy-on-write bookkeeping
+        return (copyreg.__newobj__, (self.__class__,), self.__getstate__())  # type: ignore
+
+    def __getstate__(self) -> Tuple[bool, Any]:
+        return (self.readonly, self._pack())
+
+    def __setstate__(self, state: Tuple[bool, Any]) -> None:
+        Config.__init__(self, {}, Config.__secret)
+        readonly, packed = state
+        self._unpack(packed)
+        if readonly:
+            self.freeze()
+
+    @abstractmethod
+    def _pack(self) -> Any:
+        # Compact picklable form of the entries, restored by _unpack on a blank config without validating or converting the values again
+        ...
+
+    @abstractmethod
+    def _unpack(self, packed: Any) -> None:
+        ...
 
     @abstractmethod
     def to_dict(self) -> Dict[str, ConfigEntryType]:
@@ -61,3 +526,6 @@ def readonly(self) -> bool:
 
     def freeze(self) -> None:
         self.__dict__["_Config__readonly"] = True
+        for _, value in self._entries():
+            if self._owns(value):
+                value.freeze()
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import copy
+import operator
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, cast
+
+from fennec_dl.config.config import MISSING, Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.sweep import ConfigSweep
+
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+# array typecodes of the typed column kinds, string columns store codes into their categories
+_TYPECODES = {"bool": "b", "int": "q", "float": "d", "str": "i"}
+
+
+class _Column(NamedTuple):
+    kind: str
+    # array for typed kinds, list for "object"
+    data: Any
+    categories: Optional[List[str]]
+    # None if the entry is present in all rows
+    present: Optional[bytearray]
+
+
+def _kind(value: Any) -> str:
+    # Exact types only, e.g. bools are no ints here
+    type_ = type(value)
+    if type_ is bool:
+        return "bool"
+    if type_ is int or type_ is float:
+        return "number"
+    if type_ is str:
+        return "str"
+    return "object"
+
+
+def _column(values: List[Any]) -> _Column:
+    present = bytearray(value is not MISSING for value in values)
+    mask = None if present.count(0) == 0 else present
+    kinds = {type(value) for value in values if value is not MISSING}
+    if kinds <= {bool}:
+        return _Column("bool", array("b", [value is True for value in values]), None, mask)
+    if kinds <= {int}:
+        try:
+            return _Column("int", array("q", [0 if value is MISSING else value for value in values]), None, mask)
+        except OverflowError:
+            return _Column("object", values, None, mask)
+    if kinds <= {float}:
+        return _Column("float", array("d", [0.0 if value is MISSING else value for value in values]), None, mask)
+    if kinds <= {str}:
+        codes: Dict[str, int] = {}
+        data = array("i", [0 if value is MISSING else codes.setdefault(value, len(codes)) for value in values])
+        return _Column("str", data, list(codes), mask)
+    return _Column("object", values, None, mask)
+
+
+class ConfigFrame:
+    # Entries of many configs stored column-wise by FQN (as returned by iter_items), typed columns are arrays and strings are stored as categorical codes
+    # Rows lacking an entry are masked out, conditions never match them
+    def __init__(self, configs: Iterable[Config]) -> None:
+        super().__init__()
+        values = ConfigFrame.__sweep_values(configs) if isinstance(configs, ConfigSweep) else None
+        if values is None:
+            values = ConfigFrame.__values(configs)
+        self.__size = len(next(iter(values.values()))) if len(values) > 0 else 0
+        self.__columns = {key: _column(column) for key, column in values.items()}
+
+    @staticmethod
+    def __values(configs: Iterable[Config]) -> Dict[str, List[Any]]:
+        values: Dict[str, List[Any]] = {}
+        size = 0
+        for config in configs:
+            size += 1
+            for key, value in config.iter_items():
+                column = values.get(key)
+                if column is None:
+                    column = values[key] = [MISSING] * (size - 1)
+                column.append(value)
+            for column in values.values():
+                if len(column) < size:
+                    column.append(MISSING)
+        return values
+
+    @staticmethod
+    def __sweep_values(sweep: ConfigSweep[Any]) -> Optional[Dict[str, List[Any]]]:
+        # Sweeps of dynamic configs overwriting existing entries with plain values differ only in the overwritten columns, the configs are never built
+        if type(sweep.config) is not DynamicConfig:
+            return None
+        base = dict(sweep.config.iter_items())
+        overwritten = [fqn for fqn, _ in sweep.overwrites]
+        if not all(fqn in base for fqn in overwritten):
+            return None
+        size = len(sweep)
+        values = {key: [value] * size for key, value in base.items()}
+        for fqn in overwritten:
+            values[fqn] = []
+        for index in sweep.indices:
+            for fqn, value in sweep.combination(index):
+                if _kind(value) == "object" and value is not None:
+                    return None
+                values[fqn].append(value)
+        return values
+
+    def __len__(self) -> int:
+        return self.__size
+
+    @property
+    def columns(self) -> List[str]:
+        # In the order they were first encountered
+        return list(self.__columns)
+
+    def __column(self, fqn: str) -> _Column:
+        column = self.__columns.get(fqn)
+        if column is None:
+            raise KeyError(fqn)
+        return column
+
+    def kind(self, fqn: str) -> str:
+        # "bool", "int", "float", "str" or "object" (mixed types, None, lists, ...)
+        return self.__column(fqn).kind
+
+    def categories(self, fqn: str) -> List[str]:
+        # Strings of a "str" column by code
+        column = self.__column(fqn)
+        if column.categories is None:
+            raise ValueError(f'Column "{fqn}" is not categorical')
+        return column.categories
+
+    def array(self, fqn: str) -> array[Any]:
+        # Values of a typed column (codes for "str" columns), masked rows hold 0
+        column = self.__column(fqn)
+        if column.kind == "object":
+            raise ValueError(f'Column "{fqn}" has no array representation')
+        return cast(Any, column.data)
+
+    def present(self, fqn: str) -> bytearray:
+        # 1 per row holding the entry, 0 otherwise
+        column = self.__column(fqn)
+        return bytearray(b"\x01" * self.__size) if column.present is None else bytearray(column.present)
+
+    def column(self, fqn: str) -> List[Any]:
+        # Decoded values, None for rows lacking the entry
+        column = self.__column(fqn)
+        if column.kind == "bool":
+            values: List[Any] = [x == 1 for x in column.data]
+        elif column.kind == "str":
+            categories = cast(List[str], column.categories)
+            values = [categories[x] for x in column.data]
+        elif column.kind == "object":
+            values = [None if x is MISSING else x for x in column.data]
+        else:
+            values = column.data.tolist()
+        if column.present is not None:
+            values = [x if p else None for x, p in zip(values, column.present)]
+        return values
+
+    def to_numpy(self, fqn: str) -> Any:
+        # Requires numpy (not a dependency of fennec_dl), typed columns are shared without copying, masked arrays are returned if rows lack the entry
+        import numpy
+
+        column = self.__column(fqn)
+        if column.kind == "object":
+            result = numpy.empty(self.__size, dtype=object)
+            result[:] = [None if x is MISSING else x for x in column.data]
+        elif column.kind == "str":
+            result = numpy.asarray(cast(List[str], column.categories), dtype=object)[numpy.frombuffer(column.data, dtype=f"i{column.data.itemsize}")]
+        else:
+            result = numpy.frombuffer(column.data, dtype={"bool": numpy.bool_, "int": numpy.int64, "float": numpy.float64}[column.kind])
+        if column.present is None:
+            return result
+        return numpy.ma.MaskedArray(result, mask=numpy.frombuffer(column.present, dtype=numpy.uint8) == 0)
+
+    def rows(self, *conditions: Tuple[str, str, Any]) -> List[int]:
+        # Rows matching all (fqn, operator, value) conditions, e.g. ("optimizer.lr", "<", 1e-3), numbers only compare to numbers and strings only to strings, "in" takes a sequence of values
+        selected: Optional[List[int]] = None
+        for fqn, op, value in conditions:
+            matching = self.__matching(self.__column(fqn), op, value)
+            selected = [i for i in (range(self.__size) if selected is None else selected) if matching[i]]
+        return list(range(self.__size)) if selected is None else selected
+
+    def __matching(self, column: _Column, op: str, value: Any) -> bytearray:
+        if op == "in":
+            matching = bytearray(self.__size)
+            for x in value:
+                matching = bytearray(a | b for a, b in zip(matching, self.__matching(column, "==", x)))
+            return matching
+        if op not in _OPERATORS:
+            raise ValueError(f'Unknown operator "{op}"')
+        function = _OPERATORS[op]
+        kind = _kind(value)
+        if column.kind == "object":
+            if value is None:
+                matching = bytearray((x is None) == (op == "==") for x in column.data) if op in ("==", "!=") else bytearray(self.__size)
+            else:
+                matching = bytearray(_kind(x) == kind and ConfigFrame.__compare(function, x, value) for x in column.data)
+        elif value is None:
+            # Typed columns hold no None
+            matching = bytearray([op == "!="]) * self.__size
+        elif column.kind == "str" and kind == "str":
+            # Evaluated once per category, rows only compare codes
+            allowed = bytearray(function(category, value) for category in cast(List[str], column.categories))
+            matching = bytearray(allowed[x] for x in column.data)
+        elif (column.kind == "bool" and kind == "bool") or (column.kind in ("int", "float") and kind == "number"):
+            matching = bytearray(function(x, value) for x in column.data)
+        else:
+            return bytearray(self.__size)
+        if column.present is not None:
+            matching = bytearray(a & b for a, b in zip(matching, column.present))
+        return matching
+
+    @staticmethod
+    def __compare(function: Callable[[Any, Any], bool], a: Any, b: Any) -> bool:
+        try:
+            return bool(function(a, b))
+        except TypeError:
+            return False
+
+    def filter(self, *conditions: Tuple[str, str, Any]) -> ConfigFrame:
+        return self.take(self.rows(*conditions))
+
+    def take(self, rows: Sequence[int]) -> ConfigFrame:
+        # Frame of the given rows (in the given order), categories are kept as they are
+        frame = ConfigFrame([])
+        frame.__size = len(rows)
+        for fqn, column in self.__columns.items():
+            data = [column.data[i] for i in rows] if column.kind == "object" else array(_TYPECODES[column.kind], [column.data[i] for i in rows])
+            present = None if column.present is None else bytearray(column.present[i] for i in rows)
+            if present is not None and present.count(0) == len(rows):
+                # Rows of the frame never had the entry
+                continue
+            frame.__columns[fqn] = _Column(column.kind, data, column.categories, None if present is None or present.count(0) == 0 else present)
+        return frame
+
+    def group_by(self, *fqns: str) -> Dict[Tuple[Any, ...], ConfigFrame]:
+        # Frames by the values of the given entries (None for rows lacking them) in the order the groups first occur
+        groups: Dict[Tuple[Any, ...], List[int]] = {}
+        for i, key in enumerate(zip(*[self.__keys(fqn) for fqn in fqns])):
+            groups.setdefault(key, []).append(i)
+        return {tuple(self.__value(self.__columns[fqn], rows[0]) for fqn in fqns): self.take(rows) for key, rows in groups.items()}
+
+    def __keys(self, fqn: str) -> List[Any]:
+        # Hashable per-row keys, codes for strings and typed values for other columns (e.g. True and 1 are different groups)
+        column = self.__column(fqn)
+        if column.kind == "object":
+            keys: List[Any] = [(type(x), x) if _kind(x) != "object" or x is None else (type(x), repr(x)) for x in column.data]
+        else:
+            keys = list(column.data)
+        if column.present is not None:
+            keys = [x if p else MISSING for x, p in zip(keys, column.present)]
+        return keys
+
+    @staticmethod
+    def __value(column: _Column, index: int) -> Any:
+        if column.present is not None and not column.present[index]:
+            return None
+        value = column.data[index]
+        if column.kind == "str":
+            return cast(List[str], column.categories)[value]
+        if column.kind == "bool":
+            return value == 1
+        return value
+
+    def varying(self) -> List[str]:
+        # Columns whose value differs between rows or that some rows lack
+        result = []
+        for fqn, column in self.__columns.items():
+            if column.present is not None:
+                result.append(fqn)
+            elif column.kind == "object":
+                if any(_kind(x) != _kind(column.data[0]) or x != column.data[0] for x in column.data):
+                    result.append(fqn)
+            elif len(column.data) > 0 and min(column.data) != max(column.data):
+                result.append(fqn)
+        return result
+
+    def row(self, index: int) -> DynamicConfig:
+        # New config of the entries of a row (lists are copied)
+        if not -self.__size <= index < self.__size:
+            raise IndexError(f"Row {index} out of range")
+        index %= max(self.__size, 1)
+        dict_: Dict[str, Any] = {}
+        for fqn, column in self.__columns.items():
+            if column.present is not None and not column.present[index]:
+                continue
+            value = ConfigFrame.__value(column, index)
+            if column.kind == "object":
+                value = copy.deepcopy(value)
+            node = dict_
+            *path, name = fqn.split(".")
+            for part in path:
+                node = node.setdefault(part, {})
+            node[name] = value
+        return DynamicConfig(dict_, cast(Any, Config)._Config__secret)
+
+    def __getitem__(self, index: int) -> DynamicConfig:
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[DynamicConfig]:
+        for index in range(self.__size):
+            yield self.row(index)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, Union, cast
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.include_cache import IncludeCache, Signature
+from fennec_dl.config.loader import Loader
+from fennec_dl.config.yaml_loader import YAMLLoader
+
+
+_FORMAT = 1
+_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in")
+
+
+class IndexUpdate(NamedTuple):
+    # Paths relative to the indexed directory, failed files are part of indexed as well (and retried by every update)
+    indexed: List[str]
+    removed: List[str]
+    failed: List[str]
+
+
+class ConfigIndex:
+    # SQLite index of the flattened entries of all config files in a directory (e.g. one per run), queries do not parse any files
+    # Files are re-parsed by update() only if they or one of the files they include changed (by signature, then by content), files that failed to load every time
+    def __init__(self, directory: Union[str, Path], index_path: Optional[Union[str, Path]] = None, loader: Type[Loader] = YAMLLoader, pattern: str = "**/*.yaml") -> None:
+        super().__init__()
+        self.__directory = Path(directory).resolve()
+        self.__index_path = self.__directory / ".fennec_dl_index.sqlite" if index_path is None else Path(index_path)
+        self.__loader = loader
+        self.__pattern = pattern
+        self.__connection = sqlite3.connect(str(self.__index_path))
+        self.__initialize()
+
+    @property
+    def directory(self) -> Path:
+        return self.__directory
+
+    @property
+    def index_path(self) -> Path:
+        return self.__index_path
+
+    def __initialize(self) -> None:
+        # The index is rebuilt from scratch if it was written by another format or loader
+        loader = f"{self.__loader.__module__}.{self.__loader.__qualname__}"
+        with self.__connection:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            meta = dict(self.__connection.execute("SELECT key, value FROM meta").fetchall())
+            if meta.get("format") != _FORMAT or meta.get("loader") != loader or meta.get("pattern") != self.__pattern:
+                for table in ("entries", "dependencies", "files", "meta"):
+                    self.__connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self.__connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value)")
+                self.__connection.executemany("INSERT INTO meta VALUES (?, ?)", [("format", _FORMAT), ("loader", loader), ("pattern", self.__pattern)])
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, error TEXT)")
+            # Root file first, then all included files
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS dependencies (file INTEGER NOT NULL, path TEXT NOT NULL, inode INTEGER, size INTEGER, mtime_ns INTEGER, digest TEXT)")
+            # kind is "n" for numbers, "s" for strings, "b" for bools, "l" for lists (stored as JSON) and "" for None, values compare only to values of the same kind
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS entries (file INTEGER NOT NULL, fqn TEXT NOT NULL, value, kind TEXT NOT NULL)")
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS dependencies_file ON dependencies (file)")
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS entries_fqn_value ON entries (fqn, value)")
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS entries_file ON entries (file)")
+
+    def close(self) -> None:
+        self.__connection.close()
+
+    def __enter__(self) -> ConfigIndex:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def __digest(path: Union[str, Path]) -> str:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def update(self) -> IndexUpdate:
+        paths = {str(path.relative_to(self.__directory)): path for path in sorted(self.__directory.glob(self.__pattern)) if path.is_file() and path.resolve() != self.__index_path.resolve()}
+        known = {name: (id_, error) for name, id_, error in self.__connection.execute("SELECT path, id, error FROM files")}
+        indexed = []
+        removed = []
+        failed = []
+        with self.__connection:
+            for name in sorted(set(known) - set(paths)):
+                self.__remove(known[name][0])
+                removed.append(name)
+            for name, path in paths.items():
+                if name in known:
+                    id_, error = known[name]
+                    # Failures might be caused by includes that are missing or broken, those are not known as dependencies
+                    if error is None and not self.__changed(id_):
+                        continue
+                    self.__remove(id_)
+                if not self.__index(name, path):
+                    failed.append(name)
+                indexed.append(name)
+        return IndexUpdate(indexed, removed, failed)
+
+    def __changed(self, id_: int) -> bool:
+        # Files whose signature changed but whose content did not (e.g. touched or copied) only get their signatures updated
+        dependencies = self.__connection.execute("SELECT rowid, path, inode, size, mtime_ns, digest FROM dependencies WHERE file = ?", (id_,)).fetchall()
+        touched = []
+        try:
+            for rowid, path, inode, size, mtime_ns, digest in dependencies:
+                signature = IncludeCache.signature(path)
+                if signature == (inode, size, mtime_ns):
+                    continue
+                if ConfigIndex.__digest(path) != digest:
+                    return True
+                touched.append((*signature, rowid))
+        except OSError:
+            return True
+        self.__connection.executemany("UPDATE dependencies SET inode = ?, size = ?, mtime_ns = ? WHERE rowid = ?", touched)
+        return False
+
+    def __remove(self, id_: int) -> None:
+        self.__connection.execute("DELETE FROM entries WHERE file = ?", (id_,))
+        self.__connection.execute("DELETE FROM dependencies WHERE file = ?", (id_,))
+        self.__connection.execute("DELETE FROM files WHERE id = ?", (id_,))
+
+    def __index(self, name: str, path: Path) -> bool:
+        # Failed files are recorded with their error, without entries and dependencies
+        path = path.resolve()
+        error = None
+        entries: List[Tuple[str, Any, str]] = []
+        try:
+            signature = IncludeCache.signature(path)
+            with open(path, "rb") as file:
+                content = file.read()
+            dependencies: List[Tuple[Path, Signature]] = [(path, signature)]
+            stream = self.__loader._stream(content if self.__loader._binary else content.decode("UTF-8"))
+            cast(Any, stream).name = str(path)
+            dict_ = self.__loader._load(stream, True, dependencies)
+            for key, value in DynamicConfig(dict_, cast(Any, Config)._Config__secret).iter_items():
+                entries.append(ConfigIndex.__encode(key, value))
+            digests = [hashlib.sha256(content).hexdigest()] + [ConfigIndex.__digest(dependency) for dependency, _ in dependencies[1:]]
+        except Exception as e:
+            error = f"{type(e).__qualname__}: {e}"
+            dependencies = []
+            digests = []
+        id_ = self.__connection.execute("INSERT INTO files (path, error) VALUES (?, ?)", (name, error)).lastrowid
+        self.__connection.executemany("INSERT INTO dependencies VALUES (?, ?, ?, ?, ?, ?)", [(id_, str(dependency), *signature, digest) for (dependency, signature), digest in zip(dependencies, digests)])
+        self.__connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", [(id_, key, value, kind) for key, value, kind in entries])
+        return error is None
+
+    @staticmethod
+    def __encode(key: str, value: Any) -> Tuple[str, Any, str]:
+        if isinstance(value, bool):
+            return key, int(value), "b"
+        if isinstance(value, (int, float)):
+            return key, value, "n"
+        if isinstance(value, str):
+            return key, value, "s"
+        if value is None:
+            return key, value, ""
+        return key, json.dumps(list(value)), "l"
+
+    @staticmethod
+    def __decode(value: Any, kind: str) -> Any:
+        if kind == "b":
+            return bool(value)
+        if kind == "l":
+            return json.loads(value)
+        return value
+
+    def __condition(self, fqn: str, operator: str, value: Any) -> Tuple[str, List[Any]]:
+        if operator not in _OPERATORS:
+            raise ValueError(f'Unknown operator "{operator}"')
+        if operator == "in":
+            conditions = [self.__condition(fqn, "==", x) for x in value]
+            if len(conditions) == 0:
+                return "0", []
+            return "(" + " OR ".join(sql for sql, _ in conditions) + ")", [x for _, params in conditions for x in params]
+        _, encoded, kind = ConfigIndex.__encode(fqn, value)
+        if value is None:
+            # Compared by identity, entries that are missing in a file never match
+            return f"id {'NOT ' if operator == '!=' else ''}IN (SELECT file FROM entries WHERE fqn = ? AND value IS NULL) AND id IN (SELECT file FROM entries WHERE fqn = ?)", [fqn, fqn]
+        if operator == "!=":
+            return "id IN (SELECT file FROM entries WHERE fqn = ? AND NOT (value = ? AND kind = ?))", [fqn, encoded, kind]
+        return f"id IN (SELECT file FROM entries WHERE fqn = ? AND value {'=' if operator == '==' else operator} ? AND kind = ?)", [fqn, encoded, kind]
+
+    def query(self, *conditions: Tuple[str, str, Any]) -> List[str]:
+        # Sorted paths (relative to the directory) of the successfully indexed files matching all (fqn, operator, value) conditions, e.g. ("optimizer.lr", "<", 1e-3)
+        # Numbers only compare to numbers and strings only to strings, "in" takes a sequence of values
+        sql = ["error IS NULL"]
+        params: List[Any] = []
+        for fqn, operator, value in conditions:
+            condition, condition_params = self.__condition(fqn, operator, value)
+            sql.append(condition)
+            params.extend(condition_params)
+        return [path for (path,) in self.__connection.execute(f"SELECT path FROM files WHERE {' AND '.join(sql)} ORDER BY path", params)]
+
+    def paths(self) -> List[str]:
+        return self.query()
+
+    def errors(self) -> Dict[str, str]:
+        # Errors of files that could not be loaded by path
+        return dict(self.__connection.execute("SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path").fetchall())
+
+    def items(self, path: str) -> List[Tuple[str, Any]]:
+        # Indexed entries of a file (as items() of its config would return them, but lists as lists)
+        return [(key, ConfigIndex.__decode(value, kind)) for key, value, kind in self.__connection.execute("SELECT entries.fqn, entries.value, entries.kind FROM entries JOIN files ON files.id = entries.file WHERE files.path = ? ORDER BY entries.rowid", (path,))]
+
+    def values(self, fqn: str, paths: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        # Values of one entry by path, of the given paths or all files
+        rows = self.__connection.execute("SELECT files.path, entries.value, entries.kind FROM entries JOIN files ON files.id = entries.file WHERE entries.fqn = ? ORDER BY files.path", (fqn,)).fetchall()
+        selected = None if paths is None else set(paths)
+        return {path: ConfigIndex.__decode(value, kind) for path, value, kind in rows if selected is None or path in selected}
@@ -0,0 +1,39 @@
+from typing import Any, List, NamedTuple, Tuple, cast
+
+from fennec_dl.config.config import Config
+
+
+class ConfigDiff(NamedTuple):
+    # Sorted FQNs, added/removed subtrees are only reported by the FQN of their root
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+
+def diff(a: Config, b: Config) -> ConfigDiff:
+    # Entries of b that are not in a are added, entries of a that are not in b are removed
+    added = []
+    removed = []
+    changed = []
+    stack: List[Tuple[str, Any, Any]] = [("", a, b)]
+    while len(stack) > 0:
+        prefix, a_node, b_node = stack.pop()
+        a_entries = cast(Any, Config._node_entries(a_node))
+        b_entries = cast(Any, Config._node_entries(b_node))
+        for name, a_value in a_entries.items():
+            if name not in b_entries:
+                removed.append(prefix + name)
+                continue
+            b_value = b_entries[name]
+            if a_value is b_value:
+                continue
+            a_node_value = isinstance(a_value, (Config, dict))
+            b_node_value = isinstance(b_value, (Config, dict))
+            if a_node_value and b_node_value:
+                stack.append((prefix + name + ".", a_value, b_value))
+            elif a_node_value or b_node_value or not Config._equal(a_value, b_value):
+                changed.append(prefix + name)
+        for name in b_entries:
+            if name not in a_entries:
+                added.append(prefix + name)
+    return ConfigDiff(sorted(added), sorted(removed), sorted(changed))
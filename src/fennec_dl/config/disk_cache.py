@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from fennec_dl.config.include_cache import IncludeCache, Signature
+
+
+_FORMAT = 1
+
+
+class DiskCache:
+    def __init__(self, directory: Union[str, Path], max_size: int = 256 * 1024 * 1024) -> None:
+        super().__init__()
+        self.__directory = Path(directory)
+        self.__max_size = max_size
+
+    @property
+    def directory(self) -> Path:
+        return self.__directory
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @staticmethod
+    def key(loader: str, path: Path, content: bytes) -> str:
+        # Entries are specific to the loader, the location of the root file (includes are relative to it) and its content
+        digest = hashlib.sha256()
+        for part in (f"{_FORMAT}", f"{sys.version_info[0]}.{sys.version_info[1]}", loader, str(path)):
+            digest.update(part.encode("UTF-8"))
+            digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    @staticmethod
+    def __digest(path: Union[str, Path]) -> str:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        # Returns the cached data if none of the included files changed since, None otherwise
+        try:
+            with open(self.__directory / key, "rb") as file:
+                format_, dependencies, data = marshal.loads(file.read())
+            if format_ != _FORMAT:
+                return None
+            for path, digest in dependencies:
+                if DiskCache.__digest(path) != digest:
+                    return None
+            os.utime(self.__directory / key)
+        except Exception:
+            return None
+        return data
+
+    def put(self, key: str, data: Dict[str, Any], dependencies: Sequence[Tuple[Path, Signature]]) -> None:
+        # Included files are hashed after parsing, entries are skipped if any of them changed in between
+        try:
+            digests = []
+            for path, signature in dependencies:
+                digest = DiskCache.__digest(path)
+                if IncludeCache.signature(path) != signature:
+                    return
+                digests.append((str(path), digest))
+            content = marshal.dumps((_FORMAT, digests, data))
+        except (OSError, ValueError):
+            # Files vanished or the data contains values marshal cannot handle (e.g. timestamps)
+            return
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file first and renamed, readers never see partially written entries
+        fd, temp_path = tempfile.mkstemp(dir=self.__directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.replace(temp_path, self.__directory / key)
+        except OSError:
+            Path(temp_path).unlink(missing_ok=True)
+            return
+        self.__evict()
+
+    def __evict(self) -> None:
+        # Removes the least recently used entries until the cache fits into max_size
+        entries = []
+        try:
+            with os.scandir(self.__directory) as it:
+                for entry in it:
+                    if entry.name.startswith(".tmp-") or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.__max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            size -= entry_size
+
+    def clear(self) -> None:
+        if not self.__directory.exists():
+            return
+        for path in self.__directory.iterdir():
+            if path.is_file():
+                path.unlink(missing_ok=True)
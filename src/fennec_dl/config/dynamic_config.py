@@ -1,63 +1,97 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Set, Tuple, cast
+from array import array
+from typing import Any, Dict, Iterable, List, Tuple, cast
 
-from fennec_dl.config.config import BasicConfigEntryType, Config, ConfigEntryType
+import fennec_dl.config.access_tracker as access_tracker
+from fennec_dl.config.compiled_config import CompiledConfig
+from fennec_dl.config.config import MISSING, Config, ConfigEntryType
 from fennec_dl.errors.config_loading_error import ConfigLoadingError
 from fennec_dl.errors.readonly_error import ReadOnlyError
 
 
 class DynamicConfig(Config):
-    def __init__(self, dict_: Dict[str, ConfigEntryType], secret: object = None) -> None:
+    def __init__(self, dict_: Dict[str, ConfigEntryType], secret: object = None, lazy: bool = False, arrays: bool = False) -> None:
         super().__init__(dict_, secret)
-        self.__dict__["_DynamicConfig__data"] = {k: DynamicConfig._parse(v) for k, v in dict_.items()}
+        # In arrays mode, lists of only ints or only floats are stored as array.array (see Config._numeric_array)
+        # Such entries are read as arrays, which never equal lists (config.a == [1, 2] is False, compare with .tolist() or array("q", [1, 2])), configs holding them still equal configs holding the lists
+        self.__dict__["_DynamicConfig__arrays"] = arrays
+        if lazy:
+            # Nested mappings are kept as they are and only wrapped on first access (see _materialize)
+            self.__dict__["_DynamicConfig__data"] = {k: v if isinstance(v, dict) else self._adopt(k, DynamicConfig._parse(v, False, arrays)) for k, v in dict_.items()}
+        else:
+            self.__dict__["_DynamicConfig__data"] = {k: self._adopt(k, DynamicConfig._parse(v, False, arrays)) for k, v in dict_.items()}
 
     @staticmethod
-    def _parse(value: ConfigEntryType, in_list: bool = False) -> Any:
+    def _parse(value: ConfigEntryType, in_list: bool = False, arrays: bool = False) -> Any:
         if isinstance(value, Dict):
             if in_list:
                 raise ConfigLoadingError(f'Lists of configs are not allowed (found at "{value}")')
-            return DynamicConfig(value, cast(Any, Config)._Config__secret)
+            return DynamicConfig(value, cast(Any, Config)._Config__secret, False, arrays)
         elif isinstance(value, List) and not isinstance(value, str):
+            if arrays and not in_list:
+                numeric = Config._numeric_array(value)
+                if numeric is not value:
+                    return numeric
             return [DynamicConfig._parse(x, True) for x in value]
+        elif isinstance(value, array):
+            return value[:] if arrays and not in_list else value.tolist()
+        elif isinstance(value, CompiledConfig):
+            return DynamicConfig._parse(value.to_dict(), in_list, arrays)
         else:
             return value
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Config):
-            return False
-        for key, value in self.items():
-            if key not in other:
-                return False
-            if value != other[key]:
-                return False
-        return True
-
-    def keys(self, _prefix: str = "") -> Set[str]:
-        keys = set()
-        for k, v in self.__dict__["_DynamicConfig__data"].items():
-            if isinstance(v, DynamicConfig):
-                keys.add(("" if len(_prefix) == 0 else _prefix + ".") + k)
-                keys = keys.union(v.keys(("" if len(_prefix) == 0 else _prefix + ".") + k))
-            else:
-                keys.add(("" if len(_prefix) == 0 else _prefix + ".") + k)
-        return keys
-
-    def items(self, _prefix: str = "") -> List[Tuple[str, BasicConfigEntryType]]:
-        items = []
-        for k, v in self.__dict__["_DynamicConfig__data"].items():
-            if isinstance(v, DynamicConfig):
-                items.extend(v.items(("" if len(_prefix) == 0 else _prefix + ".") + k))
-            else:
-                items.append((("" if len(_prefix) == 0 else _prefix + ".") + k, v))
-        return items
+    def _entries(self) -> Iterable[Tuple[str, Any]]:
+        return self.__dict__["_DynamicConfig__data"].items()
+
+    def _entry(self, name: str) -> Any:
+        return self.__dict__["_DynamicConfig__data"].get(name, MISSING)
+
+    def _set_entry(self, name: str, value: Any) -> None:
+        self.__dict__["_DynamicConfig__data"][name] = value
+
+    def _copy_from(self, other: Config) -> None:
+        self.__dict__["_DynamicConfig__arrays"] = other.__dict__["_DynamicConfig__arrays"]
+        self.__dict__["_DynamicConfig__data"] = {k: self._share(k, v) for k, v in other._entries()}
+
+    def _pack(self) -> Any:
+        return (self.__dict__["_DynamicConfig__arrays"], DynamicConfig.__pack(self))
+
+    @staticmethod
+    def __pack(config: Config) -> Dict[str, Any]:
+        # Nested DynamicConfigs are stored as plain mappings and restored lazily (see _materialize), other subconfigs are pickled as they are
+        # Exact type check, isinstance on the ABC is comparatively slow for the many leaves
+        return {k: DynamicConfig.__pack(v) if type(v) is DynamicConfig else v for k, v in config._entries()}
+
+    def _unpack(self, packed: Any) -> None:
+        arrays, data = packed
+        self.__dict__["_DynamicConfig__arrays"] = arrays
+        self.__dict__["_DynamicConfig__data"] = {k: v if isinstance(v, dict) else self._adopt(k, v) for k, v in data.items()}
+
+    def _materialize(self, name: str, value: Any) -> Any:
+        if isinstance(value, dict):
+            # The new config is not a copy, no need to go through Config._copy
+            child = self._adopt(name, DynamicConfig(cast(Dict[str, ConfigEntryType], value), cast(Any, Config)._Config__secret, True, self.__dict__["_DynamicConfig__arrays"]))
+            if self.readonly:
+                child.freeze()
+            self._set_entry(name, child)
+            self._materialized(name, child)
+            return child
+        return super()._materialize(name, value)
 
     def __getattr__(self, name: str) -> Any:
         if name.startswith("_") and name in self.__dict__:
             return self.__dict__[name]
-        if name not in self.__dict__["_DynamicConfig__data"]:
+        value = self.__dict__["_DynamicConfig__data"].get(name, MISSING)
+        if value is MISSING:
             raise AttributeError(f'Config has no attribute "{name}"')
-        return self.__dict__["_DynamicConfig__data"][name]
+        if access_tracker._active is not None:
+            access_tracker._active._read(self._fqn(name))
+        if isinstance(value, dict) or (isinstance(value, Config) and value.__dict__["_Config__parent"] is not self):
+            return self._materialize(name, value)
+        if isinstance(value, (list, array)):
+            return self._leaf(value)
+        return value
 
     def __setattr__(self, name: str, value: ConfigEntryType) -> None:
         if name.startswith("_") and name in self.__dict__:
@@ -65,47 +99,36 @@ def __setattr__(self, name: str, value: ConfigEntryType) -> None:
             return
         if self.readonly:
             raise ReadOnlyError("Config is read-only")
-        self.__dict__["_DynamicConfig__data"][name] = DynamicConfig._parse(value)
+        self._writing()
+        data = self.__dict__["_DynamicConfig__data"]
+        old = data.get(name, MISSING)
+        new = data[name] = self._adopt(name, DynamicConfig._parse(value, False, self.__dict__["_DynamicConfig__arrays"]))
+        self._changed(name, old, new)
 
     def __delattr__(self, name: str) -> None:
         if name not in self.__dict__["_DynamicConfig__data"]:
             raise AttributeError(f'Config has no attribute "{name}"')
         if self.readonly:
             raise ReadOnlyError("DynamicConfig is read-only")
-        del self.__dict__["_DynamicConfig__data"][name]
-
-    def __getitem__(self, fqn: str) -> Any:
-        return self.__get_parent_dict_by_fqn(fqn).__getattr__(fqn.split(".")[-1])
-
-    def __setitem__(self, fqn: str, value: ConfigEntryType) -> None:
-        self.__get_parent_dict_by_fqn(fqn).__setattr__(fqn.split(".")[-1], value)
-
-    def __delitem__(self, fqn: str) -> None:
-        self.__get_parent_dict_by_fqn(fqn).__delattr__(fqn.split(".")[-1])
-
-    def __get_parent_dict_by_fqn(self, fqn: str) -> DynamicConfig:
-        fqn_parts = fqn.strip().split(".")
-        parent = self
-        for i, part in enumerate(fqn_parts[:-1]):
-            if part not in parent:
-                raise AttributeError(f'Config has no attribute "{".".join(fqn_parts[:i])}"')
-            parent = getattr(parent, part)
-        return parent
+        self._writing()
+        old = self.__dict__["_DynamicConfig__data"].pop(name)
+        self._changed(name, old, MISSING)
 
     def _to_dict(self, value: ConfigEntryType) -> ConfigEntryType:
         if isinstance(value, DynamicConfig):
             return value.to_dict()
+        elif isinstance(value, dict):
+            # Nested mappings of lazy configs may be shared with Loader.include_cache, their lists are copied
+            return {k: Config._copy_list(cast(List[Any], v)) if isinstance(v, list) else self._to_dict(v) for k, v in cast(Dict[str, Any], value).items()}
+        elif isinstance(value, array):
+            return value.tolist()
         else:
             return value
 
     def to_dict(self) -> Dict[str, ConfigEntryType]:
+        if access_tracker._active is not None:
+            access_tracker._active._bulk_read(self._fqn(""))
         result = {}
         for key, value in self.__dict__["_DynamicConfig__data"].items():
             result[key] = self._to_dict(value)
         return result
-
-    def freeze(self) -> None:
-        super().freeze()
-        for entry in self.__dict__["_DynamicConfig__data"].values():
-            if isinstance(entry, DynamicConfig):
-                entry.freeze()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Sequence, Tuple, Union
+
+
+Signature = Tuple[int, int, int]
+Dependencies = Tuple[Tuple[Path, Signature], ...]
+
+
+class IncludeCache:
+    def __init__(self, max_size: int = 256) -> None:
+        super().__init__()
+        self.__max_size = max_size
+        self.__entries: OrderedDict[Hashable, Tuple[Any, Dependencies]] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @staticmethod
+    def signature(path: Union[str, Path]) -> Signature:
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Dependencies]]:
+        # Entries are only returned if none of the files they were parsed from changed since
+        with self.__lock:
+            entry = self.__entries.get(key)
+        if entry is not None:
+            try:
+                valid = all(IncludeCache.signature(path) == signature for path, signature in entry[1])
+            except OSError:
+                valid = False
+            with self.__lock:
+                if valid:
+                    if key in self.__entries:
+                        self.__entries.move_to_end(key)
+                    self.__hits += 1
+                    return entry
+                if self.__entries.get(key) is entry:
+                    del self.__entries[key]
+        with self.__lock:
+            self.__misses += 1
+        return None
+
+    def put(self, key: Hashable, data: Any, dependencies: Sequence[Tuple[Path, Signature]]) -> None:
+        if self.__max_size <= 0:
+            return
+        with self.__lock:
+            self.__entries[key] = (data, tuple(dependencies))
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        # Drops the entries depending on the given file or all entries if no file is given
+        with self.__lock:
+            if path is None:
+                self.__entries.clear()
+                return
+            path = Path(path).resolve()
+            for key in [key for key, (_, dependencies) in self.__entries.items() if any(dependency == path for dependency, _ in dependencies)]:
+                del self.__entries[key]
+
+    def reset_stats(self) -> None:
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
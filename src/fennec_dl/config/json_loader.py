@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from fennec_dl.config.include_cache import Signature
+from fennec_dl.config.loader import Loader
+from fennec_dl.config.references import Reference, resolve_references
+
+
+# Objects with a single "!include"/"!ref" key stand for the corresponding YAML tags, e.g. {"!ref": "model.width"}
+_INCLUDE = "!include"
+_REF = "!ref"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, Reference):
+        return {_REF: value.fqn}
+    raise TypeError(f'Object of type "{type(value)}" is not JSON serializable')
+
+
+class JSONLoader(Loader):
+    @classmethod
+    def _load(cls, stream: IO[Any], _root: bool = True, _dependencies: Optional[List[Tuple[Path, Signature]]] = None) -> Dict[str, Any]:  # type: ignore
+        dependencies: List[Tuple[Path, Signature]] = []
+
+        def object_hook(obj: Dict[str, Any]) -> Any:
+            if len(obj) == 1:
+                if _REF in obj:
+                    return Reference(obj[_REF])
+                if _INCLUDE in obj:
+                    return cls._include_from(stream, obj[_INCLUDE], dependencies)
+            return obj
+
+        data = json.load(stream, object_hook=object_hook)
+        if _dependencies is not None:
+            _dependencies.extend(dependencies)
+        if not isinstance(data, dict):
+            raise RuntimeError("Configuration root element must be a mapping")
+        if _root:
+            data = resolve_references(data)
+
+        return data
+
+    @staticmethod
+    def _dump(data: Dict[str, Any], stream: IO[Any]) -> None:
+        json.dump(data, stream, default=_encode, ensure_ascii=False, separators=(",", ":"))
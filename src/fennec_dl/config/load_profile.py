@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+_hooks: List[Callable[[LoadProfile], None]] = []
+_local = threading.local()
+
+
+def add_load_hook(hook: Callable[[LoadProfile], None]) -> None:
+    # Called with the LoadProfile of every following load_*/parse_* call of any loader (from the loading thread), profiling is off while no hooks are registered
+    _hooks.append(hook)
+
+
+def remove_load_hook(hook: Callable[[LoadProfile], None]) -> None:
+    _hooks.remove(hook)
+
+
+def current_profile() -> Optional[LoadProfile]:
+    # Profile of the load running in this thread, None if profiling is off
+    return getattr(_local, "profile", None)
+
+
+class LoadProfile:
+    def __init__(self, source: Optional[str]) -> None:
+        super().__init__()
+        self.__source = source
+        self.__phases: Dict[str, float] = {}
+        self.__includes: List[Tuple[str, float, bool]] = []
+        self.__nodes = 0
+        self.__entries = 0
+        self.__references = 0
+        self.__total = 0.0
+        self.__error: Optional[str] = None
+        self.__start = time.perf_counter()
+        self.__previous: Optional[LoadProfile] = None
+
+    @staticmethod
+    def _begin(source: Optional[str]) -> Optional[LoadProfile]:
+        # Single check of the hook list if profiling is off
+        if len(_hooks) == 0:
+            return None
+        profile = LoadProfile(source)
+        profile.__previous = current_profile()
+        _local.profile = profile
+        return profile
+
+    def _phase(self, name: str, seconds: float) -> None:
+        self.__phases[name] = self.__phases.get(name, 0.0) + seconds
+
+    def _include(self, path: str, seconds: float, cached: bool) -> None:
+        self.__includes.append((path, seconds, cached))
+
+    def _resolved(self, seconds: float, references: int) -> None:
+        self.__phases["references"] = self.__phases.get("references", 0.0) + seconds
+        self.__references += references
+
+    def _finish(self, data: Optional[Dict[str, Any]], error: Optional[BaseException] = None) -> None:
+        self.__total = time.perf_counter() - self.__start
+        _local.profile = self.__previous
+        self.__previous = None
+        # References are resolved within parsing
+        if "parse" in self.__phases:
+            self.__phases["parse"] = max(self.__phases["parse"] - self.__phases.get("references", 0.0), 0.0)
+        if error is not None:
+            self.__error = f"{type(error).__qualname__}: {error}"
+        if data is not None:
+            stack: List[Any] = [data]
+            while len(stack) > 0:
+                node = stack.pop()
+                self.__nodes += 1
+                for value in node.values():
+                    if isinstance(value, dict):
+                        stack.append(value)
+                    else:
+                        self.__entries += 1
+        for hook in list(_hooks):
+            hook(self)
+
+    @property
+    def source(self) -> Optional[str]:
+        # Loaded path, None for parse_*
+        return self.__source
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        # Seconds spent in "cache" (disk cache lookups and writes), "parse" (including includes), "references" and "construct" (config construction and validation)
+        return self.__phases
+
+    @property
+    def includes(self) -> List[Tuple[str, float, bool]]:
+        # (path, seconds including nested includes, whether it came from the include cache) per included file in the order they finished
+        return self.__includes
+
+    @property
+    def nodes(self) -> int:
+        # Mappings in the loaded data including the root
+        return self.__nodes
+
+    @property
+    def entries(self) -> int:
+        # Non-mapping values in the loaded data
+        return self.__entries
+
+    @property
+    def references(self) -> int:
+        return self.__references
+
+    @property
+    def total(self) -> float:
+        return self.__total
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.__error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"source": self.__source, "total": self.__total, "phases": dict(self.__phases), "includes": [{"path": path, "seconds": seconds, "cached": cached} for path, seconds, cached in self.__includes], "nodes": self.__nodes, "entries": self.__entries, "references": self.__references, "error": self.__error}
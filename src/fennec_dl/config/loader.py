@@ -1,54 +1,244 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
+import time
 from abc import abstractmethod
-from io import StringIO
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from io import BytesIO, StringIO
 from pathlib import Path
-from typing import Any, Dict, TextIO, Type, TypeVar, Union, cast
+from typing import IO, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Type, TypeVar, Union, cast
 
 from fennec_dl.config.config import Config, ConfigEntryType
+from fennec_dl.config.disk_cache import DiskCache
 from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.include_cache import Dependencies, IncludeCache, Signature
+from fennec_dl.config.load_profile import LoadProfile, current_profile
 from fennec_dl.errors.config_loading_error import ConfigLoadingError
 
 
 T = TypeVar("T", bound=Config)
 
 
+class LoadResult(NamedTuple):
+    path: Union[str, Path]
+    # None if loading failed
+    config: Any
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class Loader:
+    # Parsed include files, shared by all loaders
+    include_cache = IncludeCache()
+    # Whether files of this format are read and written in binary mode
+    _binary = False
+
+    @classmethod
+    def load_dynamic(cls: Type[Loader], path: Union[str, Path], lazy: bool = False, cache: Optional[DiskCache] = None, arrays: bool = False) -> Any:
+        return cls.__build(str(path), lambda: cls.__load_file(path, cache), lambda dict_: DynamicConfig(dict_, cast(Any, Config)._Config__secret, lazy, arrays), f"Failed to load configuration from {path}")
+
+    @classmethod
+    def load_static(cls: Type[Loader], path: Union[str, Path], config_type: Type[T], cache: Optional[DiskCache] = None) -> T:
+        return cls.__build(str(path), lambda: cls.__load_file(path, cache), lambda dict_: config_type(dict_, cast(Any, Config)._Config__secret), f"Failed to load configuration from {path}")
+
     @classmethod
-    def load_dynamic(cls: Type[Loader], path: Union[str, Path]) -> Any:
+    def load_many(cls: Type[Loader], paths: Iterable[Union[str, Path]], config_type: Optional[Type[Config]] = None, max_workers: int = 16, lazy: bool = False, cache: Optional[DiskCache] = None, arrays: bool = False) -> Iterator[LoadResult]:
+        # Loads the files on a thread pool (mostly waiting for I/O, e.g. on network filesystems) and yields the results in the order they complete
+        # Files are loaded with load_static if a config type is given and load_dynamic otherwise, failures are returned as part of the result of the file
+        # At most 2 * max_workers files are submitted at a time, paths may be a lazy iterable
+        load = cls.__load_one(config_type, lazy, cache, arrays)
+        remaining = iter(paths)
+        pending: Dict[Future[LoadResult], None] = {}
+        pool = ThreadPoolExecutor(max_workers, thread_name_prefix="fennec_dl_load")
         try:
-            with open(path, "r", encoding="UTF-8") as file:
-                dict_ = cls._load(file)
-        except:
-            raise ConfigLoadingError(f"Failed to load configuration from {path}")
-        return DynamicConfig(dict_, cast(Any, Config)._Config__secret)
+            while True:
+                for path in itertools.islice(remaining, 2 * max_workers - len(pending)):
+                    pending[pool.submit(load, path)] = None
+                if len(pending) == 0:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
 
     @classmethod
-    def load_static(cls: Type[Loader], path: Union[str, Path], config_type: Type[T]) -> T:
+    async def load_many_async(cls: Type[Loader], paths: Iterable[Union[str, Path]], config_type: Optional[Type[Config]] = None, max_workers: int = 16, lazy: bool = False, cache: Optional[DiskCache] = None, arrays: bool = False) -> AsyncIterator[LoadResult]:
+        # Same as load_many, the event loop is not blocked while files are loaded
+        load = cls.__load_one(config_type, lazy, cache, arrays)
+        loop = asyncio.get_running_loop()
+        remaining = iter(paths)
+        pending: Set[asyncio.Future[LoadResult]] = set()
+        pool = ThreadPoolExecutor(max_workers, thread_name_prefix="fennec_dl_load")
         try:
-            with open(path, "r", encoding="UTF-8") as file:
-                dict_ = cls._load(file)
-        except:
-            raise ConfigLoadingError(f"Failed to load configuration from {path}")
-        return config_type(dict_, cast(Any, Config)._Config__secret)
+            while True:
+                for path in itertools.islice(remaining, 2 * max_workers - len(pending)):
+                    pending.add(loop.run_in_executor(pool, load, path))
+                if len(pending) == 0:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
 
     @classmethod
-    def parse_dynamic(cls: Type[Loader], string: str) -> Any:
+    def __load_one(cls: Type[Loader], config_type: Optional[Type[Config]], lazy: bool, cache: Optional[DiskCache], arrays: bool) -> Callable[[Union[str, Path]], LoadResult]:
+        def load(path: Union[str, Path]) -> LoadResult:
+            try:
+                if config_type is None:
+                    return LoadResult(path, cls.load_dynamic(path, lazy, cache, arrays), None)
+                return LoadResult(path, cls.load_static(path, config_type, cache), None)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as e:
+                return LoadResult(path, None, e)
+
+        return load
+
+    @classmethod
+    def parse_dynamic(cls: Type[Loader], string: Union[str, bytes], lazy: bool = False, arrays: bool = False) -> Any:
+        return cls.__build(None, lambda: cls.__parse(cls._stream(string)), lambda dict_: DynamicConfig(dict_, cast(Any, Config)._Config__secret, lazy, arrays), "Failed to parse configuration")
+
+    @classmethod
+    def parse_static(cls: Type[Loader], string: Union[str, bytes], config_type: Type[T]) -> T:
+        return cls.__build(None, lambda: cls.__parse(cls._stream(string)), lambda dict_: config_type(dict_, cast(Any, Config)._Config__secret), "Failed to parse configuration")
+
+    @classmethod
+    def __build(cls: Type[Loader], source: Optional[str], load: Callable[[], Dict[str, ConfigEntryType]], construct: Callable[[Dict[str, ConfigEntryType]], Any], message: str) -> Any:
+        profile = LoadProfile._begin(source)
+        dict_ = None
         try:
-            dict_ = cls._load(StringIO(string))
-        except:
-            raise ConfigLoadingError(f"Failed to parse configuration")
-        return DynamicConfig(dict_, cast(Any, Config)._Config__secret)
+            try:
+                dict_ = load()
+            except ConfigLoadingError:
+                raise
+            except:
+                raise ConfigLoadingError(message)
+            if profile is None:
+                return construct(dict_)
+            start = time.perf_counter()
+            config = construct(dict_)
+            profile._phase("construct", time.perf_counter() - start)
+        except BaseException as e:
+            if profile is not None:
+                profile._finish(dict_, e)
+            raise
+        profile._finish(dict_)
+        return config
 
     @classmethod
-    def parse_static(cls: Type[Loader], string: str, config_type: Type[T]) -> T:
+    def __parse(cls: Type[Loader], stream: IO[Any], dependencies: Optional[List[Tuple[Path, Signature]]] = None) -> Dict[str, ConfigEntryType]:
+        profile = current_profile()
+        if profile is None:
+            return cls._load(stream, True, dependencies)
+        start = time.perf_counter()
         try:
-            dict_ = cls._load(StringIO(string))
+            return cls._load(stream, True, dependencies)
+        finally:
+            profile._phase("parse", time.perf_counter() - start)
+
+    @classmethod
+    def __load_file(cls: Type[Loader], path: Union[str, Path], cache: Optional[DiskCache]) -> Dict[str, ConfigEntryType]:
+        if cache is None:
+            with cls._open(path, "r") as file:
+                return cls.__parse(file)
+        profile = current_profile()
+        path = Path(path).resolve()
+        with open(path, "rb") as file:
+            content = file.read()
+        key = DiskCache.key(f"{cls.__module__}.{cls.__qualname__}", path, content)
+        start = time.perf_counter()
+        dict_ = cache.get(key)
+        if profile is not None:
+            profile._phase("cache", time.perf_counter() - start)
+        if dict_ is None:
+            stream = cls._stream(content if cls._binary else content.decode("UTF-8"))
+            cast(Any, stream).name = str(path)
+            dependencies: List[Tuple[Path, Signature]] = []
+            dict_ = cls.__parse(stream, dependencies)
+            start = time.perf_counter()
+            cache.put(key, dict_, dependencies)
+            if profile is not None:
+                profile._phase("cache", time.perf_counter() - start)
+        return dict_
+
+    @classmethod
+    def save(cls: Type[Loader], config: Union[Config, Dict[str, ConfigEntryType]], path: Union[str, Path]) -> None:
+        with cls._open(path, "w") as file:
+            cls._dump(config.to_dict() if isinstance(config, Config) else config, file)
+
+    @classmethod
+    def convert(cls: Type[Loader], source: Union[str, Path], destination: Union[str, Path], source_loader: Type[Loader]) -> None:
+        # Writes a file of another format in the format of this loader, includes are inlined and references are kept
+        try:
+            with source_loader._open(source, "r") as file:
+                data = source_loader._load(file, False)
+        except ConfigLoadingError:
+            raise
         except:
-            raise ConfigLoadingError(f"Failed to parse configuration")
-        return config_type(dict_, cast(Any, Config)._Config__secret)
+            raise ConfigLoadingError(f"Failed to load configuration from {source}")
+        cls.save(data, destination)
+
+    @classmethod
+    def _open(cls: Type[Loader], path: Union[str, Path], mode: str) -> IO[Any]:
+        if cls._binary:
+            return open(path, mode + "b")
+        return open(path, mode, encoding="UTF-8")
+
+    @classmethod
+    def _stream(cls: Type[Loader], string: Union[str, bytes]) -> IO[Any]:
+        if isinstance(string, bytes):
+            return BytesIO(string)
+        return StringIO(string)
+
+    @classmethod
+    def _include_from(cls: Type[Loader], stream: IO[Any], path: str, dependencies: List[Tuple[Path, Signature]]) -> Any:
+        # Includes a file given relative to the file the stream reads from (or absolute)
+        include_path = Path(path)
+        if not include_path.is_absolute():
+            include_path = Path(stream.name).parent.joinpath(include_path)
+        data, included = cls._include(include_path.resolve())
+        dependencies.extend(included)
+        return data
+
+    @classmethod
+    def _include(cls: Type[Loader], path: Path) -> Tuple[Any, Dependencies]:
+        # Parses an included file (references are left unresolved), returns its content and the files it was parsed from
+        profile = current_profile()
+        start = time.perf_counter() if profile is not None else 0.0
+        key = (cls, path)
+        entry = Loader.include_cache.get(key)
+        if entry is not None:
+            if profile is not None:
+                profile._include(str(path), time.perf_counter() - start, True)
+            return entry
+        signature = IncludeCache.signature(path)
+        dependencies: List[Tuple[Path, Signature]] = [(path, signature)]
+        with cls._open(path, "r") as stream:
+            data = cls._load(stream, False, dependencies)
+        Loader.include_cache.put(key, data, dependencies)
+        if profile is not None:
+            profile._include(str(path), time.perf_counter() - start, False)
+        return data, tuple(dependencies)
+
+    @staticmethod
+    @abstractmethod
+    def _load(stream: IO[Any], _root: bool = True, _dependencies: Optional[List[Tuple[Path, Signature]]] = None) -> Dict[str, ConfigEntryType]:
+        # Files included while loading are appended to _dependencies
+        ...
 
     @staticmethod
     @abstractmethod
-    def _load(stream: TextIO) -> Dict[str, ConfigEntryType]:
+    def _dump(data: Dict[str, Any], stream: IO[Any]) -> None:
+        # Writes data as loaded by _load with _root=False (references are written as references)
         ...
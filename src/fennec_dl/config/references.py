@@ -0,0 +1,74 @@
+import time
+from typing import Any, Dict, List, Set
+
+from fennec_dl.config.load_profile import current_profile
+from fennec_dl.errors.config_loading_error import ConfigLoadingError
+
+
+class Reference:
+    def __init__(self, fqn: str) -> None:
+        super().__init__()
+        self.fqn = fqn
+        self.path = fqn.split(".")
+
+
+def resolve_references(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Replaces all references (relative to the root) by their targets, every reference and container is resolved once
+    # Containers without references are kept as they are, so resolved subtrees may be shared within the result and with the input
+    profile = current_profile()
+    start = time.perf_counter() if profile is not None else 0.0
+    resolved: Dict[int, Any] = {}
+    chain: List[Reference] = []
+    in_chain: Set[int] = set()
+    count = 0
+
+    def lookup(reference: Reference) -> Any:
+        value: Any = data
+        for part in reference.path:
+            if isinstance(value, Reference):
+                value = resolve(value)
+            if not isinstance(value, dict) or part not in value:
+                raise ConfigLoadingError(f'Reference "{reference.fqn}" could not be resolved')
+            value = value[part]
+        return value
+
+    def resolve(value: Any) -> Any:
+        nonlocal count
+        if not isinstance(value, (dict, list, Reference)):
+            return value
+        key = id(value)
+        if key in resolved:
+            return resolved[key]
+        if isinstance(value, Reference):
+            if key in in_chain:
+                cycle = chain[next(i for i, x in enumerate(chain) if x is value) :] + [value]
+                raise ConfigLoadingError(f"Circular reference \"{(chr(34)+' -> '+chr(34)).join(x.fqn for x in cycle)}\"")
+            count += 1
+            chain.append(value)
+            in_chain.add(key)
+            result = resolve(lookup(value))
+            chain.pop()
+            in_chain.remove(key)
+        elif isinstance(value, dict):
+            result = value
+            for k, v in value.items():
+                r = resolve(v)
+                if r is not v:
+                    if result is value:
+                        result = dict(value)
+                    result[k] = r
+        else:
+            result = value
+            for i, v in enumerate(value):
+                r = resolve(v)
+                if r is not v:
+                    if result is value:
+                        result = list(value)
+                    result[i] = r
+        resolved[key] = result
+        return result
+
+    result = resolve(data)
+    if profile is not None:
+        profile._resolved(time.perf_counter() - start, count)
+    return result
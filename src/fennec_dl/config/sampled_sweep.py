@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar, Union
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.sweep import ConfigSweep
+
+
+T = TypeVar("T", bound=Config)
+
+
+class Range(NamedTuple):
+    # Bounds are inclusive, log ranges are sampled uniformly in log space
+    low: float
+    high: float
+    log: bool = False
+    integer: bool = False
+
+    def sample(self, u: float) -> Any:
+        # Maps u from [0, 1) into the range
+        high = self.high + 1 if self.integer else self.high
+        if self.log:
+            value = math.exp(math.log(self.low) + u * (math.log(high) - math.log(self.low)))
+        else:
+            value = self.low + u * (high - self.low)
+        if self.integer:
+            return min(int(math.floor(value)), int(self.high))
+        return min(value, self.high)
+
+
+# Primitive polynomials (degree, coefficients) and initial direction numbers of dimensions 2-21 from Joe and Kuo (new-joe-kuo-6.21201), dimension 1 is the van der Corput sequence
+_SOBOL_POLYNOMIALS: List[Tuple[int, int, Tuple[int, ...]]] = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+_SOBOL_BITS = 32
+
+
+def _sobol_directions(dimension: int) -> List[int]:
+    if dimension == 0:
+        return [1 << (_SOBOL_BITS - 1 - i) for i in range(_SOBOL_BITS)]
+    degree, a, m = _SOBOL_POLYNOMIALS[dimension - 1]
+    directions = [m[i] << (_SOBOL_BITS - 1 - i) for i in range(degree)]
+    for i in range(degree, _SOBOL_BITS):
+        v = directions[i - degree] ^ (directions[i - degree] >> degree)
+        for k in range(1, degree):
+            if (a >> (degree - 1 - k)) & 1:
+                v ^= directions[i - k]
+        directions.append(v)
+    return directions
+
+
+class SampledSweep(ConfigSweep[T]):
+    # Fixed number of configs drawn from the given ranges and lists of values instead of their full product, configs are generated on access
+    METHODS = ("random", "lhs", "sobol")
+
+    def __init__(self, config: T, overwrites: Sequence[Tuple[str, Union[Range, Sequence[Any]]]], size: int, method: str = "random", seed: int = 0, _indices: Optional[range] = None) -> None:
+        super().__init__(config, [], range(size) if _indices is None else _indices)
+        if method not in SampledSweep.METHODS:
+            raise ValueError(f'Unknown sampling method "{method}"')
+        if method == "sobol" and len(overwrites) > len(_SOBOL_POLYNOMIALS) + 1:
+            raise ValueError(f"Sobol sampling supports at most {len(_SOBOL_POLYNOMIALS) + 1} dimensions")
+        if size < 0 or (method == "sobol" and size > 1 << _SOBOL_BITS):
+            raise ValueError(f"Invalid sample size {size}")
+        self.__dimensions: List[Tuple[str, Union[Range, List[Any]]]] = [(fqn, values if isinstance(values, Range) else list(values)) for fqn, values in overwrites]
+        for fqn, values in self.__dimensions:
+            if not isinstance(values, Range) and len(values) == 0:
+                raise ValueError(f'No values for "{fqn}"')
+        self.__size = size
+        self.__method = method
+        self.__seed = seed
+        # Per dimension, computed on first use (O(size) each for Latin hypercube sampling)
+        self.__strata: Dict[int, List[int]] = {}
+        self.__directions: Dict[int, Tuple[List[int], int]] = {}
+
+    @property
+    def overwrites(self) -> List[Tuple[str, Union[Range, List[Any]]]]:  # type: ignore
+        return self.__dimensions
+
+    @property
+    def method(self) -> str:
+        return self.__method
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    def point(self, index: int) -> List[float]:
+        # Sample of the unit hypercube for the config at the given index of the full sweep
+        if not 0 <= index < self.__size:
+            raise IndexError(f"Sweep index {index} out of range")
+        rng = random.Random(f"{self.__seed}:{index}")
+        if self.__method == "random":
+            return [rng.random() for _ in self.__dimensions]
+        elif self.__method == "lhs":
+            return [(self.__stratum(d, index) + rng.random()) / self.__size for d in range(len(self.__dimensions))]
+        gray = index ^ (index >> 1)
+        point = []
+        for d in range(len(self.__dimensions)):
+            directions, shift = self.__sobol(d)
+            x = shift
+            i = 0
+            while gray >> i:
+                if (gray >> i) & 1:
+                    x ^= directions[i]
+                i += 1
+            point.append(x / (1 << _SOBOL_BITS))
+        return point
+
+    def __stratum(self, dimension: int, index: int) -> int:
+        strata = self.__strata.get(dimension)
+        if strata is None:
+            strata = list(range(self.__size))
+            random.Random(f"{self.__seed}:lhs:{dimension}").shuffle(strata)
+            self.__strata[dimension] = strata
+        return strata[index]
+
+    def __sobol(self, dimension: int) -> Tuple[List[int], int]:
+        # Randomized by a digital shift, which keeps the stratification of the sequence
+        directions = self.__directions.get(dimension)
+        if directions is None:
+            directions = self.__directions[dimension] = (_sobol_directions(dimension), random.Random(f"{self.__seed}:sobol:{dimension}").getrandbits(_SOBOL_BITS))
+        return directions
+
+    def combination(self, index: int) -> List[Tuple[str, Any]]:
+        combination = []
+        for (fqn, values), u in zip(self.__dimensions, self.point(index)):
+            if isinstance(values, Range):
+                combination.append((fqn, values.sample(u)))
+            else:
+                combination.append((fqn, values[min(int(u * len(values)), len(values) - 1)]))
+        return combination
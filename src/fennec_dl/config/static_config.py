@@ -3,172 +3,316 @@
 import inspect
 import typing
 import warnings
-from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple, Type, TypeVar, Union, cast
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Literal, Mapping, NoReturn, Optional, Tuple, Type, Union, cast
 
-from fennec_dl.config.config import BasicConfigEntryType, Config
+import fennec_dl.config.access_tracker as access_tracker
+from fennec_dl.config.compiled_config import CompiledConfig
+from fennec_dl.config.config import MISSING, Config
 from fennec_dl.config.dynamic_config import ConfigEntryType
 from fennec_dl.errors.config_loading_error import ConfigLoadingError
 from fennec_dl.errors.invalid_operation_error import InvalidOperationError
 from fennec_dl.errors.readonly_error import ReadOnlyError
 
 
-class StaticConfig(Config):
-    def __init__(self, dict_: Dict[str, ConfigEntryType], secret: object = None) -> None:
-        super().__init__(dict_, secret)
+_BASIC_TYPES = (bool, int, float, str)
+
 
-        # Check type annotations
-        def validate_type_hint(hint: Type[Any], in_list: bool = False) -> bool:
-            if inspect.isclass(hint) and issubclass(hint, Config):
-                return not in_list
-            elif typing.get_origin(hint) == list:
-                return validate_type_hint(typing.get_args(hint)[0], True)
-            elif hint in [bool, int, float, str]:
-                return True
-            elif typing.get_origin(hint) == Union:
-                if len(list(filter(lambda x: x != type(None), typing.get_args(hint)))) == 0:
-                    return False
-                for arg in typing.get_args(hint):
-                    if arg == type(None):
-                        continue
-                    if not validate_type_hint(arg):
-                        return False
-                return True
-            elif typing.get_origin(hint) == Literal:
-                return validate_type_hint(type(typing.get_args(hint)[0]))
-            else:
+def _validate_type_hint(hint: Type[Any], in_list: bool = False) -> bool:
+    if inspect.isclass(hint) and issubclass(hint, Config):
+        return not in_list
+    elif typing.get_origin(hint) == list:
+        return _validate_type_hint(typing.get_args(hint)[0], True)
+    elif hint in _BASIC_TYPES:
+        return True
+    elif typing.get_origin(hint) == Union:
+        if len(list(filter(lambda x: x != type(None), typing.get_args(hint)))) == 0:
+            return False
+        for arg in typing.get_args(hint):
+            if arg == type(None):
+                continue
+            if not _validate_type_hint(arg):
                 return False
+        return True
+    elif typing.get_origin(hint) == Literal:
+        return all(_validate_type_hint(type(x)) for x in typing.get_args(hint))
+    else:
+        return False
+
+
+def _holds_list(hint: Type[Any]) -> bool:
+    if typing.get_origin(hint) == list:
+        return True
+    elif typing.get_origin(hint) == Union:
+        return any(_holds_list(arg) for arg in typing.get_args(hint))
+    return False
+
+
+def _compile_type_hint(hint: Type[Any], fail: Callable[[Any], NoReturn], arrays: bool = False) -> Tuple[Callable[[Any], bool], Optional[Callable[[Any], Any]]]:
+    # Compiles a (validated) type hint into a predicate telling whether a value matches and a converter for matching values (None if values are stored as-is)
+    # With arrays, List[int]/List[float] values are stored as int64/double arrays (lists nested in lists are not)
+    if inspect.isclass(hint) and issubclass(hint, Config):
+        config_type = cast(Any, hint)
+        secret = cast(Any, Config)._Config__secret
+        return lambda x: isinstance(x, (Mapping, Config)), lambda x: x if isinstance(x, config_type) else config_type(x.to_dict() if isinstance(x, Config) else x, secret)
+    elif typing.get_origin(hint) == list:
+        if arrays and typing.get_args(hint)[0] in (int, float):
+            entry_type = typing.get_args(hint)[0]
+            typecode = "q" if entry_type == int else "d"
+
+            def convert_array(value: Any) -> Any:
+                if isinstance(value, array):
+                    return value[:]
+                try:
+                    return array(typecode, value)
+                except OverflowError:
+                    return list(value)
 
-        type_hints = typing.get_type_hints(self.__class__)
-        for attr_name, type_hint in sorted(type_hints.items()):
-            if not validate_type_hint(type_hint):
+            return lambda x: (isinstance(x, List) and all(isinstance(y, entry_type) for y in x)) or (isinstance(x, array) and x.typecode == typecode), convert_array
+        check_entry, convert_entry = _compile_type_hint(typing.get_args(hint)[0], fail)
+        if convert_entry is None:
+            return lambda x: isinstance(x, List) and all(map(check_entry, x)), list
+        return lambda x: isinstance(x, List) and all(map(check_entry, x)), lambda x: [convert_entry(y) for y in x]  # type: ignore
+    elif hint in _BASIC_TYPES:
+        return lambda x: isinstance(x, hint), None
+    elif typing.get_origin(hint) == Union:
+        nullable = type(None) in typing.get_args(hint)
+        arms = [(arg, *_compile_type_hint(arg, fail, arrays)) for arg in typing.get_args(hint) if arg != type(None)]
+        checks = [check for _, check, _ in arms]
+
+        def check_union(value: Any) -> bool:
+            return (nullable and value is None) or any(check(value) for check in checks)
+
+        if all(convert is None for _, _, convert in arms):
+            return check_union, None
+
+        def convert_union(value: Any) -> Any:
+            if nullable and value is None:
+                return None
+            for arg, check, convert in arms:
+                if not check(value):
+                    continue
+                if convert is None:
+                    return value
+                if not (inspect.isclass(arg) and issubclass(arg, Config)):
+                    return convert(value)
+                # Whether a mapping fits a config type is only known after converting it
+                try:
+                    return convert(value)
+                except ConfigLoadingError:
+                    pass
+            fail(value)
+
+        return check_union, convert_union
+    elif typing.get_origin(hint) == Literal:
+        options = typing.get_args(hint)
+        return lambda x: x in options, None
+    else:
+        raise AttributeError(f'Invalid type hint "{hint}"')
+
+
+class _Schema:
+    def __init__(self, config_type: Type[StaticConfig]) -> None:
+        super().__init__()
+        self.type_hints = typing.get_type_hints(config_type)
+        for attr_name, type_hint in sorted(self.type_hints.items()):
+            if not _validate_type_hint(type_hint):
                 raise AttributeError(f'Invalid type hint "{type_hint}" for attribute "{attr_name}"')
 
-        for attr_name, attr in sorted(self.__class__.__dict__.items()):
+        for attr_name, attr in sorted(config_type.__dict__.items()):
             if attr_name.startswith("_") or inspect.isclass(attr):
                 continue
             elif inspect.isfunction(attr):
                 warnings.warn(f'StaticConfig classes should not contain methods or functions (found method/function "{attr_name}")')
-            elif attr_name not in type_hints.keys():
+            elif attr_name not in self.type_hints.keys():
                 warnings.warn(f'Attribute "{attr_name}" is not annotated and will be ignored')
 
-        # Initialize
-        def convert(value: Any, hint: Type[Any], in_list: bool = False) -> Any:
-            if inspect.isclass(hint) and issubclass(hint, Config):
-                if in_list:
-                    raise ConfigLoadingError(f'Lists of configs are not allowed (found at "{type_hints[attr_name]})"')
-                return hint(value, cast(Any, Config)._Config__secret)
-            elif typing.get_origin(hint) == list:
-                if not isinstance(value, List):
-                    raise ConfigLoadingError(f'Attribute "{attr_name}" has type "{type(dict_[attr_name])}" but should match "{type_hints[attr_name]}"')
-                return [convert(entry, typing.get_args(hint)[0], True) for entry in value]
-            elif hint in [bool, int, float, str]:
-                if not isinstance(value, hint):
-                    raise ConfigLoadingError(f'Attribute "{attr_name}" has type "{type(dict_[attr_name])}" but should match "{type_hints[attr_name]}"')
-                return value
-            elif typing.get_origin(hint) == Union:
-                for arg in typing.get_args(hint):
-                    if arg == type(None):
-                        if value is None:
-                            return None
-                        continue
-                    try:
-                        return convert(value, arg)
-                    except:
-                        pass
-                raise ConfigLoadingError(f'Attribute "{attr_name}" has type "{type(dict_[attr_name])}" but should match "{type_hints[attr_name]}"')
-            elif typing.get_origin(hint) == Literal:
-                if value != typing.get_args(hint)[0]:
-                    raise ConfigLoadingError(f'Attribute "{attr_name}" has type "{type(dict_[attr_name])}" but should match "{type_hints[attr_name]}"')
+        self.names = frozenset(self.type_hints.keys())
+        # Fields that can hold lists (or arrays), reads of them go through a property (see StaticConfig.__install)
+        self.mutable = frozenset(attr_name for attr_name, type_hint in self.type_hints.items() if _holds_list(type_hint))
+        arrays = getattr(config_type, "_StaticConfig__arrays", False)
+        self.fields = tuple((attr_name, _Schema.__compile_field(attr_name, type_hint, arrays)) for attr_name, type_hint in sorted(self.type_hints.items()))
+        self.converters = dict(self.fields)
+
+    @staticmethod
+    def __compile_field(attr_name: str, type_hint: Type[Any], arrays: bool) -> Callable[[Any], Any]:
+        def fail(value: Any) -> NoReturn:
+            raise ConfigLoadingError(f'Attribute "{attr_name}" has type "{type(value)}" but should match "{type_hint}"')
+
+        check, convert = _compile_type_hint(type_hint, fail, arrays)
+
+        def convert_field(value: Any) -> Any:
+            if not check(value):
+                fail(value)
+            if convert is None:
                 return value
+            return convert(value)
 
-        if len(dict_.keys() - type_hints.keys()) > 0:
-            warnings.warn(f"Superfluous config values \"{(chr(34)+', '+chr(34)).join(sorted(dict_.keys() - type_hints.keys()))}\"")
-        if len(type_hints.keys() - dict_.keys()) > 0:
-            raise ConfigLoadingError(f"Missing config values \"{(chr(34)+', '+chr(34)).join(sorted(type_hints.keys() - dict_.keys()))}\"")
+        return convert_field
 
-        for attr_name, type_hint in sorted(type_hints.items()):
-            value = convert(dict_[attr_name], type_hint)
-            self.__dict__[attr_name] = value
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Config):
-            return False
-        for key, value in self.items():
-            if key not in other:
-                return False
-            if value != other[key]:
-                return False
-        return True
+class StaticConfig(Config):
+    def __init_subclass__(cls, arrays: Optional[bool] = None, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # class MyConfig(StaticConfig, arrays=True) stores List[int]/List[float] fields as arrays (inherited by subclasses)
+        # Such fields are read as arrays, which never equal lists (config.a == [1, 2] is False, compare with .tolist() or array("q", [1, 2])), configs holding them still equal configs holding the lists
+        if arrays is not None:
+            cls.__arrays = arrays
+        try:
+            schema = _Schema(cls)
+        except NameError:
+            # Forward references that cannot be resolved yet, compile on first instantiation instead
+            return
+        cls.__install(schema)
+
+    @classmethod
+    def _schema(cls) -> _Schema:
+        schema = cls.__dict__.get("_StaticConfig__schema")
+        if schema is None:
+            schema = _Schema(cls)
+            cls.__install(schema)
+        return schema
+
+    @classmethod
+    def __install(cls, schema: _Schema) -> None:
+        cls.__schema = schema
+        for attr_name in schema.mutable:
+            setattr(cls, attr_name, StaticConfig.__leaf_property(attr_name))
+
+    @staticmethod
+    def __leaf_property(attr_name: str) -> property:
+        # Other fields are plain instance attributes, lists and arrays must go through Config._leaf before they are handed out
+        def get(self: StaticConfig) -> Any:
+            data = self.__dict__
+            if attr_name not in data:
+                return self.__getattr__(attr_name)
+            value = data[attr_name]
+            if isinstance(value, (list, array)) and (data["_Config__parent"] is not None or len(data["_Config__sharers"]) > 0):
+                return self._leaf(value)
+            return value
+
+        return property(get)
+
+    @classmethod
+    def _compiled_type(cls) -> Type[CompiledConfig]:
+        compiled_type = cls.__dict__.get("_StaticConfig__compiled_type")
+        if compiled_type is None:
+            compiled_type = CompiledConfig._generate(cls, tuple(attr_name for attr_name, _ in cls._schema().fields))
+            cls.__compiled_type = compiled_type
+        return compiled_type
+
+    def __init__(self, dict_: Dict[str, ConfigEntryType], secret: object = None) -> None:
+        super().__init__(dict_, secret)
+        schema = self._schema()
+
+        if dict_.keys() != schema.names:
+            if len(dict_.keys() - schema.names) > 0:
+                warnings.warn(f"Superfluous config values \"{(chr(34)+', '+chr(34)).join(sorted(dict_.keys() - schema.names))}\"")
+            if len(schema.names - dict_.keys()) > 0:
+                raise ConfigLoadingError(f"Missing config values \"{(chr(34)+', '+chr(34)).join(sorted(schema.names - dict_.keys()))}\"")
+
+        data = self.__dict__
+        data["_StaticConfig__shared"] = {}
+        for attr_name, convert in schema.fields:
+            data[attr_name] = self._adopt(attr_name, convert(dict_[attr_name]))
+
+    def _entries(self) -> Iterable[Tuple[str, Any]]:
+        data = self.__dict__
+        shared = data["_StaticConfig__shared"]
+        return [(attr_name, data[attr_name] if attr_name in data else shared[attr_name]) for attr_name, _ in self._schema().fields]
+
+    def _entry(self, name: str) -> Any:
+        if name not in self._schema().names:
+            return MISSING
+        return self.__dict__[name] if name in self.__dict__ else self.__dict__["_StaticConfig__shared"][name]
+
+    def _set_entry(self, name: str, value: Any) -> None:
+        # Subconfigs shared with another config are kept out of __dict__ so that the first access goes through __getattr__
+        if isinstance(value, Config) and not self._owns(value):
+            self.__dict__.pop(name, None)
+            self.__dict__["_StaticConfig__shared"][name] = value
+        else:
+            self.__dict__["_StaticConfig__shared"].pop(name, None)
+            self.__dict__[name] = value
+
+    def _copy_from(self, other: Config) -> None:
+        self.__dict__["_StaticConfig__shared"] = {}
+        for attr_name, value in other._entries():
+            self._set_entry(attr_name, self._share(attr_name, value))
+
+    def _pack(self) -> Any:
+        # Values in schema order, subconfigs are pickled as they are
+        return tuple(value for _, value in self._entries())
+
+    def _unpack(self, packed: Any) -> None:
+        fields = self._schema().fields
+        if len(packed) != len(fields):
+            raise ConfigLoadingError(f"Pickled config does not match the schema of {self.__class__.__qualname__}")
+        data = self.__dict__
+        data["_StaticConfig__shared"] = {}
+        for (attr_name, _), value in zip(fields, packed):
+            data[attr_name] = self._adopt(attr_name, value)
+
+    def __getattr__(self, name: str) -> Any:
+        shared = self.__dict__.get("_StaticConfig__shared")
+        if shared is not None and name in shared:
+            return self._materialize(name, shared[name])
+        raise AttributeError(f'Config has no attribute "{name}"')
 
     def __setattr__(self, key: str, value: ConfigEntryType) -> None:
         if self.readonly:
             raise ReadOnlyError("Config is read-only")
-        if key not in self:
+        convert = self._schema().converters.get(key)
+        if convert is None:
             raise AttributeError(f'Config has no attribute "{key}"')
-        super().__setattr__(key, value)
+        self._writing()
+        old = self._entry(key)
+        new = self._adopt(key, convert(value))
+        self._set_entry(key, new)
+        self._changed(key, old, new)
 
     def __delattr__(self, fqn: str) -> Any:
         raise InvalidOperationError()
 
-    def keys(self, _prefix: str = "") -> Set[str]:
-        keys = set()
-        for k, v in self.__dict__.items():
-            if k.startswith("_"):
-                continue
-            if isinstance(v, Config):
-                keys.add(("" if len(_prefix) == 0 else _prefix + ".") + k)
-                keys = keys.union(v.keys(("" if len(_prefix) == 0 else _prefix + ".") + k))
-            else:
-                keys.add(("" if len(_prefix) == 0 else _prefix + ".") + k)
-        return keys
-
-    def items(self, _prefix: str = "") -> List[Tuple[str, BasicConfigEntryType]]:
-        items = []
-        for k, v in self.__dict__.items():
-            if k.startswith("_"):
-                continue
-            if isinstance(v, Config):
-                items.extend(v.items(("" if len(_prefix) == 0 else _prefix + ".") + k))
-            else:
-                items.append((("" if len(_prefix) == 0 else _prefix + ".") + k, v))
-        return items
-
-    def __do_by_fqn(self, fqn: str, _i: int, func: Union[Callable[[Any, str], Optional[Any]], Callable[[Any, str, Any], Optional[Any]]], *params: Any) -> Any:
-        fqn_parts = fqn.strip().split(".")[_i:]
-        print(fqn, _i, fqn_parts)
-        if not hasattr(self, "__dict__") or fqn_parts[0] not in self.__dict__.keys():
-            raise AttributeError(f'Config has no attribute "{".".join(fqn_parts[:(_i+2)])}"')
-        if len(fqn_parts) == 1:
-            return func(self, fqn_parts[0], *params)
-        return getattr(self, fqn_parts[0]).__do_by_fqn(fqn, _i + 1, func, *params)
-
-    def __getitem__(self, fqn: str) -> Any:
-        return self.__do_by_fqn(fqn, 0, getattr)
-
-    def __setitem__(self, fqn: str, value: Any) -> Any:
-        if fqn not in self:
-            raise AttributeError(f'Config has no attribute "{fqn}"')
-        return self.__do_by_fqn(fqn, 0, setattr, value)
-
     def __delitem__(self, fqn: str) -> Any:
         raise InvalidOperationError()
 
+    def compile(self) -> CompiledConfig:
+        # Read-only snapshot with plain attribute access (see CompiledConfig), later changes of this config are not reflected
+        return self._compiled_type()._make([StaticConfig.__compile_value(value) for _, value in self._entries()])
+
+    @staticmethod
+    def __compile_value(value: Any) -> Any:
+        if isinstance(value, StaticConfig):
+            return value.compile()
+        elif isinstance(value, Config):
+            # Left uncompiled, frozen clone as a snapshot
+            clone = value.clone()
+            clone.freeze()
+            return clone
+        elif isinstance(value, array):
+            return value[:]
+        elif isinstance(value, list):
+            return [StaticConfig.__compile_value(x) for x in cast(List[Any], value)]
+        return value
+
     def _to_dict(self, value: ConfigEntryType) -> ConfigEntryType:
         if isinstance(value, StaticConfig):
             return value.to_dict()
+        elif isinstance(value, array):
+            return value.tolist()
         else:
             return value
 
     def to_dict(self) -> Dict[str, ConfigEntryType]:
+        if access_tracker._active is not None:
+            access_tracker._active._bulk_read(self._fqn(""))
         result = {}
-        for key, value in self.__dict__.items():
-            if key.startswith("_"):
-                continue
+        for key, value in self._entries():
             result[key] = self._to_dict(value)
         return result
 
-    def freeze(self) -> None:
-        super().freeze()
-        for attr in self.__dict__.values():
-            if isinstance(attr, Config):
-                attr.freeze()
+
+access_tracker._static_config_type = StaticConfig
+if access_tracker._active is not None:
+    setattr(StaticConfig, "__getattribute__", access_tracker._static_getattribute)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import copy
+from typing import Any, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union, overload
+
+from fennec_dl.config.config import Config
+
+
+T = TypeVar("T", bound=Config)
+
+
+class ConfigSweep(Generic[T]):
+    def __init__(self, config: T, overwrites: Sequence[Tuple[str, Sequence[Any]]], _indices: Optional[range] = None) -> None:
+        super().__init__()
+        self.__config = config
+        self.__overwrites = [(fqn, list(values)) for fqn, values in overwrites]
+        size = 1
+        for _, values in self.__overwrites:
+            size *= len(values)
+        self.__size = size
+        self.__indices = range(size) if _indices is None else _indices
+
+    @property
+    def config(self) -> T:
+        return self.__config
+
+    @property
+    def overwrites(self) -> List[Tuple[str, List[Any]]]:
+        return self.__overwrites
+
+    def __len__(self) -> int:
+        return len(self.__indices)
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ConfigSweep[T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, ConfigSweep[T]]:
+        # Slices are sweeps of the selected configs (like shard), nothing is built
+        if isinstance(index, slice):
+            sweep = copy.copy(self)
+            sweep.__indices = self.__indices[index]
+            return sweep
+        return self.build(self.__indices[index])
+
+    def __iter__(self) -> Iterator[T]:
+        for index in self.__indices:
+            yield self.build(index)
+
+    @property
+    def indices(self) -> range:
+        # Indices of the configs of this (possibly sharded) sweep within the full sweep
+        return self.__indices
+
+    def combination(self, index: int) -> List[Tuple[str, Any]]:
+        # Decodes an index of the full sweep in the order of itertools.product (last overwrite varies fastest)
+        if not 0 <= index < self.__size:
+            raise IndexError(f"Sweep index {index} out of range")
+        combination = []
+        for fqn, values in reversed(self.__overwrites):
+            index, i = divmod(index, len(values))
+            combination.append((fqn, values[i]))
+        combination.reverse()
+        return combination
+
+    def build(self, index: int) -> T:
+        clone = self.__config.clone()
+        for fqn, value in self.combination(index):
+            clone[fqn] = value
+        return clone  # type: ignore
+
+    def shard(self, rank: int, world_size: int) -> ConfigSweep[T]:
+        if world_size < 1 or not 0 <= rank < world_size:
+            raise ValueError(f"Invalid rank {rank} for world size {world_size}")
+        shard = copy.copy(self)
+        shard.__indices = self.__indices[rank::world_size]
+        return shard
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import pickle
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from fennec_dl.config.sweep import ConfigSweep
+
+
+class SweepResult(NamedTuple):
+    # variant is the index of the variant within the full (unsharded) sweep
+    variant: int
+    value: Any
+    error: Optional[BaseException]
+    traceback: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Per worker process, set once by _initialize instead of sending the config with every variant (configs are pickled in their compact form, see Config.__reduce__)
+_state: Optional[Tuple[ConfigSweep[Any], Callable[[Any], Any]]] = None
+
+
+def _initialize(sweep: ConfigSweep[Any], fn: Callable[[Any], Any], cpu_only: bool) -> None:
+    global _state
+    if cpu_only:
+        # Before fn gets a chance to initialize CUDA
+        os.environ["CUDA_VISIBLE_DEVICES"] = ""
+    _state = (sweep, fn)
+
+
+def _run(index: int) -> Tuple[int, Any, Optional[BaseException], Optional[str]]:
+    assert _state is not None
+    return _call(*_state, index)
+
+
+def _call(sweep: ConfigSweep[Any], fn: Callable[[Any], Any], index: int) -> Tuple[int, Any, Optional[BaseException], Optional[str]]:
+    try:
+        return index, fn(sweep.build(index)), None, None
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException as e:
+        error = e
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(f"{type(e).__qualname__}: {e}")
+        return index, None, error, traceback.format_exc()
+
+
+class SweepExecutor:
+    def __init__(self, max_workers: Optional[int] = None, cpu_only: bool = False, max_pending: Optional[int] = None, mp_context: Optional[str] = None) -> None:
+        super().__init__()
+        # max_workers=0 runs all variants in the calling process (e.g. for tests), on a pickled copy of the sweep like the worker processes
+        self.__max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        if self.__max_workers < 0:
+            raise ValueError(f"Invalid number of workers {max_workers}")
+        self.__cpu_only = cpu_only
+        # Variants are submitted as results come in, sweeps can be much larger than what fits into the queue of the pool
+        self.__max_pending = 4 * max(self.__max_workers, 1) if max_pending is None else max_pending
+        self.__mp_context = mp_context
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    def run(self, sweep: ConfigSweep[Any], fn: Callable[[Any], Any]) -> Iterator[SweepResult]:
+        # Yields the results in the order the variants finish, exceptions raised by fn are returned as part of the result of the failing variant
+        # fn and its results must be picklable unless max_workers=0
+        indices: Iterator[int] = iter(sweep.indices)
+        if self.__max_workers == 0:
+            # Not through _state, runs of the same process may be interleaved
+            copy = pickle.loads(pickle.dumps(sweep))
+            for index in indices:
+                yield SweepResult(*_call(copy, fn, index))
+            return
+        context = None if self.__mp_context is None else multiprocessing.get_context(self.__mp_context)
+        pending: Dict[Future[Any], int] = {}
+        failures = 0
+        while True:
+            pool = ProcessPoolExecutor(self.__max_workers, context, _initialize, (sweep, fn, self.__cpu_only))
+            broken: Optional[BrokenProcessPool] = None
+            try:
+                while True:
+                    while broken is None and len(pending) < self.__max_pending:
+                        index = next(indices, None)
+                        if index is None:
+                            break
+                        try:
+                            pending[pool.submit(_run, index)] = index
+                        except BrokenProcessPool as e:
+                            indices = itertools.chain([index], indices)
+                            broken = e
+                    if len(pending) == 0:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        try:
+                            result = SweepResult(*future.result())
+                            failures = 0
+                        except BrokenProcessPool as e:
+                            # A worker died (e.g. segfault, out of memory), all variants in flight fail with it and the remaining ones run on a new pool
+                            broken = e
+                            result = SweepResult(index, None, e, None)
+                        except Exception as e:
+                            # Results that cannot be sent back
+                            result = SweepResult(index, None, e, traceback.format_exc())
+                        yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+                pool.shutdown(wait=True)
+            if broken is None:
+                return
+            failures += 1
+            if failures == 3:
+                # Pools keep breaking before any variant finishes, most likely the workers cannot start (e.g. fn cannot be unpickled)
+                raise broken
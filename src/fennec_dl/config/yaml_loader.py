@@ -1,50 +1,75 @@
 from pathlib import Path
-from typing import Any, Mapping, Optional, Sequence, TextIO, cast
+from typing import IO, Any, Dict, List, Optional, TextIO, Tuple, Type, cast
 
 import yaml
 
+from fennec_dl.config.include_cache import Signature
 from fennec_dl.config.loader import Loader
+from fennec_dl.config.references import Reference, resolve_references
+
+
+class _LoaderMixin:
+    def __init__(self, stream: TextIO, config_loader: Type["YAMLLoader"]) -> None:
+        super().__init__(stream)  # type: ignore
+        # Kept for !include, the C parser does not expose the stream it reads from
+        self.source = stream
+        self.config_loader = config_loader
+        self.dependencies: List[Tuple[Path, Signature]] = []
+
+
+def _construct_include(loader: Any, node: yaml.Node) -> Any:
+    return loader.config_loader._include_from(loader.source, cast(str, loader.construct_scalar(cast(yaml.ScalarNode, node))), loader.dependencies)
+
+
+def _construct_reference(loader: Any, node: yaml.Node) -> Reference:
+    return Reference(cast(str, loader.construct_scalar(cast(yaml.ScalarNode, node))))
+
+
+class _PythonLoader(_LoaderMixin, yaml.SafeLoader):
+    pass
+
+
+_BACKENDS: List[Type[Any]] = [_PythonLoader]
+
+if hasattr(yaml, "CSafeLoader"):
+
+    class _CLoader(_LoaderMixin, yaml.CSafeLoader):  # type: ignore
+        pass
+
+    _BACKENDS.insert(0, _CLoader)
+
+for _backend in _BACKENDS:
+    _backend.add_constructor("!include", _construct_include)
+    _backend.add_constructor("!ref", _construct_reference)
+
+
+class _Dumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):  # type: ignore
+    pass
+
+
+_Dumper.add_representer(Reference, lambda d, x: d.represent_scalar("!ref", x.fqn))
 
 
 class YAMLLoader(Loader):
-    @staticmethod
-    def _load(stream: TextIO, _root: bool = True) -> "Config":  # type: ignore
-        class _Loader(yaml.Loader):
-            pass
-
-        def load_intern(path: Path) -> "Config":  # type: ignore
-            if not path.is_absolute():
-                path = Path(stream.name).parent.joinpath(path).resolve()
-            with open(path, "r", encoding="UTF-8") as stream2:
-                return YAMLLoader._load(stream2, False)
-
-        _Loader.add_constructor("!include", lambda l, n: load_intern(Path(cast(str, l.construct_scalar(cast(yaml.ScalarNode, n))))))
-
-        class _Reference:
-            def __init__(self, path: str) -> None:
-                super().__init__()
-                self.path = path.split(".")
-
-        _Loader.add_constructor("!ref", lambda l, n: _Reference(cast(str, l.construct_scalar(cast(yaml.ScalarNode, n)))))
-
-        def resolve_references(element: Any, _full_config: Optional[Mapping[str, Any]] = None) -> Any:
-            if _full_config is None:
-                _full_config = element
-            if isinstance(element, _Reference):
-                value = _full_config
-                for path_part in element.path:
-                    value = cast(Mapping[str, Any], value)[path_part]
-                return value
-            elif isinstance(element, Mapping):
-                return {k: resolve_references(v, _full_config) for k, v in element.items()}
-            elif isinstance(element, Sequence):
-                return [resolve_references(x, _full_config) for x in element]
-            return element
-
-        data = yaml.load(stream, Loader=_Loader)
-        if not isinstance(data, Mapping):
+    # libyaml based parser if PyYAML was built with it, pure Python parser otherwise
+    _backend: Type[Any] = _BACKENDS[0]
+
+    @classmethod
+    def _load(cls, stream: TextIO, _root: bool = True, _dependencies: Optional[List[Tuple[Path, Signature]]] = None) -> "Config":  # type: ignore
+        loader = cls._backend(stream, cls)
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+        if _dependencies is not None:
+            _dependencies.extend(loader.dependencies)
+        if not isinstance(data, dict):
             raise RuntimeError("Configuration root element must be a mapping")
         if _root:
             data = resolve_references(data)
 
         return data
+
+    @staticmethod
+    def _dump(data: Dict[str, Any], stream: IO[Any]) -> None:
+        yaml.dump(data, stream, Dumper=_Dumper, sort_keys=False, allow_unicode=True)
@@ -0,0 +1,80 @@
+import pickle
+from typing import Any, cast
+
+import pytest
+
+from fennec_dl.config.access_tracker import AccessTracker
+from fennec_dl.config.config import Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.static_config import StaticConfig
+
+
+class MockConfig(StaticConfig):
+    class MockSubconfig(StaticConfig):
+        x: int
+        y: int
+
+    a: int
+    b: MockSubconfig
+    c: MockSubconfig
+
+
+def test_dynamic() -> None:
+    config = cast(Any, DynamicConfig({"a": 1, "b": {"x": 1, "y": 2}, "c": {"x": 1, "y": {"z": 3}}}, cast(Any, Config)._Config__secret))
+    _ = config.a
+    with AccessTracker() as tracker:
+        _ = config.b.x
+        _ = config["c.y.z"]
+        _ = config.c["y.z"]
+        config["b.y"] = 5
+        clone = config.clone()
+        _ = clone.a
+    _ = config.b.y
+    assert tracker.reads == {"b": 1, "b.x": 1, "c.y.z": 2, "c": 1, "a": 1}
+    assert tracker.unread(config) == ["b.y", "c.x"]
+    with tracker:
+        _ = config.c.to_dict()
+        _ = config.b.items()
+    assert tracker.bulk_reads == {"c": 1, "c.y": 1, "b": 1}
+    assert tracker.unread(config) == []
+    assert tracker.unread(config, bulk=False) == ["b.y", "c.x"]
+    # Listing unread entries while tracking is no read
+    with tracker:
+        assert tracker.unread(config, bulk=False) == ["b.y", "c.x"]
+    assert tracker.bulk_reads == {"c": 1, "c.y": 1, "b": 1}
+
+
+def test_static() -> None:
+    config = cast(Any, MockConfig({"a": 1, "b": {"x": 1, "y": 2}, "c": {"x": 3, "y": 4}}, cast(Any, Config)._Config__secret))
+    tracker = AccessTracker()
+    tracker.start()
+    try:
+        _ = config.a
+        _ = config.b.x
+        _ = config["c.y"]
+        clone = config.clone()
+        _ = clone.c.x
+        assert "c.x" in clone
+    finally:
+        tracker.stop()
+    assert "__getattribute__" not in StaticConfig.__dict__
+    _ = config.b.y
+    assert tracker.reads == {"a": 1, "b": 1, "b.x": 1, "c.y": 1, "c": 1, "c.x": 1}
+    assert tracker.unread(config) == ["b.y"]
+
+
+def test_merge() -> None:
+    config = cast(Any, DynamicConfig({"a": 1, "b": 2, "c": 3}, cast(Any, Config)._Config__secret))
+    trackers = [AccessTracker(), AccessTracker()]
+    with trackers[0]:
+        _ = config.a
+        with pytest.raises(RuntimeError):
+            trackers[1].start()
+    with trackers[1]:
+        _ = config.a
+        _ = config.b
+    tracker = AccessTracker()
+    tracker.merge(trackers[0])
+    tracker.merge(pickle.loads(pickle.dumps(trackers[1].to_dict())))
+    assert tracker.reads == {"a": 2, "b": 1}
+    assert tracker.unread(config) == ["c"]
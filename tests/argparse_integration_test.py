@@ -1,9 +1,14 @@
 import argparse
-from typing import Optional
+from array import array
+from typing import Optional, Union
 
-from fennec_dl.config.argparse_integration import add_overwrite_args, process_overwrite_args
+import pytest
+
+from fennec_dl.config.argparse_integration import add_overwrite_args, add_set_args, process_overwrite_args, process_set_args
+from fennec_dl.config.sampled_sweep import Range, SampledSweep
 from fennec_dl.config.static_config import StaticConfig
 from fennec_dl.config.yaml_loader import YAMLLoader
+from fennec_dl.errors.config_loading_error import ConfigLoadingError
 
 
 class MockConfig(StaticConfig):
@@ -33,6 +38,33 @@ def test_add_overwrite_args() -> None:
     assert args.b_d == [True]
 
 
+class MockOptionalConfig(StaticConfig):
+    a: Optional[int]
+    b: Optional[str]
+    c: Optional[Union[int, float]]
+    d: Optional[bool]
+
+
+def test_process_overwrite_args_optional() -> None:
+    config = YAMLLoader.parse_static("a: null\nb: null\nc: null\nd: null\n", MockOptionalConfig)
+    parser = argparse.ArgumentParser()
+    add_overwrite_args(config, parser)
+    args = parser.parse_args(["--a", "3", "--b", "x", "--c", "1", "--c", "0.5", "--d", "True"])
+    assert args.a == [3]
+    assert args.b == ["x"]
+    assert args.c == [1, 0.5]
+    assert args.d == [True]
+    configs = process_overwrite_args(config, args)
+    assert [(x.a, x.b, x.c, x.d) for x in configs] == [(3, "x", 1, True), (3, "x", 0.5, True)]
+    assert type(configs[0].c) == int
+    config.a = 5
+    config.b = "y"
+    config.a = None
+    assert (config.a, config.b) == (None, "y")
+    with pytest.raises(ConfigLoadingError):
+        config.a = "z"
+
+
 def test_process_overwrite_args() -> None:
     static_config = YAMLLoader.parse_static("a: 2\nb:\n  c: 4\n  d: null\n", MockConfig)
     parser = argparse.ArgumentParser()
@@ -71,3 +103,87 @@ def test_process_overwrite_args() -> None:
     assert configs[3].a == 3
     assert configs[3].b.c == 5
     assert configs[3].b.d == True
+
+
+def test_process_overwrite_args_sharded() -> None:
+    dynamic_config = YAMLLoader.parse_dynamic("a: 2\nb:\n  c: 4\n  d: null\n")
+    parser = argparse.ArgumentParser()
+    add_overwrite_args(dynamic_config, parser)
+    args = parser.parse_args(["--a", "1", "--a", "3", "--b.c", "3", "--b.c", "5", "--b.c", "7"])
+    configs = process_overwrite_args(dynamic_config, args, rank=1, world_size=4)
+    assert len(configs) == 2
+    assert configs[0].a == 1
+    assert configs[0].b.c == 5
+    assert configs[1].a == 3
+    assert configs[1].b.c == 7
+    assert dynamic_config.a == 2
+
+
+def test_process_overwrite_args_arrays() -> None:
+    config = YAMLLoader.parse_dynamic("a: [1, 2]\nb: [0.5]\n", arrays=True)
+    parser = argparse.ArgumentParser()
+    add_overwrite_args(config, parser)
+    args = parser.parse_args(["--a", "3,4", "--b", "1,2.5", "--b", "3"])
+    sweep = process_overwrite_args(config, args)
+    assert [x.to_dict() for x in sweep] == [{"a": [3, 4], "b": [1.0, 2.5]}, {"a": [3, 4], "b": [3.0]}]
+    assert sweep[0].a == array("q", [3, 4])
+
+
+def test_process_set_args() -> None:
+    config = YAMLLoader.parse_dynamic("a: 2\nb:\n  c: 4.5\n  d: null\n  e: x\n  f: [1, 2]\n  g:\n    h: 1\n", lazy=True)
+    parser = argparse.ArgumentParser()
+    add_set_args(parser)
+    args = parser.parse_args(["--set", "a=1,3", "--set", "b.c=1,2.5", "--set", "b.d=true", "--set", "b.e=1,'y,z'", "--set", "b.f=[3,4],[]", "--set", "a=5"])
+    sweep = process_set_args(config, args)
+    assert sweep.overwrites == [("a", [1, 3, 5]), ("b.c", [1.0, 2.5]), ("b.d", [True]), ("b.e", ["1", "y,z"]), ("b.f", [[3, 4], []])]
+    assert len(sweep) == 24
+    assert sweep[0].to_dict() == {"a": 1, "b": {"c": 1.0, "d": True, "e": "1", "f": [3, 4], "g": {"h": 1}}}
+    assert type(sweep[0]["b.c"]) is float
+    assert len(process_set_args(config, parser.parse_args([]))) == 1
+    assert len(process_set_args(config, args, rank=1, world_size=4)) == 6
+    with pytest.raises(AttributeError):
+        process_set_args(config, parser.parse_args(["--set", "b.x=1"]))
+    with pytest.raises(AttributeError):
+        process_set_args(config, parser.parse_args(["--set", "b.g=1"]))
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--set", "a"])
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--set", "b.f=3],[4,5"])
+
+    static_config = YAMLLoader.parse_static("a: 2\nb:\n  c: 4\n  d: null\n", MockConfig)
+    parser = argparse.ArgumentParser()
+    add_set_args(parser, "--override")
+    sweep = process_set_args(static_config, parser.parse_args(["--override", "b.c=3,5", "--override", "b.d=false"]), "--override")
+    assert [(x.b.c, x.b.d) for x in sweep] == [(3, False), (5, False)]
+
+    array_config = YAMLLoader.parse_dynamic("a: [1, 2]\nb: [0.5]\n", arrays=True)
+    parser = argparse.ArgumentParser()
+    add_set_args(parser)
+    sweep = process_set_args(array_config, parser.parse_args(["--set", "a=[3,4],5", "--set", "b=[1,2.5]"]))
+    assert [x.to_dict() for x in sweep] == [{"a": [3, 4], "b": [1.0, 2.5]}, {"a": [5], "b": [1.0, 2.5]}]
+    assert sweep[0].a == array("q", [3, 4])
+
+
+def test_process_set_args_sampled() -> None:
+    config = YAMLLoader.parse_dynamic("a: 2\nb:\n  c: 4.5\n  d: x\n")
+    parser = argparse.ArgumentParser()
+    add_set_args(parser)
+    args = parser.parse_args(["--set", "a=range(1,16)", "--set", "b.c=logrange(1e-4, 1e-1)", "--set", "b.d=x,y,z"])
+    sweep = process_set_args(config, args, samples=20, method="lhs", seed=1)
+    assert isinstance(sweep, SampledSweep)
+    assert sweep.overwrites == [("a", Range(1, 16, False, True)), ("b.c", Range(1e-4, 1e-1, True, False)), ("b.d", ["x", "y", "z"])]
+    configs = list(sweep)
+    assert len(configs) == 20
+    assert all(1 <= x.a <= 16 and 1e-4 <= x.b.c <= 1e-1 and x.b.d in ("x", "y", "z") for x in configs)
+    assert len(process_set_args(config, args, rank=1, world_size=3, samples=20)) == 7
+    with pytest.raises(ValueError):
+        process_set_args(config, args)
+    with pytest.raises(ValueError):
+        process_set_args(config, parser.parse_args(["--set", "a=range(1,16),20"]), samples=10)
+    with pytest.raises(ValueError):
+        process_set_args(config, parser.parse_args(["--set", "b.c=logrange(0,1)"]), samples=10)
+    with pytest.raises(ValueError):
+        process_set_args(config, parser.parse_args(["--set", "a=range(0.5,3.7)"]), samples=10)
+    assert process_set_args(config, parser.parse_args(["--set", "a=range(1.0,3)"]), samples=10).overwrites[0] == ("a", Range(1, 3, False, True))
+    assert process_set_args(config, parser.parse_args(["--set", "b.c=1e-4"])).overwrites == [("b.c", [1e-4])]
+    assert process_set_args(config, parser.parse_args(["--set", "b.d=range(1,2)"])).overwrites == [("b.d", ["range(1,2)"])]
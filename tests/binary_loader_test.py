@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from fennec_dl.config.binary_loader import BinaryLoader
+from fennec_dl.config.json_loader import JSONLoader
+from fennec_dl.config.yaml_loader import YAMLLoader
+from fennec_dl.errors.config_loading_error import ConfigLoadingError
+
+
+def test_load_dynamic(tmp_path: Path) -> None:
+    with pytest.raises(ConfigLoadingError):
+        BinaryLoader.load_dynamic("nonexistent.bin")
+    with open(tmp_path / "config.bin", "wb") as file:
+        file.write(b"a: 1\n")
+    with pytest.raises(ConfigLoadingError):
+        BinaryLoader.load_dynamic(tmp_path / "config.bin")
+    BinaryLoader.save({"a": 1, "b": {"c": [1, 2.5, "x", None, True]}}, tmp_path / "config.bin")
+    assert BinaryLoader.load_dynamic(tmp_path / "config.bin").to_dict() == {"a": 1, "b": {"c": [1, 2.5, "x", None, True]}}
+
+
+def test_parse_dynamic(tmp_path: Path) -> None:
+    with pytest.raises(ConfigLoadingError):
+        BinaryLoader.parse_dynamic(b"FNCFG\x01\x00invalid")
+    with open(tmp_path / "config.bin", "w+b") as file:
+        BinaryLoader._dump({"a": [1, 2]}, file)
+        file.seek(0)
+        assert BinaryLoader.parse_dynamic(file.read()).to_dict() == {"a": [1, 2]}
+
+
+def test_convert(tmp_path: Path) -> None:
+    with open(tmp_path / "config.yaml", "w", encoding="UTF-8") as file:
+        file.write('a: !include "include.yaml"\nb: !ref a.x\nc: [!ref a.x, 2]\n')
+    with open(tmp_path / "include.yaml", "w", encoding="UTF-8") as file:
+        file.write("x: 1\ny: !ref b\n")
+    BinaryLoader.convert(tmp_path / "config.yaml", tmp_path / "config.bin", YAMLLoader)
+    assert BinaryLoader.load_dynamic(tmp_path / "config.bin").to_dict() == {"a": {"x": 1, "y": 1}, "b": 1, "c": [1, 2]}
+    JSONLoader.convert(tmp_path / "config.bin", tmp_path / "config.json", BinaryLoader)
+    assert JSONLoader.load_dynamic(tmp_path / "config.json").to_dict() == {"a": {"x": 1, "y": 1}, "b": 1, "c": [1, 2]}
+    YAMLLoader.convert(tmp_path / "config.json", tmp_path / "config2.yaml", JSONLoader)
+    assert YAMLLoader.load_dynamic(tmp_path / "config2.yaml").to_dict() == {"a": {"x": 1, "y": 1}, "b": 1, "c": [1, 2]}
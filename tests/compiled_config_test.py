@@ -0,0 +1,153 @@
+import pickle
+from array import array
+from typing import Any, List, Optional, cast
+
+import pytest
+
+from fennec_dl.config.compiled_config import CompiledConfig
+from fennec_dl.config.config import Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.static_config import StaticConfig
+from fennec_dl.errors.invalid_operation_error import InvalidOperationError
+from fennec_dl.errors.readonly_error import ReadOnlyError
+
+
+class MockConfig(StaticConfig):
+    class MockSubconfig(StaticConfig):
+        x: int
+        y: List[List[int]]
+
+    a: int
+    b: Optional[str]
+    c: MockSubconfig
+    d: List[float]
+
+
+class MockArrayConfig(StaticConfig, arrays=True):
+    a: List[int]
+
+
+DICT = {"a": 1, "b": None, "c": {"x": 2, "y": [[1], [2, 3]]}, "d": [0.5, 1.5]}
+
+
+def test_compile() -> None:
+    config = cast(Any, MockConfig(cast(Any, DICT), cast(Any, Config)._Config__secret))
+    compiled = config.compile()
+    assert isinstance(compiled, CompiledConfig)
+    assert isinstance(compiled, Config)
+    assert type(compiled) is type(config.compile())
+    assert type(compiled) is not type(MockArrayConfig({"a": [1]}, cast(Any, Config)._Config__secret).compile())
+    assert not hasattr(compiled, "__dict__")
+    assert compiled.compile() is compiled
+    assert compiled.a == 1
+    assert compiled.b is None
+    assert compiled.c.x == 2
+    assert compiled.c.y == [[1], [2, 3]]
+    assert compiled.d == [0.5, 1.5]
+    # Compiled configs are snapshots
+    config.c.y[1].append(4)
+    config.a = 5
+    assert compiled.c.y == [[1], [2, 3]]
+    assert compiled.a == 1
+    assert MockArrayConfig({"a": [1]}, cast(Any, Config)._Config__secret).compile().a == array("q", [1])
+
+
+def test_readonly() -> None:
+    compiled = cast(Any, MockConfig(cast(Any, DICT), cast(Any, Config)._Config__secret).compile())
+    assert compiled.readonly
+    with pytest.raises(ReadOnlyError):
+        compiled.a = 2
+    with pytest.raises(ReadOnlyError):
+        compiled.c.x = 2
+    with pytest.raises(ReadOnlyError):
+        compiled["c.x"] = 2
+    with pytest.raises(ReadOnlyError):
+        compiled.e = 2
+    with pytest.raises(InvalidOperationError):
+        del compiled.a
+    with pytest.raises(InvalidOperationError):
+        del compiled["a"]
+    compiled.freeze()
+
+
+def test_config_interface() -> None:
+    config = cast(Any, MockConfig(cast(Any, DICT), cast(Any, Config)._Config__secret))
+    compiled = cast(Any, config.compile())
+    assert compiled.keys() == config.keys()
+    assert compiled.items() == config.items()
+    assert list(compiled.iter_keys()) == list(config.iter_keys())
+    assert list(compiled) == list(config)
+    assert len(compiled) == len(config) == 6
+    assert compiled["c.x"] == 2
+    assert compiled["c"].x == 2
+    assert "c.x" in compiled
+    assert "c.z" not in compiled
+    assert "a.x" not in compiled
+    with pytest.raises(AttributeError):
+        compiled["c.z"]
+    assert compiled.to_dict() == DICT
+    assert compiled == config
+    assert config == compiled
+    assert compiled != MockConfig(cast(Any, {**DICT, "a": 2}), cast(Any, Config)._Config__secret).compile()
+    clone = compiled.clone()
+    assert isinstance(clone, MockConfig)
+    assert not clone.readonly
+    clone.a = 2
+    assert compiled.a == 1
+    dynamic = cast(Any, DynamicConfig({"x": 1}, cast(Any, Config)._Config__secret))
+    dynamic.y = compiled
+    assert isinstance(dynamic.y, DynamicConfig)
+    assert dynamic.y.c.x == 2
+    config.c = compiled.c
+    assert isinstance(config.c, MockConfig.MockSubconfig)
+
+
+class MockDynamicFieldConfig(StaticConfig):
+    a: int
+    b: DynamicConfig
+
+
+def test_dynamic_field() -> None:
+    config = cast(Any, MockDynamicFieldConfig({"a": 1, "b": {"c": {"d": 2}, "e": [3]}}, cast(Any, Config)._Config__secret))
+    compiled = cast(Any, config.compile())
+    # Left uncompiled
+    assert isinstance(compiled.b, DynamicConfig)
+    assert compiled.keys() == config.keys() == {"a", "b", "b.c", "b.c.d", "b.e"}
+    assert compiled.items() == config.items()
+    assert len(compiled) == len(config) == 5
+    assert "b.c.d" in compiled
+    assert "b.x" not in compiled
+    assert compiled["b.c.d"] == 2
+    assert compiled == config
+    # Snapshots as well
+    assert compiled.b is not config.b
+    assert compiled.b.readonly
+    with pytest.raises(ReadOnlyError):
+        compiled.b.c.d = 7
+    digest = hash(compiled)
+    config.b.c.d = 3
+    config.b.e.append(4)
+    assert compiled.b.to_dict() == {"c": {"d": 2}, "e": [3]}
+    assert hash(compiled) == digest
+    assert compiled != config
+    with pytest.raises(ReadOnlyError):
+        compiled.b.c.d = 7
+
+
+def test_fingerprint() -> None:
+    config = cast(Any, MockConfig(cast(Any, DICT), cast(Any, Config)._Config__secret))
+    compiled = config.compile()
+    assert compiled.fingerprint() == config.fingerprint() == cast(Any, DynamicConfig(DICT, cast(Any, Config)._Config__secret)).fingerprint()
+    config.freeze()
+    assert hash(compiled) == hash(config)
+    assert {compiled: 1}[config] == 1
+
+
+def test_pickle() -> None:
+    compiled = cast(Any, MockConfig(cast(Any, DICT), cast(Any, Config)._Config__secret)).compile()
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert type(restored) is type(compiled)
+    assert type(restored.c) is type(compiled.c)
+    assert restored == compiled
+    assert restored.to_dict() == DICT
+    assert restored.fingerprint() == compiled.fingerprint()
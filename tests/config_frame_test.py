@@ -0,0 +1,125 @@
+from array import array
+from typing import Any, cast
+
+import pytest
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.config_frame import ConfigFrame
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.sampled_sweep import Range, SampledSweep
+from fennec_dl.config.static_config import StaticConfig
+from fennec_dl.config.sweep import ConfigSweep
+
+
+SECRET = cast(Any, Config)._Config__secret
+
+
+def test_columns() -> None:
+    configs = [
+        DynamicConfig({"lr": 0.1, "depth": 50, "name": "adam", "pretrained": True, "layers": [1, 2], "extra": {"x": 1}}, SECRET),
+        DynamicConfig({"lr": 1.0, "depth": 101, "name": "sgd", "pretrained": False, "layers": [3]}, SECRET),
+        DynamicConfig({"lr": 0.01, "depth": 50, "name": "adam", "pretrained": True, "layers": None}, SECRET),
+    ]
+    frame = ConfigFrame(configs)
+    assert len(frame) == 3
+    assert frame.columns == ["lr", "depth", "name", "pretrained", "layers", "extra.x"]
+    assert [frame.kind(x) for x in frame.columns] == ["float", "int", "str", "bool", "object", "int"]
+    assert frame.array("lr") == array("d", [0.1, 1.0, 0.01])
+    assert frame.array("depth") == array("q", [50, 101, 50])
+    assert frame.array("name") == array("i", [0, 1, 0])
+    assert frame.categories("name") == ["adam", "sgd"]
+    assert frame.column("pretrained") == [True, False, True]
+    assert frame.column("layers") == [[1, 2], [3], None]
+    assert frame.column("extra.x") == [1, None, None]
+    assert frame.present("extra.x") == bytearray([1, 0, 0])
+    with pytest.raises(ValueError):
+        frame.array("layers")
+    with pytest.raises(ValueError):
+        frame.categories("lr")
+    with pytest.raises(KeyError):
+        frame.column("missing")
+    assert frame.varying() == ["lr", "depth", "name", "pretrained", "layers", "extra.x"]
+    assert ConfigFrame([configs[0], configs[0]]).varying() == []
+    # Mixed ints and floats keep their types
+    mixed = ConfigFrame([DynamicConfig({"lr": 1}, SECRET), DynamicConfig({"lr": 0.5}, SECRET)])
+    assert mixed.kind("lr") == "object"
+    assert mixed.rows(("lr", ">", 0.75)) == [0]
+    assert len(ConfigFrame([])) == 0
+
+
+def test_rows() -> None:
+    frame = ConfigFrame([DynamicConfig({"optimizer": {"lr": 10.0**-i, "name": ["adam", "sgd"][i % 2]}, "depth": [50, 101][i % 3 == 0], "flag": i < 2, "layers": [i]}, SECRET) for i in range(6)])
+    assert frame.rows(("optimizer.lr", "<", 1e-3), ("depth", "==", 50)) == [4, 5]
+    assert frame.rows(("optimizer.name", "==", "sgd")) == [1, 3, 5]
+    assert frame.rows(("optimizer.name", ">=", "b")) == [1, 3, 5]
+    assert frame.rows(("optimizer.name", "in", ["sgd", "x"]), ("depth", "!=", 50)) == [3]
+    assert frame.rows(("flag", "==", True)) == [0, 1]
+    assert frame.rows(("layers", "==", [2])) == [2]
+    assert frame.rows() == list(range(6))
+    # Numbers never match strings, bools never match numbers
+    assert frame.rows(("optimizer.name", ">", 0)) == []
+    assert frame.rows(("flag", "==", 1)) == []
+    assert frame.rows(("depth", "==", True)) == []
+    with pytest.raises(ValueError):
+        frame.rows(("depth", "~", 1))
+    filtered = frame.filter(("optimizer.name", "==", "adam"))
+    assert len(filtered) == 3
+    assert filtered.column("optimizer.lr") == [1.0, 1e-2, 1e-4]
+    assert filtered.varying() == ["optimizer.lr", "depth", "flag", "layers"]
+
+
+def test_group_by() -> None:
+    frame = ConfigFrame([DynamicConfig({"a": i % 2, "b": ["x", "y", "z"][i % 3], "c": i}, SECRET) for i in range(6)] + [DynamicConfig({"a": 0, "c": 6}, SECRET)])
+    groups = frame.group_by("a")
+    assert list(groups) == [(0,), (1,)]
+    assert groups[(0,)].column("c") == [0, 2, 4, 6]
+    groups = frame.group_by("b", "a")
+    assert list(groups) == [("x", 0), ("y", 1), ("z", 0), ("x", 1), ("y", 0), ("z", 1), (None, 0)]
+    # Groups lacking an entry drop its column
+    assert groups[(None, 0)].columns == ["a", "c"]
+
+
+def test_row() -> None:
+    configs = [DynamicConfig({"a": {"b": i, "c": [i]}, "d": "x" if i else "y", "e": i == 1, "f": i if i else 0.5}, SECRET) for i in range(3)] + [DynamicConfig({"a": {"b": 3}}, SECRET)]
+    frame = ConfigFrame(configs)
+    rows = list(frame)
+    assert [x.to_dict() for x in rows] == [x.to_dict() for x in configs]
+    assert [[type(v) for _, v in x.iter_items()] for x in rows] == [[type(v) for _, v in x.iter_items()] for x in configs]
+    assert frame[-1].to_dict() == {"a": {"b": 3}}
+    rows[0].a.c.append(1)
+    assert frame.column("a.c")[0] == [0]
+    with pytest.raises(IndexError):
+        frame.row(4)
+
+
+def test_sweep() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 2.5, "d": "x"}, "e": [1]}, SECRET)
+    sweep = ConfigSweep(config, [("a", [1, 2, 3]), ("b.d", ["x", "y"])])
+    frame = ConfigFrame(sweep)
+    assert len(frame) == 6
+    assert [x.to_dict() for x in frame] == [x.to_dict() for x in sweep]
+    assert frame.varying() == ["a", "b.d"]
+    frame = ConfigFrame(sweep.shard(1, 2))
+    assert [x.to_dict() for x in frame] == [x.to_dict() for x in sweep.shard(1, 2)]
+    sampled = SampledSweep(config, [("b.c", Range(0.0, 1.0))], 10, "lhs")
+    assert ConfigFrame(sampled).column("b.c") == [x.b.c for x in sampled]
+    # Overwrites of subconfigs and static configs build the configs
+    sweep = ConfigSweep(config, [("b", [{"c": 1}, {"f": 2}])])
+    assert [x.to_dict() for x in ConfigFrame(sweep)] == [x.to_dict() for x in sweep]
+
+    class MockConfig(StaticConfig):
+        a: int
+        b: float
+
+    static_sweep = ConfigSweep(MockConfig({"a": 1, "b": 0.5}, SECRET), [("b", [1.0, 2.0])])
+    assert ConfigFrame(static_sweep).column("b") == [1.0, 2.0]
+
+
+def test_to_numpy() -> None:
+    numpy = pytest.importorskip("numpy")
+    frame = ConfigFrame([DynamicConfig({"a": i, "b": i / 2, "c": "xy"[i % 2], "d": i == 0, "e": [i]}, SECRET) for i in range(3)] + [DynamicConfig({"a": 3}, SECRET)])
+    assert frame.to_numpy("a").tolist() == [0, 1, 2, 3]
+    assert frame.to_numpy("b").tolist() == [0.0, 0.5, 1.0, None]
+    assert frame.to_numpy("c").tolist() == ["x", "y", "x", None]
+    assert frame.to_numpy("d").dtype == numpy.bool_
+    assert frame.to_numpy("e").tolist() == [[0], [1], [2], None]
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from fennec_dl.config.config_index import ConfigIndex, IndexUpdate
+from fennec_dl.config.json_loader import JSONLoader
+
+
+def test_query(tmp_path: Path) -> None:
+    for i, (lr, depth, optimizer) in enumerate([(1e-2, 50, "adam"), (1e-4, 50, "sgd"), (5e-4, 101, "adam"), (1e-3, 50, "adam")]):
+        (tmp_path / f"run{i}").mkdir()
+        (tmp_path / f"run{i}" / "config.yaml").write_text(f"optimizer:\n  lr: {lr}\n  name: {optimizer}\nmodel:\n  depth: {depth}\n  pretrained: {str(i % 2 == 0).lower()}\n  layers: [{i}, 2]\n", encoding="UTF-8")
+    with ConfigIndex(tmp_path) as index:
+        assert index.update() == IndexUpdate([f"run{i}/config.yaml" for i in range(4)], [], [])
+        assert index.query(("optimizer.lr", "<", 1e-3), ("model.depth", "==", 50)) == ["run1/config.yaml"]
+        assert index.query(("optimizer.lr", "<=", 1e-3)) == ["run1/config.yaml", "run2/config.yaml", "run3/config.yaml"]
+        assert index.query(("optimizer.name", "in", ["sgd", "x"])) == ["run1/config.yaml"]
+        assert index.query(("optimizer.name", "!=", "adam")) == ["run1/config.yaml"]
+        assert index.query(("model.pretrained", "==", True)) == ["run0/config.yaml", "run2/config.yaml"]
+        assert index.query(("model.layers", "==", [3, 2])) == ["run3/config.yaml"]
+        # Numbers never match strings, bools never match numbers
+        assert index.query(("optimizer.name", ">", 0)) == []
+        assert index.query(("model.pretrained", "==", 1)) == []
+        assert index.query(("missing", "==", 1)) == []
+        assert index.query(("optimizer.name", "in", [])) == []
+        assert len(index.paths()) == 4
+        assert index.items("run1/config.yaml") == [("optimizer.lr", 1e-4), ("optimizer.name", "sgd"), ("model.depth", 50), ("model.pretrained", False), ("model.layers", [1, 2])]
+        assert index.values("model.depth") == {"run0/config.yaml": 50, "run1/config.yaml": 50, "run2/config.yaml": 101, "run3/config.yaml": 50}
+        assert index.values("model.depth", ["run2/config.yaml"]) == {"run2/config.yaml": 101}
+        with pytest.raises(ValueError):
+            index.query(("model.depth", "~", 1))
+
+
+def test_update(tmp_path: Path) -> None:
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "model.yaml").write_text("depth: 50\n", encoding="UTF-8")
+    (tmp_path / "a.yaml").write_text("lr: 0.1\nmodel: !include shared/model.yaml\n", encoding="UTF-8")
+    (tmp_path / "b.yaml").write_text("lr: 0.2\n", encoding="UTF-8")
+    (tmp_path / "c.yaml").write_text("lr: [", encoding="UTF-8")
+    index = ConfigIndex(tmp_path, tmp_path / "index.sqlite")
+    assert index.update() == IndexUpdate(["a.yaml", "b.yaml", "c.yaml", "shared/model.yaml"], [], ["c.yaml"])
+    assert list(index.errors()) == ["c.yaml"]
+    # Failed files are retried every time
+    assert index.update() == IndexUpdate(["c.yaml"], [], ["c.yaml"])
+    # Touched files without changes are not parsed again
+    os.utime(tmp_path / "b.yaml", ns=(0, 0))
+    assert index.update() == IndexUpdate(["c.yaml"], [], ["c.yaml"])
+    # Changed includes update the files including them
+    (tmp_path / "shared" / "model.yaml").write_text("depth: 101\n", encoding="UTF-8")
+    assert index.update() == IndexUpdate(["a.yaml", "c.yaml", "shared/model.yaml"], [], ["c.yaml"])
+    assert index.query(("model.depth", "==", 101)) == ["a.yaml"]
+    (tmp_path / "c.yaml").write_text("lr: 0.3\n", encoding="UTF-8")
+    (tmp_path / "b.yaml").unlink()
+    assert index.update() == IndexUpdate(["c.yaml"], ["b.yaml"], [])
+    assert index.values("lr") == {"a.yaml": 0.1, "c.yaml": 0.3}
+    index.close()
+
+    # Persistent, rebuilt for other loaders
+    index = ConfigIndex(tmp_path, tmp_path / "index.sqlite")
+    assert index.update() == IndexUpdate([], [], [])
+    assert index.query(("lr", ">", 0.2)) == ["c.yaml"]
+    index.close()
+    (tmp_path / "d.json").write_text('{"lr": 0.4}', encoding="UTF-8")
+    index = ConfigIndex(tmp_path, tmp_path / "index.sqlite", JSONLoader, "*.json")
+    assert index.update() == IndexUpdate(["d.json"], [], [])
+    assert index.paths() == ["d.json"]
+    index.close()
+    with sqlite3.connect(str(tmp_path / "index.sqlite")) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM files").fetchone() == (1,)
+
+
+def test_update_failed_include(tmp_path: Path) -> None:
+    (tmp_path / "inc").mkdir()
+    (tmp_path / "inc" / "m.yml").write_text("depth: [", encoding="UTF-8")
+    (tmp_path / "a.yaml").write_text("model: !include inc/m.yml\n", encoding="UTF-8")
+    (tmp_path / "b.yaml").write_text("model: !include inc/n.yml\n", encoding="UTF-8")
+    with ConfigIndex(tmp_path, tmp_path / "index.sqlite") as index:
+        assert index.update() == IndexUpdate(["a.yaml", "b.yaml"], [], ["a.yaml", "b.yaml"])
+        # Fixed and created includes are picked up although the including files did not change
+        (tmp_path / "inc" / "m.yml").write_text("depth: 50\n", encoding="UTF-8")
+        (tmp_path / "inc" / "n.yml").write_text("depth: 101\n", encoding="UTF-8")
+        assert index.update() == IndexUpdate(["a.yaml", "b.yaml"], [], [])
+        assert index.errors() == {}
+        assert index.values("model.depth") == {"a.yaml": 50, "b.yaml": 101}
+        assert index.update() == IndexUpdate([], [], [])
@@ -0,0 +1,48 @@
+from typing import Any, Dict, cast
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.diff import ConfigDiff, diff
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.static_config import StaticConfig
+
+
+def dynamic(dict_: Dict[str, Any], lazy: bool = False) -> Any:
+    return DynamicConfig(dict_, cast(Any, Config)._Config__secret, lazy)
+
+
+def test_diff() -> None:
+    a = dynamic({"a": 1, "b": {"c": [1, 2], "d": "x", "e": {"f": 1}}, "g": None})
+    assert diff(a, a) == ConfigDiff([], [], [])
+    assert diff(a, a.clone()) == ConfigDiff([], [], [])
+    b = a.clone()
+    b["b.c"] = [1, 3]
+    b["b.e.f"] = 1.0
+    b["b.h"] = {"i": 1}
+    del b["g"]
+    b.a = {"x": 1}
+    assert diff(a, b) == ConfigDiff(["b.h"], ["g"], ["a", "b.c"])
+    assert diff(b, a) == ConfigDiff(["g"], ["b.h"], ["a", "b.c"])
+    assert diff(a, dynamic(a.to_dict(), True)) == ConfigDiff([], [], [])
+    assert diff(dynamic({"a": {"b": 1}}, True), dynamic({"a": {"b": 2}})) == ConfigDiff([], [], ["a.b"])
+    c = dynamic({"a": {"b": [1]}})
+    d = dynamic({"a": {"b": [1, 2]}})
+    c.fingerprint()
+    d.fingerprint()
+    c.a.b.append(2)
+    assert diff(c, d) == ConfigDiff([], [], [])
+    assert c == d
+
+
+def test_diff_static() -> None:
+    class MockConfig(StaticConfig):
+        class MockSubconfig(StaticConfig):
+            x: int
+
+        a: int
+        b: MockSubconfig
+
+    a = MockConfig({"a": 1, "b": {"x": 2}}, cast(Any, Config)._Config__secret)
+    b = MockConfig({"a": 1, "b": {"x": 3}}, cast(Any, Config)._Config__secret)
+    assert diff(a, b) == ConfigDiff([], [], ["b.x"])
+    assert diff(a, b.compile()) == ConfigDiff([], [], ["b.x"])
+    assert diff(a, dynamic({"a": 1, "b": {"x": 2, "y": 1}})) == ConfigDiff(["b.y"], [], [])
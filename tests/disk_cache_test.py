@@ -0,0 +1,53 @@
+import marshal
+import os
+import time
+from pathlib import Path
+
+from fennec_dl.config.disk_cache import DiskCache
+from fennec_dl.config.include_cache import IncludeCache
+
+
+def test_key() -> None:
+    assert DiskCache.key("a", Path("/x.yaml"), b"a: 1") == DiskCache.key("a", Path("/x.yaml"), b"a: 1")
+    assert DiskCache.key("a", Path("/x.yaml"), b"a: 1") != DiskCache.key("b", Path("/x.yaml"), b"a: 1")
+    assert DiskCache.key("a", Path("/x.yaml"), b"a: 1") != DiskCache.key("a", Path("/y.yaml"), b"a: 1")
+    assert DiskCache.key("a", Path("/x.yaml"), b"a: 1") != DiskCache.key("a", Path("/x.yaml"), b"a: 2")
+
+
+def test_get(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    assert cache.get("a") is None
+    include = tmp_path / "include.yaml"
+    with open(include, "w", encoding="UTF-8") as file:
+        file.write("x: 1\n")
+    cache.put("a", {"a": {"x": 1}, "b": [1, 2.5, "c", None, True]}, [(include, IncludeCache.signature(include))])
+    assert cache.get("a") == {"a": {"x": 1}, "b": [1, 2.5, "c", None, True]}
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == ["a"]
+    # Entries are dropped as soon as one of the included files changes
+    with open(include, "w", encoding="UTF-8") as file:
+        file.write("x: 2\n")
+    assert cache.get("a") is None
+    include.unlink()
+    assert cache.get("a") is None
+    # Files changed after parsing and unsupported values are not cached
+    cache.put("b", {"a": 1}, [(tmp_path / "missing.yaml", (0, 0, 0))])
+    cache.put("c", {"a": object()}, [])
+    assert cache.get("b") is None
+    assert cache.get("c") is None
+    with open(tmp_path / "cache" / "d", "wb") as file:
+        file.write(b"corrupted")
+    assert cache.get("d") is None
+    cache.clear()
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_put(tmp_path: Path) -> None:
+    size = len(marshal.dumps((1, [], {"x": "y" * 1000})))
+    cache = DiskCache(tmp_path, 3 * size)
+    for key in ["a", "b", "c"]:
+        cache.put(key, {"x": "y" * 1000}, [])
+        now = time.time() - 100 + ord(key)
+        os.utime(tmp_path / key, (now, now))
+    assert cache.get("a") is not None
+    cache.put("d", {"x": "y" * 1000}, [])
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a", "c", "d"]
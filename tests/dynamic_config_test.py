@@ -1,3 +1,6 @@
+import copy
+import pickle
+from array import array
 from typing import Any, Dict, List, Optional, cast
 
 import pytest
@@ -15,6 +18,40 @@ def test_init() -> None:
         _ = DynamicConfig({"k": [{"a": 1, "b": 2}, {"c": 3, "d": 4}]}, cast(Any, Config)._Config__secret)
 
 
+def test_lazy() -> None:
+    dict_ = {"a": 1, "g": {"a": 1, "b": 2}, "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": {"l": [{"m": 1}]}}
+    config = cast(Any, DynamicConfig(cast(Dict[str, ConfigEntryType], dict_), cast(Any, Config)._Config__secret, True))
+    data = config._DynamicConfig__data
+    assert data["g"] is dict_["g"]
+    assert 16 == len(config)
+    assert {"a", "g", "g.a", "g.b", "i", "i.a", "i.a.a", "i.a.b", "i.c", "i.c.c", "i.c.d", "j", "j.a", "j.b", "k", "k.l"} == config.keys()
+    assert [("a", 1), ("g.a", 1), ("g.b", 2), ("i.a.a", 1), ("i.a.b", 2), ("i.c.c", 3), ("i.c.d", 4), ("j.a", [1, 2]), ("j.b", [3, 4]), ("k.l", [{"m": 1}])] == config.items()
+    assert config.to_dict() == dict_
+    assert "i.c.d" in config
+    assert "i.c.e" not in config
+    assert isinstance(data["i"], dict)
+
+    assert config["i.a.b"] == 2
+    assert isinstance(data["i"], DynamicConfig)
+    assert isinstance(data["i"]._DynamicConfig__data["a"], DynamicConfig)
+    assert isinstance(data["i"]._DynamicConfig__data["c"], dict)
+    assert isinstance(data["g"], dict)
+    assert config.g.b == 2
+    config.i.c.d = 5
+    assert config["i.c.d"] == 5
+    assert 16 == len(config)
+    config.j = 6
+    assert 14 == len(config)
+    assert "j.a" not in config
+    with pytest.raises(ConfigLoadingError):
+        config.k
+
+    config = cast(Any, DynamicConfig(cast(Dict[str, ConfigEntryType], {"a": {"b": {"c": 1}}}), cast(Any, Config)._Config__secret, True))
+    config.freeze()
+    with pytest.raises(ReadOnlyError):
+        config.a.b.c = 2
+
+
 def test_eq() -> None:
     class MockConfig(StaticConfig):
         class MockSubconfig(StaticConfig):
@@ -55,6 +92,29 @@ class MockConfig3(StaticConfig):
     assert a == b
     assert a == c
     assert a != d
+    # Equality is symmetric and structural
+    e = DynamicConfig({"a": 1, "b": {}}, cast(Any, Config)._Config__secret)
+    f = DynamicConfig({"a": 1}, cast(Any, Config)._Config__secret)
+    assert e != f
+    assert f != e
+    assert f != DynamicConfig({"a": 1, "b": 2}, cast(Any, Config)._Config__secret)
+    assert DynamicConfig({"a": 1, "b": 2}, cast(Any, Config)._Config__secret) != f
+    assert DynamicConfig({"a": {"b": 1}}, cast(Any, Config)._Config__secret) != DynamicConfig({"a": 1}, cast(Any, Config)._Config__secret)
+    assert a == DynamicConfig(a.to_dict(), cast(Any, Config)._Config__secret, True)
+    assert DynamicConfig(a.to_dict(), cast(Any, Config)._Config__secret, True) == a
+    assert a == a.clone()
+    assert a != 1
+    # Cached fingerprints of mutable configs are stale after in-place changes of list entries
+    x = cast(Any, DynamicConfig({"a": [1], "b": {"c": [2]}}, cast(Any, Config)._Config__secret))
+    y = cast(Any, DynamicConfig({"a": [1, 3], "b": {"c": [2, 4]}}, cast(Any, Config)._Config__secret))
+    x.fingerprint()
+    x.b.fingerprint()
+    y.fingerprint()
+    y.b.fingerprint()
+    x.a.append(3)
+    x.b.c.append(4)
+    assert x == y
+    assert y == x
 
 
 def test_len() -> None:
@@ -70,6 +130,13 @@ def test_contains() -> None:
     assert "b.x" in config
     assert "c" not in config
     assert "c.x" not in config
+    assert "x" in config.b
+    assert "b.x.y" not in config
+    config.b.y = {"z": 1}
+    assert "b.y.z" in config
+    del config.b
+    assert "b.x" not in config
+    assert "b" not in config
 
 
 def test_iter() -> None:
@@ -90,6 +157,109 @@ def test_items() -> None:
     assert [("a", 1), ("b", 0.1), ("c", None), ("d", True), ("e", "test"), ("f", [1, 2, 3]), ("g.a", 1), ("g.b", 2), ("h", [[1, 2], [3, 4]]), ("i.a.a", 1), ("i.a.b", 2), ("i.c.c", 3), ("i.c.d", 4), ("j.a", [1, 2]), ("j.b", [3, 4])] == cast(Any, DynamicConfig({"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}}, cast(Any, Config)._Config__secret)).items()
 
 
+def test_iter_keys() -> None:
+    assert [] == list(cast(Any, DynamicConfig({}, cast(Any, Config)._Config__secret)).iter_keys())
+    assert ["a", "b", "b.x", "b.y", "b.y.z"] == list(cast(Any, DynamicConfig({"a": 1, "b": {"x": 3, "y": {"z": 4}}}, cast(Any, Config)._Config__secret)).iter_keys())
+    assert ["a", "b", "b.x", "b.y", "b.y.z"] == list(cast(Any, DynamicConfig({"a": 1, "b": {"x": 3, "y": {"z": 4}}}, cast(Any, Config)._Config__secret, True)).iter_keys())
+
+
+def test_iter_items() -> None:
+    config = cast(Any, DynamicConfig({"a": 1, "b": {"x": 3, "y": {"z": 4}}}, cast(Any, Config)._Config__secret))
+    assert [("a", 1), ("b.x", 3), ("b.y.z", 4)] == list(config.iter_items())
+    assert [("x", 3), ("y.z", 4)] == list(config.b.iter_items())
+    lazy = cast(Any, DynamicConfig({"a": 1, "b": {"x": 3, "y": {"z": 4}}}, cast(Any, Config)._Config__secret, True))
+    assert [("a", 1), ("b.x", 3), ("b.y.z", 4)] == list(lazy.iter_items())
+    assert [("a", 1), ("b.x", 3), ("b.y.z", 4)] == lazy.items()
+    assert [("a", 1), ("b.x", 3), ("b.y.z", 4)] == list(lazy.iter_items())
+    assert [("z", 4)] == lazy.b.y.items()
+    # The cached view is dropped on every change of the subtree
+    config.items()
+    config.b.items()
+    config.b.y.z = 5
+    assert [("a", 1), ("b.x", 3), ("b.y.z", 5)] == config.items()
+    assert [("x", 3), ("y.z", 5)] == config.b.items()
+    config.b.w = {"v": 6}
+    assert ["a", "b", "b.x", "b.y", "b.y.z", "b.w", "b.w.v"] == list(config.iter_keys())
+    del config.b
+    assert [("a", 1)] == list(config.iter_items())
+    assert {"a"} == config.keys()
+
+
+def test_arrays() -> None:
+    config = cast(Any, DynamicConfig({"a": [1, 2, 3], "b": [0.5, 1.5], "c": [1, 0.5], "d": [[1, 2]], "e": [], "f": [True], "g": {"h": [4, 5]}, "i": [2**70]}, cast(Any, Config)._Config__secret, False, True))
+    assert config.a == array("q", [1, 2, 3])
+    assert config.b == array("d", [0.5, 1.5])
+    assert config.c == [1, 0.5]
+    assert config.d == [[1, 2]]
+    assert config.e == []
+    assert config.f == [True]
+    assert config.g.h == array("q", [4, 5])
+    assert config.i == [2**70]
+    assert memoryview(config.b).tolist() == [0.5, 1.5]
+    # Arrays never equal lists
+    assert config.a != [1, 2, 3]
+    assert config.a.tolist() == [1, 2, 3]
+    assert config.to_dict() == {"a": [1, 2, 3], "b": [0.5, 1.5], "c": [1, 0.5], "d": [[1, 2]], "e": [], "f": [True], "g": {"h": [4, 5]}, "i": [2**70]}
+    assert config == DynamicConfig(config.to_dict(), cast(Any, Config)._Config__secret)
+    assert DynamicConfig(config.to_dict(), cast(Any, Config)._Config__secret) == config
+    config.b = [2.5]
+    config["g.x"] = [1, 2]
+    assert config.b == array("d", [2.5])
+    assert config.g.x == array("q", [1, 2])
+    clone = config.clone()
+    clone.a[0] = 7
+    assert config.a[0] == 1
+    lazy = cast(Any, DynamicConfig({"g": {"h": [4, 5]}}, cast(Any, Config)._Config__secret, True, True))
+    assert lazy.g.h == array("q", [4, 5])
+    plain = cast(Any, DynamicConfig({"a": 1}, cast(Any, Config)._Config__secret))
+    plain.a = array("q", [1, 2])
+    assert plain.a == [1, 2]
+    assert isinstance(plain.a, list)
+
+
+def test_fingerprint() -> None:
+    def fingerprint(dict_: Dict[str, Any], lazy: bool = False, arrays: bool = False) -> str:
+        return cast(Any, DynamicConfig(dict_, cast(Any, Config)._Config__secret, lazy, arrays)).fingerprint()
+
+    assert fingerprint({"a": 1, "b": {"c": "x", "d": [1, 2]}}) == fingerprint({"b": {"d": [1, 2], "c": "x"}, "a": 1})
+    assert fingerprint({"a": 1, "b": {"c": "x", "d": [1, 2]}}) == fingerprint({"a": 1, "b": {"c": "x", "d": [1, 2]}}, True)
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"a": 1.0, "b": [1, 2]}, False, True)
+    assert fingerprint({"a": True}) == fingerprint({"a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": "1"})
+    assert fingerprint({"a": 0.1}) != fingerprint({"a": 0.2})
+    assert fingerprint({"a": [1, 2]}) != fingerprint({"a": [2, 1]})
+    assert fingerprint({"a": [[1], 2]}) != fingerprint({"a": [1, [2]]})
+    assert fingerprint({"a": {"b": 1}}) != fingerprint({"a.b": 1})
+    assert fingerprint({"ab": "c"}) != fingerprint({"a": "bc"})
+    assert fingerprint({"a": None}) != fingerprint({"a": "n"})
+    # Fingerprints are updated after changes of (nested) entries
+    config = cast(Any, DynamicConfig({"a": 1, "b": {"c": {"d": 1}, "e": {"f": 2}}}, cast(Any, Config)._Config__secret))
+    before = config.fingerprint()
+    clone = config.clone()
+    assert clone.fingerprint() == before
+    config["b.c.d"] = 3
+    assert config.fingerprint() == fingerprint({"a": 1, "b": {"c": {"d": 3}, "e": {"f": 2}}})
+    assert config.b.fingerprint() == fingerprint({"c": {"d": 3}, "e": {"f": 2}})
+    assert clone.fingerprint() == before
+    del config.b.e
+    assert config.fingerprint() == fingerprint({"a": 1, "b": {"c": {"d": 3}}})
+    config.b.e = {"f": 2}
+    config.b.c.d = 1
+    assert config.fingerprint() == before
+
+
+def test_hash() -> None:
+    config = cast(Any, DynamicConfig({"a": 1, "b": {"c": 2}}, cast(Any, Config)._Config__secret))
+    with pytest.raises(TypeError):
+        hash(config)
+    config.freeze()
+    config2 = cast(Any, DynamicConfig({"b": {"c": 2}, "a": 1}, cast(Any, Config)._Config__secret))
+    config2.freeze()
+    assert hash(config) == hash(config2)
+    assert len({config, config2}) == 1
+    assert hash(config.b) == hash(config2.b)
+
+
 def test_getattr() -> None:
     config = cast(Any, DynamicConfig({"a": 1, "b": {"c": 3}}, cast(Any, Config)._Config__secret))
     print(config.keys())
@@ -140,6 +310,16 @@ def test_getitem() -> None:
         config["a.c"]
     with pytest.raises(AttributeError):
         config["b.b"]
+    assert config.a["b"] == 1
+    config.a.b = 2
+    config.a.c = {"d": 3}
+    assert config["a.b"] == 2
+    assert config["a.c.d"] == 3
+    assert config.a["c.d"] == 3
+    config.a = {"e": 4}
+    assert config["a.e"] == 4
+    with pytest.raises(AttributeError):
+        config["a.c.d"]
 
 
 def test_setitem() -> None:
@@ -147,6 +327,16 @@ def test_setitem() -> None:
     config["a"] = {"b": 1}
     config["a.b"] = 2
     assert config.a.b == 2
+    config["a.c"] = {"d": 3}
+    assert config.a.c.d == 3
+    assert "a.c.d" in config
+    assert 4 == len(config)
+    config["a"] = 5
+    assert "a.c.d" not in config
+    assert 1 == len(config)
+    with pytest.raises(AttributeError):
+        config["a.b"] = 3
+    config["a"] = {"b": 2}
     config.freeze()
     with pytest.raises(ReadOnlyError):
         config["a.b"] = 3
@@ -180,6 +370,76 @@ def test_clone() -> None:
             assert config[key] is not clone[key]
 
 
+def test_clone_copy_on_write() -> None:
+    config = cast(Any, DynamicConfig({"a": 1, "g": {"a": 1, "b": [1, 2]}, "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}}, cast(Any, Config)._Config__secret))
+    handle = config.i.a
+    clone = cast(Any, config.clone())
+    assert clone._DynamicConfig__data["i"] is config._DynamicConfig__data["i"]
+    clone["i.a.b"] = 5
+    assert clone._DynamicConfig__data["i"]._DynamicConfig__data["c"] is config._DynamicConfig__data["i"]._DynamicConfig__data["c"]
+    assert config.i.a.b == 2
+    assert clone.i.a.b == 5
+    handle.a = 6
+    config.i.c.c = 7
+    assert config["i.a.a"] == 6
+    assert config["i.c.c"] == 7
+    assert clone["i.a.a"] == 1
+    assert clone["i.c.c"] == 3
+    clone.g.b.append(3)
+    assert config.g.b == [1, 2]
+
+    clone2 = cast(Any, clone.clone())
+    del clone.i.c
+    assert "i.c" in clone2
+    assert clone2.i.c.d == 4
+    assert clone2 == DynamicConfig({"a": 1, "g": {"a": 1, "b": [1, 2, 3]}, "i": {"a": {"a": 1, "b": 5}, "c": {"c": 3, "d": 4}}}, cast(Any, Config)._Config__secret)
+    assert config.to_dict() == {"a": 1, "g": {"a": 1, "b": [1, 2]}, "i": {"a": {"a": 6, "b": 2}, "c": {"c": 7, "d": 4}}}
+
+    config.freeze()
+    clone = cast(Any, config.clone())
+    assert not clone.readonly
+    clone.i.a.a = 8
+    assert config.i.a.a == 6
+    assert len(config._DynamicConfig__data["i"]._Config__sharers) == 0
+
+
+def test_clone_mutable_leaves() -> None:
+    config = cast(Any, DynamicConfig({"a": [1], "g": {"b": [1, 2], "h": {"x": [[0]]}}}, cast(Any, Config)._Config__secret))
+    config.g.h
+    clone = cast(Any, config.clone())
+    # In-place changes on either side do not reach the other one, whether through attributes or FQNs
+    config.g.b.append(3)
+    clone.g.b.append(4)
+    config["g.h.x"][0].append(1)
+    clone.g.h.x.append([2])
+    clone.a.append(2)
+    assert config.to_dict() == {"a": [1], "g": {"b": [1, 2, 3], "h": {"x": [[0, 1]]}}}
+    assert clone.to_dict() == {"a": [1, 2], "g": {"b": [1, 2, 4], "h": {"x": [[0], [2]]}}}
+
+    arrays = cast(Any, DynamicConfig({"g": {"b": [1, 2]}}, cast(Any, Config)._Config__secret, arrays=True))
+    arrays.g
+    clone = cast(Any, arrays.clone())
+    arrays.g.b.append(3)
+    assert clone.g.b.tolist() == [1, 2]
+
+
+def test_items_clone() -> None:
+    # Cached flat views follow the copy-on-write splits of both sides
+    config = cast(Any, DynamicConfig({"b": {"x": [0]}}, cast(Any, Config)._Config__secret))
+    clone = cast(Any, config.clone())
+    assert clone.items() == [("b.x", [0])]
+    config.b.x.append(9)
+    assert clone.items() == [("b.x", [0])]
+    assert config.items() == [("b.x", [0, 9])]
+    clone.b.x.append(5)
+    assert clone.items() == [("b.x", [0, 5])]
+    assert config.items() == [("b.x", [0, 9])]
+    lazy = cast(Any, DynamicConfig({"b": {"x": [0]}}, cast(Any, Config)._Config__secret, True))
+    assert lazy.items() == [("b.x", [0])]
+    lazy.b.x.append(5)
+    assert lazy.items() == [("b.x", [0, 5])]
+
+
 def test_to_dict() -> None:
     dict_ = {"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}}
     config = DynamicConfig(cast(Dict[str, ConfigEntryType], dict_), cast(Any, Config)._Config__secret)
@@ -200,3 +460,30 @@ def test_readonly() -> None:
         config.a = 2
     with pytest.raises(AttributeError):
         del config.a
+
+
+def test_pickle() -> None:
+    config = cast(Any, DynamicConfig({"a": 1, "f": [1, 2, 3], "g": {"a": 1, "b": [0.5, 1.5]}, "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}}, cast(Any, Config)._Config__secret, True, True))
+    _ = config.i.a
+    clone = cast(Any, config.clone())
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored == config
+    assert restored.to_dict() == config.to_dict()
+    assert not restored.readonly
+    assert isinstance(restored.g.b, array)
+    restored.i.a.a = 5
+    assert config.i.a.a == 1
+    assert clone.i.a.a == 1
+    restored = pickle.loads(pickle.dumps(config.i))
+    assert restored.to_dict() == {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}
+    assert "i.a" not in restored
+    config.freeze()
+    restored = pickle.loads(pickle.dumps(clone))
+    assert restored == clone
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored.readonly
+    assert restored.i.c.readonly
+    with pytest.raises(ReadOnlyError):
+        restored.a = 2
+    assert hash(restored) == hash(config)
+    assert copy.deepcopy(config) == config
@@ -0,0 +1,52 @@
+import tempfile
+from pathlib import Path
+
+from fennec_dl.config.include_cache import IncludeCache
+
+
+def test_get() -> None:
+    Path(tempfile.gettempdir(), "fennec_dl").mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.gettempdir(), "fennec_dl", "include_cache_test_test_get.yaml").resolve()
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write("x: 1\n")
+    cache = IncludeCache()
+    assert cache.get("a") is None
+    cache.put("a", {"x": 1}, [(path, IncludeCache.signature(path))])
+    assert cache.get("a") == ({"x": 1}, ((path, IncludeCache.signature(path)),))
+    assert (cache.hits, cache.misses) == (1, 1)
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write("x: 12\n")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    cache.put("a", {"x": 12}, [(path, IncludeCache.signature(path))])
+    path.unlink()
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.reset_stats()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_put() -> None:
+    cache = IncludeCache(2)
+    cache.put("a", 1, [])
+    cache.put("b", 2, [])
+    assert cache.get("a") == (1, ())
+    cache.put("c", 3, [])
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == (1, ())
+    assert cache.get("c") == (3, ())
+    cache = IncludeCache(0)
+    cache.put("a", 1, [])
+    assert len(cache) == 0
+
+
+def test_invalidate() -> None:
+    cache = IncludeCache()
+    cache.put("a", 1, [(Path("/x/a.yaml").resolve(), (0, 0, 0))])
+    cache.put("b", 2, [(Path("/x/b.yaml").resolve(), (0, 0, 0)), (Path("/x/a.yaml").resolve(), (0, 0, 0))])
+    cache.put("c", 3, [(Path("/x/c.yaml").resolve(), (0, 0, 0))])
+    cache.invalidate("/x/a.yaml")
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from fennec_dl.config.json_loader import JSONLoader
+from fennec_dl.config.yaml_loader import YAMLLoader
+from fennec_dl.errors.config_loading_error import ConfigLoadingError
+
+
+def test_load_dynamic(tmp_path: Path) -> None:
+    with pytest.raises(ConfigLoadingError):
+        JSONLoader.load_dynamic("nonexistent.json")
+    path = tmp_path / "config.json"
+    path2 = tmp_path / "include.json"
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write("invalid json")
+    with pytest.raises(ConfigLoadingError):
+        JSONLoader.load_dynamic(path)
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write('{"a": 1, "b": {"a": {"!include": "include.json"}, "c": {"!ref": "a"}, "d": {"!ref": "b.a.x"}, "e": [1, 2, 3], "f": "abc"}}')
+    with open(path2, "w", encoding="UTF-8") as file:
+        file.write('{"x": 7, "y": {"!ref": "b.f"}}')
+    config = JSONLoader.load_dynamic(path)
+    assert config.to_dict() == {"a": 1, "b": {"a": {"x": 7, "y": "abc"}, "c": 1, "d": 7, "e": [1, 2, 3], "f": "abc"}}
+
+
+def test_parse_dynamic() -> None:
+    assert JSONLoader.parse_dynamic('{"a": {"!ref": "b"}, "b": {"c": [1.5, null, true]}}').to_dict() == {"a": {"c": [1.5, None, True]}, "b": {"c": [1.5, None, True]}}
+    with pytest.raises(ConfigLoadingError):
+        JSONLoader.parse_dynamic("[1, 2]")
+
+
+def test_save(tmp_path: Path) -> None:
+    config = YAMLLoader.parse_dynamic("a: 1\nb:\n  c: [1, 2.5, x]\n  d: null\n")
+    JSONLoader.save(config, tmp_path / "config.json")
+    assert JSONLoader.load_dynamic(tmp_path / "config.json") == config
+
+
+def test_convert(tmp_path: Path) -> None:
+    with open(tmp_path / "config.yaml", "w", encoding="UTF-8") as file:
+        file.write('a: !include "include.yaml"\nb: !ref a.x\n')
+    with open(tmp_path / "include.yaml", "w", encoding="UTF-8") as file:
+        file.write("x: 1\ny: !ref b\n")
+    JSONLoader.convert(tmp_path / "config.yaml", tmp_path / "config.json", YAMLLoader)
+    with open(tmp_path / "config.json", "r", encoding="UTF-8") as file:
+        assert file.read() == '{"a":{"x":1,"y":{"!ref":"b"}},"b":{"!ref":"a.x"}}'
+    assert JSONLoader.load_dynamic(tmp_path / "config.json").to_dict() == {"a": {"x": 1, "y": 1}, "b": 1}
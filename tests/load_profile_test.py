@@ -0,0 +1,67 @@
+import tempfile
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from fennec_dl.config.disk_cache import DiskCache
+from fennec_dl.config.load_profile import LoadProfile, add_load_hook, current_profile, remove_load_hook
+from fennec_dl.config.static_config import StaticConfig
+from fennec_dl.config.yaml_loader import YAMLLoader
+from fennec_dl.errors.config_loading_error import ConfigLoadingError
+
+
+class MockConfig(StaticConfig):
+    class MockSubconfig(StaticConfig):
+        x: int
+
+    a: MockSubconfig
+    b: MockSubconfig
+    c: int
+
+
+def test_load_hook() -> None:
+    Path(tempfile.gettempdir(), "fennec_dl").mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.gettempdir(), "fennec_dl", "load_profile_test_test_load_hook_1.yaml").resolve()
+    path2 = Path(tempfile.gettempdir(), "fennec_dl", "load_profile_test_test_load_hook_2.yaml").resolve()
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write(f'a: !include "{path2.name}"\nb: !include "{path2.name}"\nc: !ref a.x\n')
+    with open(path2, "w", encoding="UTF-8") as file:
+        file.write("x: 1\n")
+    YAMLLoader.include_cache.invalidate()
+    profiles: List[LoadProfile] = []
+    add_load_hook(profiles.append)
+    try:
+        config = YAMLLoader.load_static(path, MockConfig)
+        assert config.c == 1
+        assert len(profiles) == 1
+        profile = profiles[0]
+        assert profile.source == str(path)
+        assert profile.phases.keys() == {"parse", "references", "construct"}
+        assert all(x >= 0 for x in profile.phases.values())
+        assert profile.total >= sum(profile.phases.values())
+        assert [(x, cached) for x, _, cached in profile.includes] == [(str(path2), False), (str(path2), True)]
+        assert (profile.nodes, profile.entries, profile.references) == (3, 3, 1)
+        assert profile.error is None
+        assert profile.to_dict()["includes"][0]["path"] == str(path2)
+        assert current_profile() is None
+
+        YAMLLoader.parse_dynamic("a:\n  b: 1\nc: [1, 2]\n")
+        assert profiles[1].source is None
+        assert (profiles[1].nodes, profiles[1].entries, profiles[1].references, profiles[1].includes) == (2, 2, 0, [])
+
+        cache = DiskCache(Path(tempfile.gettempdir(), "fennec_dl", "load_profile_test_test_load_hook_cache"))
+        cache.clear()
+        YAMLLoader.load_dynamic(path, cache=cache)
+        YAMLLoader.load_dynamic(path, cache=cache)
+        assert "cache" in profiles[2].phases and "parse" in profiles[2].phases
+        assert "cache" in profiles[3].phases and "parse" not in profiles[3].phases
+
+        with pytest.raises(ConfigLoadingError):
+            YAMLLoader.parse_static("a:\n  x: 1\n", MockConfig)
+        assert profiles[4].error is not None and "Missing config values" in profiles[4].error
+        assert current_profile() is None
+    finally:
+        remove_load_hook(profiles.append)
+    YAMLLoader.parse_dynamic("a: 1\n")
+    assert len(profiles) == 5
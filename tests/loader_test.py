@@ -1,8 +1,11 @@
+import asyncio
 import tempfile
 from pathlib import Path
+from typing import Any, Iterator, List, Union
 
 import pytest
 
+from fennec_dl.config.loader import LoadResult
 from fennec_dl.config.static_config import StaticConfig
 from fennec_dl.config.yaml_loader import YAMLLoader
 from fennec_dl.errors.config_loading_error import ConfigLoadingError
@@ -65,6 +68,10 @@ def test_parse_dynamic() -> None:
     assert config.a == 1
     assert config.b.a == 2
     assert config.b.c == 3
+    config = YAMLLoader.parse_dynamic("a: 1\nb:\n  a: 2\n  c: 3\n", lazy=True)
+    assert config.a == 1
+    assert config.b.a == 2
+    assert config.b.c == 3
 
 
 def test_parse_static() -> None:
@@ -82,3 +89,57 @@ class MockSubConfig(StaticConfig):
     assert config.a == 1
     assert config.b.a == 2
     assert config.b.c == 3
+
+
+def test_load_many() -> None:
+    class MockConfig(StaticConfig):
+        class MockSubConfig(StaticConfig):
+            c: int
+
+        a: int
+        b: MockSubConfig
+
+    directory = Path(tempfile.mkdtemp(prefix="fennec_dl_loader_test_"))
+    (directory / "shared.yaml").write_text("c: 2\n", encoding="UTF-8")
+    paths: List[Union[str, Path]] = []
+    for i in range(20):
+        path = directory / f"{i}.yaml"
+        path.write_text(f"a: {i}\nb: !include shared.yaml\n", encoding="UTF-8")
+        paths.append(path)
+    (directory / "invalid.yaml").write_text("a: [", encoding="UTF-8")
+    paths += [directory / "invalid.yaml", directory / "nonexistent.yaml"]
+
+    results = {x.path: x for x in YAMLLoader.load_many(paths, max_workers=4)}
+    assert len(results) == 22
+    assert all(results[directory / f"{i}.yaml"].ok and results[directory / f"{i}.yaml"].config.to_dict() == {"a": i, "b": {"c": 2}} for i in range(20))
+    for path in (directory / "invalid.yaml", directory / "nonexistent.yaml"):
+        assert not results[path].ok
+        assert results[path].config is None
+        assert isinstance(results[path].error, ConfigLoadingError)
+
+    results = {x.path: x for x in YAMLLoader.load_many(paths[:20], MockConfig)}
+    assert all(isinstance(x.config, MockConfig) and x.config.b.c == 2 for x in results.values())
+
+    # Paths are consumed as results are needed
+    consumed = []
+
+    def generate() -> Iterator[Path]:
+        for path in paths[:20]:
+            consumed.append(path)
+            yield path
+
+    iterator = YAMLLoader.load_many(generate(), max_workers=2)
+    result = next(iterator)
+    assert isinstance(result, LoadResult)
+    assert len(consumed) <= 5
+    iterator.close()
+
+    async def load_async() -> List[Any]:
+        return [x async for x in YAMLLoader.load_many_async(paths, max_workers=4)]
+
+    async_results = asyncio.run(load_async())
+    assert sorted(str(x.path) for x in async_results) == sorted(str(x) for x in paths)
+    assert sum(x.ok for x in async_results) == 20
+    for path in directory.iterdir():
+        path.unlink()
+    directory.rmdir()
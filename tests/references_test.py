@@ -0,0 +1,44 @@
+import pytest
+
+from fennec_dl.config.references import Reference, resolve_references
+from fennec_dl.errors.config_loading_error import ConfigLoadingError
+
+
+def test_resolve_references() -> None:
+    assert {} == resolve_references({})
+    assert {"a": "abc", "b": ["x", "y"]} == resolve_references({"a": "abc", "b": ["x", "y"]})
+    assert {"a": 1, "b": {"c": 1, "d": [1, 2]}} == resolve_references({"a": 1, "b": {"c": Reference("a"), "d": [Reference("a"), 2]}})
+    # Chained references and references through references
+    assert {"a": 1, "b": 1, "c": 1, "d": {"e": 2}, "f": {"e": 2}, "g": 2} == resolve_references({"a": 1, "b": Reference("a"), "c": Reference("b"), "d": {"e": 2}, "f": Reference("d"), "g": Reference("f.e")})
+    assert {"a": 1, "b": 1, "c": 1} == resolve_references({"a": 1, "b": Reference("c"), "c": Reference("a")})
+    # References to subtrees with references
+    assert {"a": {"b": 1, "c": 1}, "d": {"b": 1, "c": 1}} == resolve_references({"a": {"b": 1, "c": Reference("a.b")}, "d": Reference("a")})
+
+
+def test_resolve_references_sharing() -> None:
+    shared = {"x": [1, 2, 3]}
+    data = {"a": shared, "b": Reference("a"), "c": {"d": Reference("a.x")}}
+    resolved = resolve_references(data)
+    assert resolved["a"] is shared
+    assert resolved["b"] is shared
+    assert resolved["c"]["d"] is shared["x"]
+    # The input is left untouched
+    assert isinstance(data["b"], Reference)
+    assert isinstance(data["c"]["d"], Reference)
+    included = {"y": Reference("a.x")}
+    resolved = resolve_references({"a": shared, "b": included, "c": included})
+    assert resolved["b"] is resolved["c"]
+    assert resolved["b"] is not included
+
+
+def test_resolve_references_errors() -> None:
+    with pytest.raises(ConfigLoadingError, match='Reference "b.c" could not be resolved'):
+        resolve_references({"a": Reference("b.c"), "b": 1})
+    with pytest.raises(ConfigLoadingError, match='Reference "x" could not be resolved'):
+        resolve_references({"a": Reference("x")})
+    with pytest.raises(ConfigLoadingError, match='Circular reference "b" -> "a" -> "b"'):
+        resolve_references({"a": Reference("b"), "b": Reference("a")})
+    with pytest.raises(ConfigLoadingError, match="Circular reference"):
+        resolve_references({"a": {"b": Reference("a")}})
+    with pytest.raises(ConfigLoadingError, match="Circular reference"):
+        resolve_references({"a": Reference("a.b")})
@@ -0,0 +1,68 @@
+import pickle
+from typing import Any, cast
+
+import pytest
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.sampled_sweep import Range, SampledSweep
+
+
+def test_range() -> None:
+    assert Range(1.0, 3.0).sample(0.0) == 1.0
+    assert Range(1.0, 3.0).sample(0.5) == 2.0
+    assert Range(1e-4, 1e-2, log=True).sample(0.5) == pytest.approx(1e-3)
+    assert [Range(2, 4, integer=True).sample(u) for u in (0.0, 0.34, 0.67, 0.9999)] == [2, 3, 4, 4]
+    assert Range(1, 100, log=True, integer=True).sample(0.0) == 1
+
+
+def test_len() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 0.5}}, cast(Any, Config)._Config__secret)
+    assert 10 == len(SampledSweep(config, [("a", [1, 2]), ("b.c", Range(0.0, 1.0))], 10))
+    assert 10**12 == len(SampledSweep(config, [("a", range(10**6)), ("b.c", range(10**6))], 10**12))
+    with pytest.raises(ValueError):
+        SampledSweep(config, [("a", [1, 2])], 10, "grid")
+    with pytest.raises(ValueError):
+        SampledSweep(config, [("a", [])], 10)
+    with pytest.raises(IndexError):
+        SampledSweep(config, [("a", [1, 2])], 10)[10]
+
+
+def test_methods() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 0.5, "d": "x"}}, cast(Any, Config)._Config__secret)
+    for method in SampledSweep.METHODS:
+        sweep = SampledSweep(config, [("a", Range(1, 8, integer=True)), ("b.c", Range(1e-3, 1.0, log=True)), ("b.d", ["x", "y"])], 64, method, 3)
+        configs = list(sweep)
+        assert len(configs) == 64
+        assert all(1 <= x["a"] <= 8 and type(x["a"]) is int for x in configs)
+        assert all(1e-3 <= x["b.c"] <= 1.0 for x in configs)
+        assert {x["b.d"] for x in configs} == {"x", "y"}
+        assert [x.to_dict() for x in configs] == [x.to_dict() for x in SampledSweep(config, sweep.overwrites, 64, method, 3)]
+        assert [x.to_dict() for x in configs] != [x.to_dict() for x in SampledSweep(config, sweep.overwrites, 64, method, 4)]
+        assert sweep[5].to_dict() == configs[5].to_dict()
+        assert cast(Any, config).a == 1
+        if method != "random":
+            # Every one of the 8 strata of each dimension contains exactly 8 points
+            for d in range(3):
+                assert sorted(int(sweep.point(i)[d] * 8) for i in range(64)) == [i // 8 for i in range(64)]
+
+
+def test_lazy() -> None:
+    config = DynamicConfig({"a": 0.5}, cast(Any, Config)._Config__secret)
+    sweep = SampledSweep(config, [("a", Range(0.0, 1.0))], 2**32, "sobol")
+    assert 0.0 <= sweep[2**32 - 1]["a"] <= 1.0
+    with pytest.raises(ValueError):
+        SampledSweep(config, [("a", Range(0.0, 1.0))], 2**32 + 1, "sobol")
+    sweep = SampledSweep(config, [("a", Range(0.0, 1.0))], 10**12)
+    assert sweep[123456789]["a"] == SampledSweep(config, [("a", Range(0.0, 1.0))], 10**12)[123456789]["a"]
+
+
+def test_shard() -> None:
+    config = DynamicConfig({"a": 0.5, "b": 1}, cast(Any, Config)._Config__secret)
+    sweep = SampledSweep(config, [("a", Range(0.0, 1.0)), ("b", [1, 2, 3])], 10, "lhs", 1)
+    shards = [sweep.shard(rank, 3) for rank in range(3)]
+    assert [len(x) for x in shards] == [4, 3, 3]
+    assert all(isinstance(x, SampledSweep) for x in shards)
+    assert [x.to_dict() for x in shards[1]] == [sweep[i].to_dict() for i in range(1, 10, 3)]
+    restored = pickle.loads(pickle.dumps(shards[2]))
+    assert [x.to_dict() for x in restored] == [x.to_dict() for x in shards[2]]
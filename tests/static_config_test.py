@@ -1,4 +1,6 @@
-from typing import Any, Dict, List, Optional, Union, cast
+import pickle
+from array import array
+from typing import Any, Dict, List, Literal, Optional, Union, cast
 
 import pytest
 
@@ -56,6 +58,15 @@ class MockConfig3(StaticConfig):
     k: Union[bool, int]
 
 
+class MockConfigForwardRef(StaticConfig):
+    a: int
+    b: Optional["MockConfigForwardRef2"]
+
+
+class MockConfigForwardRef2(StaticConfig):
+    c: int
+
+
 def test_init() -> None:
     _ = MockConfig({"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": 1}, cast(Any, Config)._Config__secret)
     with pytest.raises(ConfigLoadingError):
@@ -64,11 +75,43 @@ def test_init() -> None:
     with pytest.raises(ConfigLoadingError):
         _ = MockConfigSmall({"a": 1, "b": {"c": "3"}}, cast(Any, Config)._Config__secret)
 
-    class TypeErrorMockConfig(StaticConfig):
-        a: List[Dict[str, int]]
-
     with pytest.raises(AttributeError):
-        _ = TypeErrorMockConfig({"a": {"b": [1, 2, 3]}}, cast(Any, Config)._Config__secret)
+
+        class TypeErrorMockConfig(StaticConfig):
+            a: List[Dict[str, int]]
+
+
+def test_init_subclass() -> None:
+    with pytest.warns(UserWarning):
+
+        class MethodMockConfig(StaticConfig):
+            a: int
+
+            def method(self) -> None:
+                pass
+
+    with pytest.warns(UserWarning):
+
+        class UnannotatedMockConfig(StaticConfig):
+            a: int
+            b = 3
+
+    config = cast(Any, MockConfigForwardRef({"a": 1, "b": {"c": 2}}, cast(Any, Config)._Config__secret))
+    assert config.b.c == 2
+
+    class UnionMockConfig(StaticConfig):
+        a: Union[MockConfigSmall, int, None]
+        b: List[Union[Literal["x", "y"], int]]
+
+    config = cast(Any, UnionMockConfig({"a": {"a": 1, "b": {"c": 3}}, "b": ["y", 2]}, cast(Any, Config)._Config__secret))
+    assert config.a.b.c == 3
+    assert config.b == ["y", 2]
+    assert cast(Any, UnionMockConfig({"a": 4, "b": []}, cast(Any, Config)._Config__secret)).a == 4
+    assert cast(Any, UnionMockConfig({"a": None, "b": []}, cast(Any, Config)._Config__secret)).a is None
+    with pytest.raises(ConfigLoadingError):
+        _ = UnionMockConfig({"a": {"a": 1}, "b": []}, cast(Any, Config)._Config__secret)
+    with pytest.raises(ConfigLoadingError):
+        _ = UnionMockConfig({"a": 1, "b": ["z"]}, cast(Any, Config)._Config__secret)
 
 
 def test_eq() -> None:
@@ -114,6 +157,69 @@ def test_items() -> None:
     assert [("a", 1), ("b", 0.1), ("c", None), ("d", True), ("e", "test"), ("f", [1, 2, 3]), ("g.a", 1), ("g.b", 2), ("h", [[1, 2], [3, 4]]), ("i.a.a", 1), ("i.a.b", 2), ("i.c.c", 3), ("i.c.d", 4), ("j.a", [1, 2]), ("j.b", [3, 4]), ("k", 1)] == cast(Any, MockConfig({"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": 1}, cast(Any, Config)._Config__secret)).items()
 
 
+def test_iter_items() -> None:
+    config = cast(Any, MockConfigSmall({"a": 1, "b": {"c": 3}}, cast(Any, Config)._Config__secret))
+    assert ["a", "b", "b.c"] == list(config.iter_keys())
+    assert [("a", 1), ("b.c", 3)] == list(config.iter_items())
+    assert [("a", 1), ("b.c", 3)] == config.items()
+    config.b.c = 4
+    assert [("a", 1), ("b.c", 4)] == list(config.iter_items())
+    clone = config.clone()
+    clone["b.c"] = 5
+    assert [("a", 1), ("b.c", 4)] == config.items()
+    assert [("a", 1), ("b.c", 5)] == clone.items()
+    config.freeze()
+    assert config.items() is not config.items()
+
+
+def test_arrays() -> None:
+    class MockConfigArrays(StaticConfig, arrays=True):
+        a: List[int]
+        b: List[float]
+        c: Optional[List[float]]
+        d: List[List[int]]
+        e: List[str]
+
+    class MockConfigArrays2(MockConfigArrays):
+        pass
+
+    class MockConfigArrays3(MockConfigArrays, arrays=False):
+        pass
+
+    config = cast(Any, MockConfigArrays({"a": [1, 2], "b": [0.5], "c": [1.5], "d": [[1]], "e": ["x"]}, cast(Any, Config)._Config__secret))
+    assert config.a == array("q", [1, 2])
+    assert config.b == array("d", [0.5])
+    assert config.c == array("d", [1.5])
+    assert config.d == [[1]]
+    assert config.e == ["x"]
+    assert config.to_dict() == {"a": [1, 2], "b": [0.5], "c": [1.5], "d": [[1]], "e": ["x"]}
+    config.a = array("q", [3])
+    config.c = None
+    assert config.a == array("q", [3])
+    with pytest.raises(ConfigLoadingError):
+        config.b = array("q", [3])
+    with pytest.raises(ConfigLoadingError):
+        config.b = [1]
+    assert isinstance(MockConfigArrays2({"a": [1, 2], "b": [0.5], "c": None, "d": [], "e": []}, cast(Any, Config)._Config__secret).a, array)
+    assert isinstance(MockConfigArrays3({"a": [1, 2], "b": [0.5], "c": None, "d": [], "e": []}, cast(Any, Config)._Config__secret).a, list)
+
+
+def test_fingerprint() -> None:
+    config = cast(Any, MockConfigSmall({"a": 1, "b": {"c": 3}}, cast(Any, Config)._Config__secret))
+    assert config.fingerprint() == cast(Any, DynamicConfig({"b": {"c": 3}, "a": 1}, cast(Any, Config)._Config__secret)).fingerprint()
+    before = config.fingerprint()
+    clone = config.clone()
+    clone.b.c = 4
+    assert clone.fingerprint() != before
+    assert config.fingerprint() == before
+    clone["b.c"] = 3
+    assert clone.fingerprint() == before
+    with pytest.raises(TypeError):
+        hash(config)
+    config.freeze()
+    assert isinstance(hash(config), int)
+
+
 def test_getattr() -> None:
     config = cast(Any, MockConfigSmall({"a": 1, "b": {"c": 3}}, cast(Any, Config)._Config__secret))
     print(config.keys())
@@ -166,6 +272,15 @@ def test_setitem() -> None:
     config = cast(Any, MockConfigSmall({"a": 1, "b": {"c": 3}}, cast(Any, Config)._Config__secret))
     config["a"] = 2
     assert config.a == 2
+    config["b"] = {"c": 4}
+    assert config.b.c == 4
+    assert config["b.c"] == 4
+    config.b.c = 5
+    assert config["b.c"] == 5
+    with pytest.raises(ConfigLoadingError):
+        config["b.c"] = "5"
+    with pytest.raises(AttributeError):
+        config["b.d"] = 5
     config.freeze()
     with pytest.raises(ReadOnlyError):
         config["a"] = 3
@@ -196,6 +311,54 @@ def test_clone() -> None:
             assert config[key] is not clone[key]
 
 
+def test_clone_copy_on_write() -> None:
+    config = cast(Any, MockConfig({"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": 1}, cast(Any, Config)._Config__secret))
+    handle = config.i.a
+    clone = cast(Any, config.clone())
+    assert "i" not in clone.__dict__
+    assert clone._StaticConfig__shared["i"] is config.i
+    clone["i.a.b"] = 5
+    assert "i" in clone.__dict__
+    assert clone.i._StaticConfig__shared["c"] is config.i.c
+    assert config.i.a.b == 2
+    assert clone.i.a.b == 5
+    handle.a = 6
+    config.i.c.c = 7
+    assert config["i.a.a"] == 6
+    assert clone["i.a.a"] == 1
+    assert clone["i.c.c"] == 3
+    assert clone.keys() == config.keys()
+    assert clone.to_dict()["i"] == {"a": {"a": 1, "b": 5}, "c": {"c": 3, "d": 4}}
+
+
+def test_clone_mutable_leaves() -> None:
+    config = cast(Any, MockConfig({"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": 1}, cast(Any, Config)._Config__secret))
+    clone = cast(Any, config.clone())
+    # In-place changes on either side do not reach the other one, whether through attributes or FQNs
+    config.j.a.append(3)
+    clone.j.a.append(4)
+    config["j.b"].append(5)
+    clone.f.append(4)
+    config.h[0].append(0)
+    assert config.j.to_dict() == {"a": [1, 2, 3], "b": [3, 4, 5]}
+    assert clone.j.to_dict() == {"a": [1, 2, 4], "b": [3, 4]}
+    assert config.f == [1, 2, 3]
+    assert clone.h == [[1, 2], [3, 4]]
+
+
+def test_items_clone() -> None:
+    # Cached flat views follow the copy-on-write splits of both sides
+    config = cast(Any, MockConfig({"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": 1}, cast(Any, Config)._Config__secret))
+    clone = cast(Any, config.clone())
+    assert dict(clone.items())["j.a"] == [1, 2]
+    config.j.a.append(3)
+    assert dict(clone.items())["j.a"] == [1, 2]
+    assert dict(config.items())["j.a"] == [1, 2, 3]
+    clone.j.b.append(5)
+    assert dict(clone.items())["j.b"] == [3, 4, 5]
+    assert dict(config.items())["j.b"] == [3, 4]
+
+
 def test_to_dict() -> None:
     dict_ = {"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": 1}
     config = MockConfig(cast(Dict[str, ConfigEntryType], dict_), cast(Any, Config)._Config__secret)
@@ -210,3 +373,26 @@ def test_readonly() -> None:
     assert config.readonly
     with pytest.raises(ReadOnlyError):
         config.a = 2
+
+
+def test_pickle() -> None:
+    config = cast(Any, MockConfig({"a": 1, "b": 0.1, "c": None, "d": True, "e": "test", "f": [1, 2, 3], "g": {"a": 1, "b": 2}, "h": [[1, 2], [3, 4]], "i": {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}, "j": {"a": [1, 2], "b": [3, 4]}, "k": True}, cast(Any, Config)._Config__secret))
+    clone = cast(Any, config.clone())
+    restored = cast(Any, pickle.loads(pickle.dumps(config)))
+    assert type(restored) is MockConfig
+    assert restored == config
+    assert restored.to_dict() == config.to_dict()
+    restored.i.a.a = 5
+    assert config.i.a.a == 1
+    assert restored["i.a.a"] == 5
+    restored = pickle.loads(pickle.dumps(clone))
+    assert restored == clone
+    config.freeze()
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored.readonly
+    assert restored.i.c.readonly
+    with pytest.raises(ReadOnlyError):
+        restored.a = 2
+    restored = pickle.loads(pickle.dumps(config.i))
+    assert type(restored) is MockConfig.MockConfig2
+    assert restored.to_dict() == {"a": {"a": 1, "b": 2}, "c": {"c": 3, "d": 4}}
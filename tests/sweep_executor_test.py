@@ -0,0 +1,91 @@
+import os
+from typing import Any, List, cast
+
+import pytest
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.sampled_sweep import Range, SampledSweep
+from fennec_dl.config.static_config import StaticConfig
+from fennec_dl.config.sweep import ConfigSweep
+from fennec_dl.config.sweep_executor import SweepExecutor
+
+
+class MockConfig(StaticConfig, arrays=True):
+    class MockSubconfig(StaticConfig):
+        x: int
+
+    a: int
+    b: MockSubconfig
+    c: List[float]
+
+
+def _product(config: Any) -> Any:
+    if config.a == 3:
+        raise ValueError("a must not be 3")
+    return config.a * config.b.x
+
+
+def _environment(config: Any) -> Any:
+    return os.environ.get("CUDA_VISIBLE_DEVICES"), type(config).__name__, config.readonly, config.to_dict()
+
+
+def _exit(config: Any) -> Any:
+    if config.a == 2:
+        os._exit(1)
+    return config.a
+
+
+def test_run_in_process() -> None:
+    config = DynamicConfig({"a": 1, "b": {"x": 2}}, cast(Any, Config)._Config__secret)
+    sweep = ConfigSweep(config, [("a", [1, 2, 3, 4]), ("b.x", [1, 10])])
+    results = list(SweepExecutor(0).run(sweep, lambda x: _product(x)))
+    assert [x.variant for x in results] == list(range(8))
+    assert [x.value for x in results if x.ok] == [1, 10, 2, 20, 4, 40]
+    assert [x.variant for x in results if not x.ok] == [4, 5]
+    assert isinstance(results[4].error, ValueError)
+    assert "a must not be 3" in cast(str, results[4].traceback)
+    assert [x.variant for x in SweepExecutor(0).run(sweep.shard(1, 3), _product)] == [1, 4, 7]
+    # Interleaved runs do not see each other's sweeps
+    other = ConfigSweep(config, [("a", [5, 6])])
+    executor = SweepExecutor(0)
+    assert [(x.value, y.value) for x, y in zip(executor.run(sweep, lambda x: x.to_dict()), executor.run(other, lambda x: x.to_dict()))] == [({"a": 1, "b": {"x": 1}}, {"a": 5, "b": {"x": 2}}), ({"a": 1, "b": {"x": 10}}, {"a": 6, "b": {"x": 2}})]
+
+
+def test_run() -> None:
+    config = DynamicConfig({"a": 1, "b": {"x": 2}}, cast(Any, Config)._Config__secret)
+    sweep = ConfigSweep(config, [("a", [1, 2, 3, 4]), ("b.x", [1, 10])])
+    results = sorted(SweepExecutor(2, max_pending=3).run(sweep, _product))
+    assert [x.value for x in results] == [1, 10, 2, 20, None, None, 4, 40]
+    assert [x.ok for x in results] == [True, True, True, True, False, False, True, True]
+    assert isinstance(results[5].error, ValueError)
+
+
+def test_run_pickled() -> None:
+    cuda = os.environ.get("CUDA_VISIBLE_DEVICES")
+    config = MockConfig({"a": 1, "b": {"x": 2}, "c": [0.5]}, cast(Any, Config)._Config__secret)
+    config.freeze()
+    sweep = ConfigSweep(config, [("a", [1, 2])])
+    results = sorted(SweepExecutor(1, cpu_only=True).run(sweep, _environment))
+    assert [x.value for x in results] == [("", "MockConfig", False, {"a": 1, "b": {"x": 2}, "c": [0.5]}), ("", "MockConfig", False, {"a": 2, "b": {"x": 2}, "c": [0.5]})]
+    assert os.environ.get("CUDA_VISIBLE_DEVICES") == cuda
+
+
+def test_run_sampled() -> None:
+    config = DynamicConfig({"a": 1, "b": {"x": 2}}, cast(Any, Config)._Config__secret)
+    sweep = SampledSweep(config, [("a", [1, 2, 4]), ("b.x", Range(1, 10, integer=True))], 12, "sobol")
+    results = sorted(SweepExecutor(2).run(sweep.shard(1, 2), _product))
+    assert [(x.variant, x.value) for x in results] == [(i, x["a"] * x["b.x"]) for i, x in zip(range(1, 12, 2), sweep.shard(1, 2))]
+
+
+def test_run_broken_worker() -> None:
+    config = DynamicConfig({"a": 1}, cast(Any, Config)._Config__secret)
+    sweep = ConfigSweep(config, [("a", [1, 2, 3, 4, 5, 6])])
+    results = sorted(SweepExecutor(1, max_pending=1).run(sweep, _exit))
+    assert [x.value for x in results] == [1, None, 3, 4, 5, 6]
+    assert not results[1].ok
+
+
+def test_invalid_workers() -> None:
+    with pytest.raises(ValueError):
+        SweepExecutor(-1)
@@ -0,0 +1,67 @@
+import itertools
+from typing import Any, cast
+
+import pytest
+
+from fennec_dl.config.config import Config
+from fennec_dl.config.dynamic_config import DynamicConfig
+from fennec_dl.config.sweep import ConfigSweep
+
+
+def test_len() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 2, "d": 3}}, cast(Any, Config)._Config__secret)
+    assert 1 == len(ConfigSweep(config, []))
+    assert 24 == len(ConfigSweep(config, [("a", [1, 2]), ("b.c", [1, 2, 3]), ("b.d", [1, 2, 3, 4])]))
+    assert 0 == len(ConfigSweep(config, [("a", [1, 2]), ("b.c", [])]))
+    assert 10**12 == len(ConfigSweep(config, [("a", range(10**6)), ("b.c", range(10**6))]))
+
+
+def test_getitem() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 2, "d": 3}}, cast(Any, Config)._Config__secret)
+    sweep = ConfigSweep(config, [("a", [1, 2]), ("b.c", [1, 2, 3]), ("b.d", [1, 2, 3, 4])])
+    for i, (a, c, d) in enumerate(itertools.product([1, 2], [1, 2, 3], [1, 2, 3, 4])):
+        assert sweep[i]["a"] == a
+        assert sweep[i]["b.c"] == c
+        assert sweep[i]["b.d"] == d
+    assert sweep[-1]["a"] == 2
+    assert sweep[-1]["b.d"] == 4
+    with pytest.raises(IndexError):
+        sweep[24]
+    assert cast(Any, config).a == 1
+    sweep = ConfigSweep(config, [("a", range(10**6)), ("b.c", range(10**6))])
+    assert sweep[123456789012]["a"] == 123456
+    assert sweep[123456789012]["b.c"] == 789012
+
+
+def test_getitem_slice() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 2, "d": 3}}, cast(Any, Config)._Config__secret)
+    sweep = ConfigSweep(config, [("a", [1, 2]), ("b.c", [1, 2, 3])])
+    sliced = sweep[1:3]
+    assert isinstance(sliced, ConfigSweep)
+    assert len(sliced) == 2
+    assert sliced.indices == range(1, 3)
+    assert [x.to_dict() for x in sliced] == [sweep[1].to_dict(), sweep[2].to_dict()]
+    assert [x["b.c"] for x in sweep[::-2]] == [3, 1, 2]
+    assert [x["b.c"] for x in sweep.shard(1, 2)[1:]] == [1, 3]
+    assert len(sweep[10:]) == 0
+    assert len(sweep) == 6
+
+
+def test_iter() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 2, "d": 3}}, cast(Any, Config)._Config__secret)
+    sweep = ConfigSweep(config, [("a", [1, 2]), ("b.c", [1, 2, 3])])
+    assert [(1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (2, 3)] == [(x["a"], x["b.c"]) for x in sweep]
+    assert [(1, 2)] == [(x["a"], x["b.c"]) for x in ConfigSweep(config, [])]
+
+
+def test_shard() -> None:
+    config = DynamicConfig({"a": 1, "b": {"c": 2, "d": 3}}, cast(Any, Config)._Config__secret)
+    sweep = ConfigSweep(config, [("a", [1, 2]), ("b.c", [1, 2, 3]), ("b.d", [1, 2, 3, 4])])
+    shards = [sweep.shard(rank, 5) for rank in range(5)]
+    assert [5, 5, 5, 5, 4] == [len(x) for x in shards]
+    assert sorted(itertools.chain(*(x.indices for x in shards))) == list(range(24))
+    assert shards[2][1]["b.d"] == sweep[7]["b.d"]
+    assert [x.to_dict() for x in shards[3]] == [sweep[i].to_dict() for i in range(3, 24, 5)]
+    assert [x.to_dict() for x in shards[1].shard(1, 2)] == [sweep[i].to_dict() for i in range(6, 24, 10)]
+    with pytest.raises(ValueError):
+        sweep.shard(5, 5)
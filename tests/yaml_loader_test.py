@@ -1,11 +1,12 @@
 import tempfile
 from pathlib import Path
-from typing import List
+from typing import Any, List, cast
 
 import pytest
 
+from fennec_dl.config.disk_cache import DiskCache
 from fennec_dl.config.static_config import StaticConfig
-from fennec_dl.config.yaml_loader import YAMLLoader
+from fennec_dl.config.yaml_loader import _BACKENDS, YAMLLoader
 from fennec_dl.errors.config_loading_error import ConfigLoadingError
 
 
@@ -77,4 +78,100 @@ class MockSubConfig2(StaticConfig):
     assert config.b.d == 7
 
 
+def test_backends() -> None:
+    Path(tempfile.gettempdir(), "fennec_dl").mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.gettempdir(), "fennec_dl", "yaml_loader_test_test_backends_1.yaml").resolve()
+    path2 = Path(tempfile.gettempdir(), "fennec_dl", "yaml_loader_test_test_backends_2.yaml").resolve()
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write('a: 1\nb:\n  a: !include "yaml_loader_test_test_backends_2.yaml"\n  c: !ref a\n  d: !ref b.a.x\n  e: [1,2,3]\n')
+    with open(path2, "w", encoding="UTF-8") as file:
+        file.write("x: 7\ny: 2\nz: !ref a\n")
+    configs = []
+    for backend in _BACKENDS:
+
+        class BackendYAMLLoader(YAMLLoader):
+            _backend = backend
+
+        configs.append(BackendYAMLLoader.load_dynamic(path))
+        with pytest.raises(ConfigLoadingError):
+            BackendYAMLLoader.parse_dynamic("- 1\n- 2\n")
+        with pytest.raises(ConfigLoadingError):
+            BackendYAMLLoader.parse_dynamic("a: !!python/name:os.system\n")
+    path.unlink()
+    path2.unlink()
+    for config in configs:
+        assert config.to_dict() == {"a": 1, "b": {"a": {"x": 7, "y": 2, "z": 1}, "c": 1, "d": 7, "e": [1, 2, 3]}}
+
+
+def test_include_cache() -> None:
+    Path(tempfile.gettempdir(), "fennec_dl").mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.gettempdir(), "fennec_dl", "yaml_loader_test_test_include_cache_1.yaml").resolve()
+    path2 = Path(tempfile.gettempdir(), "fennec_dl", "yaml_loader_test_test_include_cache_2.yaml").resolve()
+    path3 = Path(tempfile.gettempdir(), "fennec_dl", "yaml_loader_test_test_include_cache_3.yaml").resolve()
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write('a: !include "yaml_loader_test_test_include_cache_2.yaml"\nb: !include "yaml_loader_test_test_include_cache_2.yaml"\n')
+    with open(path2, "w", encoding="UTF-8") as file:
+        file.write('x: !include "yaml_loader_test_test_include_cache_3.yaml"\n')
+    with open(path3, "w", encoding="UTF-8") as file:
+        file.write("y: 1\n")
+    YAMLLoader.include_cache.invalidate()
+    YAMLLoader.include_cache.reset_stats()
+    config = YAMLLoader.load_dynamic(path)
+    assert config.to_dict() == {"a": {"x": {"y": 1}}, "b": {"x": {"y": 1}}}
+    assert (YAMLLoader.include_cache.hits, YAMLLoader.include_cache.misses) == (1, 2)
+    config.a.x.y = 2
+    assert YAMLLoader.load_dynamic(path).to_dict() == {"a": {"x": {"y": 1}}, "b": {"x": {"y": 1}}}
+    assert (YAMLLoader.include_cache.hits, YAMLLoader.include_cache.misses) == (3, 2)
+    # Changes of nested includes invalidate the including files as well
+    with open(path3, "w", encoding="UTF-8") as file:
+        file.write("y: 10\n")
+    assert YAMLLoader.load_dynamic(path).to_dict() == {"a": {"x": {"y": 10}}, "b": {"x": {"y": 10}}}
+    YAMLLoader.include_cache.invalidate(path3)
+    assert len(YAMLLoader.include_cache) == 0
+    path.unlink()
+    path2.unlink()
+    path3.unlink()
+
+
+def test_parse_dynamic() -> None:
+    config = YAMLLoader.parse_dynamic('a: "abc"\nb: !ref c.d\nc:\n  d: !ref a\n  e: [x, !ref b]\n')
+    assert config.to_dict() == {"a": "abc", "b": "abc", "c": {"d": "abc", "e": ["x", "abc"]}}
+    with pytest.raises(ConfigLoadingError, match="Circular reference"):
+        YAMLLoader.parse_dynamic("a: !ref b\nb: !ref a\n")
+
+
+def test_lazy_include_cache(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write('a: !include "include.yaml"\nb: !ref a.x\n')
+    with open(tmp_path / "include.yaml", "w", encoding="UTF-8") as file:
+        file.write("x: [1, [2]]\n")
+    # Unmaterialized subtrees of lazy configs never hand out the lists of cached includes
+    config = YAMLLoader.load_dynamic(path, lazy=True)
+    cast(Any, config.to_dict()["a"])["x"].append(99)
+    dict(config.items())["a.x"][1].append(99)
+    assert YAMLLoader.load_dynamic(path).to_dict() == {"a": {"x": [1, [2]]}, "b": [1, [2]]}
+    assert YAMLLoader.load_dynamic(path, lazy=True).to_dict() == {"a": {"x": [1, [2]]}, "b": [1, [2]]}
+
+
+def test_disk_cache(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path2 = tmp_path / "include.yaml"
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write('a: !include "include.yaml"\nb: !ref a.x\n')
+    with open(path2, "w", encoding="UTF-8") as file:
+        file.write("x: 1\n")
+    cache = DiskCache(tmp_path / "cache")
+    assert YAMLLoader.load_dynamic(path, cache=cache).to_dict() == {"a": {"x": 1}, "b": 1}
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    assert YAMLLoader.load_dynamic(path, cache=cache).to_dict() == {"a": {"x": 1}, "b": 1}
+    with open(path2, "w", encoding="UTF-8") as file:
+        file.write("x: 22\n")
+    assert YAMLLoader.load_dynamic(path, cache=cache, lazy=True).to_dict() == {"a": {"x": 22}, "b": 22}
+    with open(path, "w", encoding="UTF-8") as file:
+        file.write('a: !include "include.yaml"\nb: 3\n')
+    assert YAMLLoader.load_dynamic(path, cache=cache).to_dict() == {"a": {"x": 22}, "b": 3}
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
 test_load_dynamic()